@@ -1,8 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Depends, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from typing import Optional
 from app.core.game import Game
 from app.core.die import DieColor
+from app.services.ai_batcher import AI_BATCHER, play_ai_moves
+from app.services.ai_executor import AI_EXECUTOR
+from app.services.session_store import StaleSessionError
+from app.services.sessions import SESSIONS, Session
 from app.schemas.game import (
     GameStateSchema,
     MoveRequest,
@@ -12,19 +17,22 @@ from app.schemas.game import (
 )
 
 router = APIRouter()
+router.add_event_handler("shutdown", AI_EXECUTOR.shutdown)
+router.add_event_handler("shutdown", SESSIONS.close)
 
-# Global game instance for now (in-memory)
-_game: Optional[Game] = None
+# WebSocket close code for unknown, expired or ended sessions
+UNKNOWN_SESSION_CLOSE_CODE = 4404
 
 
-def get_game():
-    global _game
-    if _game is None:
-        _game = Game()
-    return _game
+async def get_session(session_id: str) -> Session:
+    session = await SESSIONS.get_async(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return session
 
 
-def format_game_state(game: Game) -> GameStateSchema:
+def format_game_state(session: Session) -> GameStateSchema:
+    game = session.game
     players = []
     for p in game.players:
         ss = p.get_scoresheet()
@@ -49,6 +57,7 @@ def format_game_state(game: Game) -> GameStateSchema:
         )
 
     return GameStateSchema(
+        session_id=session.id,
         state=game.state.name,
         current_player_index=game.current_player_index,
         dice_results=game.dice_results,
@@ -58,39 +67,114 @@ def format_game_state(game: Game) -> GameStateSchema:
     )
 
 
+def publish_state(session: Session) -> None:
+    """Push the session's state to its WebSocket listeners, if any."""
+    if SESSIONS.has_listeners(session.id):
+        SESSIONS.publish(session.id, format_game_state(session).model_dump())
+
+
+async def save_session(session: Session) -> None:
+    """Save the session's game; 409 if another worker changed it first."""
+    try:
+        await SESSIONS.save_async(session)
+    except StaleSessionError:
+        # The session now holds the other worker's game
+        publish_state(session)
+        raise HTTPException(
+            status_code=409, detail="Session changed by another request; reload its state"
+        )
+
+
+async def play_ai_turns(session: Session) -> None:
+    """Play the AI players' moves, pushing the state after each of them."""
+    await play_ai_moves(
+        session.game, AI_BATCHER, AI_EXECUTOR, on_action=lambda: publish_state(session)
+    )
+
+
 @router.post("/setup", response_model=GameStateSchema)
 async def setup_game(request: GameSetupRequest):
-    global _game
-    _game = Game(num_players=request.num_players, ai_strategy=request.ai_strategy)
-    return format_game_state(_game)
+    game = Game(num_players=request.num_players, ai_strategy=request.ai_strategy)
+    return format_game_state(await SESSIONS.create_async(game))
 
 
-@router.get("/state", response_model=GameStateSchema)
-async def get_state(game: Game = Depends(get_game)):
-    return format_game_state(game)
+@router.get("/{session_id}/state", response_model=GameStateSchema)
+async def get_state(session: Session = Depends(get_session)):
+    return format_game_state(session)
 
 
-@router.post("/roll", response_model=GameStateSchema)
-async def roll_dice(game: Game = Depends(get_game)):
-    game.roll_dice()
-    return format_game_state(game)
+@router.post("/{session_id}/roll", response_model=GameStateSchema)
+async def roll_dice(session: Session = Depends(get_session)):
+    async with session.lock:
+        session.game.roll_dice()
+        publish_state(session)
+        await play_ai_turns(session)
+        await save_session(session)
+        return format_game_state(session)
 
 
-@router.post("/mark", response_model=GameStateSchema)
-async def mark_number(move: MoveRequest, game: Game = Depends(get_game)):
+@router.post("/{session_id}/mark", response_model=GameStateSchema)
+async def mark_number(move: MoveRequest, session: Session = Depends(get_session)):
     try:
         color = DieColor(move.color)
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid color: {move.color}")
 
-    current_player = game.get_current_player()
-    if not game.try_mark_number(current_player, color, move.number):
-        raise HTTPException(status_code=400, detail="Invalid move")
+    async with session.lock:
+        game = session.game
+        current_player = game.get_current_player()
+        if not game.try_mark_number(current_player, color, move.number):
+            raise HTTPException(status_code=400, detail="Invalid move")
+
+        publish_state(session)
+        await save_session(session)
+        return format_game_state(session)
+
 
-    return format_game_state(game)
+@router.post("/{session_id}/done", response_model=GameStateSchema)
+async def player_done(session: Session = Depends(get_session)):
+    async with session.lock:
+        session.game.player_done_making_moves()
+        publish_state(session)
+        await play_ai_turns(session)
+        await save_session(session)
+        return format_game_state(session)
 
 
-@router.post("/done", response_model=GameStateSchema)
-async def player_done(game: Game = Depends(get_game)):
-    game.player_done_making_moves()
-    return format_game_state(game)
+@router.delete("/{session_id}", status_code=204)
+async def end_session(session: Session = Depends(get_session)):
+    await SESSIONS.remove_async(session.id)
+
+
+@router.websocket("/{session_id}/ws")
+async def game_updates(websocket: WebSocket, session_id: str):
+    """Push the game state on connect and after every change, AI moves included."""
+    await websocket.accept()
+    session = await SESSIONS.get_async(session_id)
+    if session is None:
+        await websocket.close(code=UNKNOWN_SESSION_CLOSE_CODE)
+        return
+
+    updates = SESSIONS.subscribe(session_id)
+    updates.put_nowait(format_game_state(session).model_dump())
+    sender = asyncio.create_task(send_updates(websocket, updates))
+    try:
+        while True:
+            # Clients only listen; anything they send is ignored
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        SESSIONS.unsubscribe(session_id, updates)
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
+async def send_updates(websocket: WebSocket, updates: asyncio.Queue) -> None:
+    """Send a listener's queued updates until its session ends."""
+    while True:
+        update = await updates.get()
+        if update is None:
+            await websocket.close(code=UNKNOWN_SESSION_CLOSE_CODE)
+            return
+        await websocket.send_json(update)
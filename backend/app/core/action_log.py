@@ -0,0 +1,169 @@
+"""
+Append-only log of the actions that change a game.
+
+Every game records its actions as it goes: each roll with the dice it
+landed, each successful mark and each player finishing a stage. A record
+is a fixed 3-byte little-endian word (2 bits of kind, then the fields), so
+a whole game fits in well under a kilobyte and the log is cheap to append
+to, store or ship for analytics.
+
+Since the rules are deterministic once the dice are known, a snapshot plus
+the actions after it rebuild the game exactly (see
+serialization.replay_game()), AI choices included.
+"""
+
+from enum import IntEnum
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple
+
+from .die import DieColor
+from .evaluator import COLOR_INDEX, ROW_COLORS
+
+RECORD_BYTES = 3
+KIND_BITS = 2
+SEAT_BITS = 4
+COLOR_BITS = 2
+NUMBER_BITS = 4
+DIE_BITS = 3
+DICE_COUNT = 6
+
+
+class ActionKind(IntEnum):
+    """Kinds of logged actions."""
+
+    ROLL = 0  # Game.roll_dice()
+    MARK = 1  # Game.try_mark_number() that marked
+    DONE = 2  # Game.player_done_making_moves()
+    AI_DONE = 3  # An AI player finishing its stage in Game.apply_ai_decision()
+
+
+class Action(NamedTuple):
+    """
+    One logged action.
+
+    Attributes:
+        kind: What happened
+        seat: Index of the acting player (the roller for ROLL)
+        color: Marked row (MARK only)
+        number: Marked number (MARK only)
+        stage: Finished stage (AI_DONE only)
+        dice: Rolled dice in DICE_ORDER (ROLL only)
+    """
+
+    kind: ActionKind
+    seat: int
+    color: Optional[DieColor] = None
+    number: int = 0
+    stage: int = 0
+    dice: Optional[Tuple[int, ...]] = None
+
+
+class ActionLog:
+    """A game's actions as packed records."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes = b""):
+        """
+        Initialize a log.
+
+        Args:
+            data: Records from to_bytes() to start with
+
+        Raises:
+            ValueError: If data is not a whole number of records
+        """
+        if len(data) % RECORD_BYTES:
+            raise ValueError("Action log is not a whole number of records")
+        self.data = bytearray(data)
+
+    def __len__(self) -> int:
+        return len(self.data) // RECORD_BYTES
+
+    def __iter__(self) -> Iterator[Action]:
+        for offset in range(0, len(self.data), RECORD_BYTES):
+            yield self.decode(int.from_bytes(self.data[offset:offset + RECORD_BYTES], "little"))
+
+    def to_bytes(self) -> bytes:
+        """The records, oldest first."""
+        return bytes(self.data)
+
+    def clear(self) -> None:
+        """Drop every record, e.g. after a snapshot."""
+        self.data.clear()
+
+    def _append(self, kind: ActionKind, fields: int) -> None:
+        """Append one record."""
+        self.data += (kind | fields << KIND_BITS).to_bytes(RECORD_BYTES, "little")
+
+    def record_roll(self, seat: int, dice: Sequence[int]) -> None:
+        """
+        Log a roll.
+
+        Args:
+            seat: Index of the rolling player
+            dice: The six dice in DICE_ORDER
+        """
+        fields = seat
+        shift = SEAT_BITS
+        for value in dice:
+            fields |= (value - 1) << shift
+            shift += DIE_BITS
+        self._append(ActionKind.ROLL, fields)
+
+    def record_mark(self, seat: int, color: DieColor, number: int) -> None:
+        """
+        Log a mark.
+
+        Args:
+            seat: Index of the marking player
+            color: The marked row
+            number: The marked number
+        """
+        fields = seat | COLOR_INDEX[color] << SEAT_BITS | number << SEAT_BITS + COLOR_BITS
+        self._append(ActionKind.MARK, fields)
+
+    def record_done(self, seat: int) -> None:
+        """
+        Log a player being done making moves.
+
+        Args:
+            seat: Index of the player
+        """
+        self._append(ActionKind.DONE, seat)
+
+    def record_ai_done(self, seat: int, stage: int) -> None:
+        """
+        Log an AI player finishing its stage.
+
+        Args:
+            seat: Index of the AI player
+            stage: 1 or 2
+        """
+        self._append(ActionKind.AI_DONE, seat | (stage - 1) << SEAT_BITS)
+
+    @staticmethod
+    def decode(record: int) -> Action:
+        """
+        Unpack one record.
+
+        Args:
+            record: The record as an int
+
+        Returns:
+            The action
+        """
+        kind = ActionKind(record & ((1 << KIND_BITS) - 1))
+        fields = record >> KIND_BITS
+        seat = fields & ((1 << SEAT_BITS) - 1)
+        fields >>= SEAT_BITS
+        if kind == ActionKind.ROLL:
+            dice = tuple(
+                (fields >> (i * DIE_BITS) & ((1 << DIE_BITS) - 1)) + 1 for i in range(DICE_COUNT)
+            )
+            return Action(kind, seat, dice=dice)
+        if kind == ActionKind.MARK:
+            color = ROW_COLORS[fields & ((1 << COLOR_BITS) - 1)]
+            return Action(kind, seat, color=color, number=fields >> COLOR_BITS)
+        if kind == ActionKind.AI_DONE:
+            return Action(kind, seat, stage=(fields & 1) + 1)
+        return Action(kind, seat)
@@ -2,33 +2,709 @@
 AI Player class for the Qwixx game.
 """
 
+import math
 import random
-from typing import List, Tuple, Optional, Dict
+from functools import lru_cache
+from typing import List, NamedTuple, Sequence, Tuple, Optional, Dict, Union
+
 from .player import Player
+from .dice_roller import RollOptions
 from .die import DieColor
+from .evaluator import (
+    ADVANCED_WEIGHTS,
+    COLOR_INDEX,
+    EVALUATORS,
+    LOCK_DENIAL,
+    LOCK_POINTS,
+    OPPONENT_CONTEST,
+    OPPONENT_LOCK_THREAT,
+    OPPONENT_STRONG_ROW,
+    RARITY,
+    ROW_COLORS,
+    BoardFeatures,
+    LinearEvaluator,
+    end_number_bonus,
+    game_phase_bonus,
+    penalty_avoidance_bonus,
+    potential_row_score,
+    rarity,
+    row_synergy_bonus,
+)
+from .expectimax import (
+    DEFAULT_SEARCH_DEPTH,
+    DEFAULT_TIME_BUDGET,
+    ROW_VALUES,
+    ExpectimaxSearch,
+    RootOption,
+    SearchResult,
+    SearchState,
+    add_penalty,
+    mark,
+    state_from_scoresheet,
+)
+from . import mcts
+from .mcts import (
+    DEFAULT_MCTS_ROLLOUTS,
+    DEFAULT_MCTS_TIME_BUDGET,
+    DEFAULT_MCTS_WORKERS,
+    MCTSResult,
+)
+from .endgame import (
+    ENDGAME_MAX_NODES,
+    ENDGAME_MAX_STATES,
+    EndgameSolver,
+    opponent_model,
+    is_endgame,
+    reachable_positions,
+)
+from .opening_book import SKIP, OpeningBook, book_key, load_opening_book
+from .planner import TurnPlan, plan_turn
+from .row_values import RowValueTable, load_row_values, mark_deltas
+from .transposition import TranspositionTable
 from .scoresheet import Scoresheet
 from .game_state import GameState
 from .logger import get_ai_logger, log_player_decision, log_game_event
 
+# (score, color, number) for one candidate move
+ScoredMove = Tuple[float, DieColor, int]
+
+# Every difficulty an AIPlayer plays (new ones go last: stored games keep the index)
+DIFFICULTIES = ("easy", "medium", "hard", "expert", "mcts")
+
+# Difficulties that plan both stages of their own roll together
+PLANNED_DIFFICULTIES = ("medium", "hard")
+
+# Difficulties that play their first white-sum marks from the opening book
+BOOK_DIFFICULTIES = ("hard",)
+
+# Difficulties that solve the endgame exactly
+ENDGAME_DIFFICULTIES = ("hard", "expert")
+
+# Positions searched by every expert in this process (bounded LRU)
+EXPERT_TRANSPOSITIONS = TranspositionTable()
+
+# Endgame positions solved by every AI in this process (bounded LRU)
+ENDGAME_TRANSPOSITIONS = TranspositionTable()
+
+
+@lru_cache(maxsize=None)
+def row_value_deltas(num_players: int) -> List[List[float]]:
+    """
+    Row value change of marking each position, by row mask.
+
+    Read from the solved row value table, or the heuristic row values if
+    the table has not been generated.
+
+    Args:
+        num_players: Number of players in the game
+
+    Returns:
+        List indexed by (mask, position) (see row_values.mark_deltas())
+    """
+    table = load_row_values()
+    open_values = ROW_VALUES if table is None else table.for_players(num_players)[0]
+    return mark_deltas(open_values).tolist()
+
+
+class AIDecision(NamedTuple):
+    """
+    Result of a single-pass AI decision for one stage.
+
+    Attributes:
+        participate: Whether the AI decided to take part in the stage
+        move: (color, number) to mark, or None to skip
+        scored_moves: Every available move as (score, color, number), best first
+    """
+
+    participate: bool
+    move: Optional[Tuple[DieColor, int]]
+    scored_moves: Tuple[ScoredMove, ...]
+
+
+class PendingScores(NamedTuple):
+    """
+    A decision waiting for the heuristic scores of its moves.
+
+    Attributes:
+        available_moves: Moves to score, as (color, number)
+        features: Board features of the decision
+        evaluator: Evaluator the moves are scored with
+    """
+
+    available_moves: List[Tuple[DieColor, int]]
+    features: BoardFeatures
+    evaluator: LinearEvaluator
+
+
+class SearchRequired(NamedTuple):
+    """
+    A decision begin_decision() left alone because it needs a search.
+
+    Attributes:
+        search: The search it needs ("endgame", "expert" or "mcts")
+    """
+
+    search: str
+
 
 class AIPlayer(Player):
     """AI player that can make automated decisions in Qwixx."""
 
-    def __init__(self, name: str, player_id: int, difficulty: str = "medium"):
+    def __init__(
+        self,
+        name: str,
+        player_id: int,
+        difficulty: str = "medium",
+        rng: Optional[random.Random] = None,
+        simulation: bool = False,
+        search_depth: int = DEFAULT_SEARCH_DEPTH,
+        time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+        mcts_workers: int = DEFAULT_MCTS_WORKERS,
+        mcts_time_budget: Optional[float] = DEFAULT_MCTS_TIME_BUDGET,
+        mcts_rollouts: int = DEFAULT_MCTS_ROLLOUTS,
+    ):
         """
         Initialize an AI player.
 
         Args:
             name: The AI player's name
             player_id: Unique identifier for the player
-            difficulty: AI difficulty level ("easy", "medium", "hard")
+            difficulty: AI difficulty level ("easy", "medium", "hard", "expert",
+                "mcts")
+            rng: Random stream for the AI's choices (a fresh unseeded one if None)
+            simulation: Skip all logging (headless self-play)
+            search_depth: Rolls the expert looks ahead
+            time_budget: Seconds the expert may search per decision (None for
+                no limit); when even one roll does not fit it scores moves by
+                their solved row value, or plays like hard without the table
+            mcts_workers: Processes the mcts AI searches with in parallel
+            mcts_time_budget: Seconds the mcts AI may search per decision
+                (None for no limit)
+            mcts_rollouts: Most rollouts per mcts worker and decision
         """
         super().__init__(name, player_id)
         self.difficulty = difficulty
+        self.rng = rng if rng is not None else random.Random()
         self.is_ai = True
-        self.logger = get_ai_logger()
+        self.simulation = simulation
+        self.search_depth = search_depth
+        self.time_budget = time_budget
+        self.mcts_workers = mcts_workers
+        self.mcts_time_budget = mcts_time_budget
+        self.mcts_rollouts = mcts_rollouts
+        self.last_search: Optional[Union[SearchResult, MCTSResult]] = None
+        # Plan both stages of own rolls at once (cached for the roll)
+        self.plan_turns = difficulty in PLANNED_DIFFICULTIES
+        self._turn_plan: Optional[
+            Tuple[RollOptions, TurnPlan, Dict[Tuple[DieColor, int], float]]
+        ] = None
+        # Solve the own sheet to the end of the game once it is near
+        self.solve_endgames = difficulty in ENDGAME_DIFFICULTIES
+        # Solved single-row values (memory-mapped once per process)
+        self.row_values: Optional[RowValueTable] = (
+            load_row_values() if difficulty == "expert" else None
+        )
+        # Self-play values of opening positions (memory-mapped once per process)
+        self.opening_book: Optional[OpeningBook] = (
+            load_opening_book() if difficulty in BOOK_DIFFICULTIES else None
+        )
+        self.logger = None
+
+        if not simulation:
+            self.logger = get_ai_logger()
+            self.logger.info(
+                f"Auto Player {name} initialized with {difficulty} difficulty"
+            )
+
+    def decide(self, game, stage: int) -> AIDecision:
+        """
+        Make the whole decision for a stage in a single pass.
+
+        Available moves are enumerated and scored once; the same scores drive
+        both the participate/skip choice and the choice of move.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+
+        Returns:
+            The AIDecision for this stage
+        """
+        pending = self.begin_decision(game, stage)
+        if isinstance(pending, AIDecision):
+            return pending
+        scores = pending.evaluator.score_moves(pending.available_moves, pending.features)
+        return self.finish_decision(game, stage, pending, scores)
+
+    def begin_decision(
+        self, game, stage: int, search: bool = True
+    ) -> Union[AIDecision, PendingScores, SearchRequired]:
+        """
+        Make a stage decision up to the heuristic move scores.
+
+        Decisions that need no heuristic scores (no moves, endgame solver,
+        opening book, searches, turn plans) are made right away. Otherwise the
+        moves still to be scored are returned, so that many decisions can be
+        scored together before finish_decision().
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            search: Run the searches the decision needs; if False, a decision
+                that needs one is returned as SearchRequired instead, so
+                that callers that must stay responsive can make it elsewhere
+
+        Returns:
+            The AIDecision, the PendingScores it still needs, or SearchRequired
+        """
+        available_moves = self.get_available_moves(game)
+        if not available_moves:
+            return AIDecision(False, None, ())
+        if not search:
+            required = self.required_search(game)
+            if required is not None:
+                return SearchRequired(required)
+
+        decision = None
+        if self.solve_endgames:
+            decision = self._decide_endgame(game, stage, available_moves)
+        if decision is None and stage == 1 and self.opening_book is not None:
+            decision = self._decide_from_book(game, available_moves)
+        if decision is None:
+            if self.difficulty == "expert":
+                decision = self._decide_expert(game, stage, available_moves)
+            elif self.difficulty == "mcts":
+                decision = self._decide_mcts(game, stage, available_moves)
+            elif self.plan_turns and self == game.get_current_player():
+                decision = self._decide_planned(game, stage, available_moves)
+        if decision is not None:
+            self._log_move_decision(decision.move, available_moves)
+            return decision
+
+        return PendingScores(
+            available_moves, self.get_board_features(game), self._evaluator()
+        )
+
+    def finish_decision(
+        self, game, stage: int, pending: PendingScores, scores: Sequence[float]
+    ) -> AIDecision:
+        """
+        Complete a decision from begin_decision() once its moves are scored.
+
+        Args:
+            game: The current game instance, unchanged since begin_decision()
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            pending: The PendingScores from begin_decision()
+            scores: Score of each pending move, in order
+
+        Returns:
+            The AIDecision for this stage
+        """
+        available_moves = pending.available_moves
+        scored_moves = self._rank_moves(available_moves, scores)
+        if not self._decide_participation(game, stage, scored_moves):
+            return AIDecision(False, None, tuple(scored_moves))
+
+        move = self._select_move(available_moves, scored_moves)
+        self._log_move_decision(move, available_moves)
+        return AIDecision(True, move, tuple(scored_moves))
+
+    def required_search(self, game) -> Optional[str]:
+        """
+        Get the search this player's decisions need in the current position.
+
+        Args:
+            game: The current game instance
+
+        Returns:
+            "endgame", "expert" or "mcts", or None if the decision is cheap
+            (heuristics, opening book and turn plans)
+        """
+        if self.solve_endgames and self._endgame_position(game) is not None:
+            return "endgame"
+        if self.difficulty in ("expert", "mcts"):
+            return self.difficulty
+        return None
+
+    def quick_decision(self, game, stage: int) -> AIDecision:
+        """
+        Decide from the heuristic move scores alone, without any search.
+
+        A cheap stand-in when a full decision does not arrive in time.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+
+        Returns:
+            The AIDecision for this stage
+        """
+        available_moves = self.get_available_moves(game)
+        if not available_moves:
+            return AIDecision(False, None, ())
+        pending = PendingScores(
+            available_moves, self.get_board_features(game), self._evaluator()
+        )
+        scores = pending.evaluator.score_moves(available_moves, pending.features)
+        return self.finish_decision(game, stage, pending, scores)
+
+    def _decide_from_book(
+        self, game, available_moves: List[Tuple[DieColor, int]]
+    ) -> Optional[AIDecision]:
+        """
+        White-sum decision looked up in the opening book.
+
+        Args:
+            game: The current game instance
+            available_moves: List of (color, number) tuples representing valid moves
+
+        Returns:
+            The AIDecision scored by the book's values, or None if the
+            position is not in the book
+        """
+        key = book_key(
+            state_from_scoresheet(self.get_scoresheet(), game.get_locked_colors()),
+            game.get_roll_options().white_sum,
+            self == game.get_current_player(),
+            len(game.get_players()),
+        )
+        values = None if key is None else self.opening_book.lookup(key)
+        if values is None:
+            return None
 
-        self.logger.info(f"Auto Player {name} initialized with {difficulty} difficulty")
+        scored_moves = tuple(
+            sorted(
+                (
+                    (float(values[1 + COLOR_INDEX[color]]), color, number)
+                    for color, number in available_moves
+                ),
+                key=lambda x: x[0],
+                reverse=True,
+            )
+        )
+        if any(math.isnan(score) for score, _, _ in scored_moves):
+            # The book was built under other rules: do not trust it
+            return None
+        if values[SKIP] >= scored_moves[0][0]:
+            return AIDecision(False, None, scored_moves)
+        return AIDecision(True, scored_moves[0][1:], scored_moves)
+
+    def _decide_planned(
+        self, game, stage: int, available_moves: List[Tuple[DieColor, int]]
+    ) -> Optional[AIDecision]:
+        """
+        Rolling player's decision from the plan for both stages of the roll.
+
+        The plan is made at the first decision of a roll and reused for the
+        second, so the moves are scored once per roll.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            available_moves: List of (color, number) tuples representing valid moves
+
+        Returns:
+            The AIDecision, or None if the planned move is no longer available
+        """
+        roll_options = game.get_roll_options()
+        if self._turn_plan is None or self._turn_plan[0] is not roll_options:
+            white_moves = available_moves if stage == 1 else []
+            self._turn_plan = (roll_options, *self._plan_turn(game, white_moves))
+        _, plan, scores = self._turn_plan
+
+        scored_moves = tuple(
+            sorted(
+                ((scores[move], *move) for move in available_moves if move in scores),
+                key=lambda x: x[0],
+                reverse=True,
+            )
+        )
+        move = plan.white if stage == 1 else plan.colored
+        if move is None:
+            return AIDecision(False, None, scored_moves)
+        if move not in available_moves or len(scored_moves) != len(available_moves):
+            return None
+        return AIDecision(True, move, scored_moves)
+
+    def _plan_turn(
+        self, game, white_moves: List[Tuple[DieColor, int]]
+    ) -> Tuple[TurnPlan, Dict[Tuple[DieColor, int], float]]:
+        """
+        Score the white and colored marks of the roll once and plan both stages.
+
+        Args:
+            game: The current game instance
+            white_moves: Legal stage 1 marks (empty if stage 1 is over)
+
+        Returns:
+            Tuple of (plan, score of every candidate mark)
+        """
+        roll_options = game.get_roll_options()
+        locked_colors = game.get_locked_colors()
+        colored_moves = [
+            (color, number)
+            for color, sums in roll_options.colored_sums.items()
+            if color not in locked_colors
+            for number in sums
+        ]
+        candidates = list(dict.fromkeys([*white_moves, *colored_moves]))
+        evaluator = EVALUATORS["hard" if self.difficulty == "hard" else "medium"]
+        scores = dict(
+            zip(candidates, evaluator.score_moves(candidates, self.get_board_features(game)))
+        )
+
+        penalties = self.get_scoresheet().penalties
+        plan = plan_turn(
+            state_from_scoresheet(self.get_scoresheet(), locked_colors),
+            {move: scores[move] for move in white_moves},
+            {move: scores[move] for move in colored_moves},
+            self._get_skip_threshold(penalties, True, 1),
+            self._get_skip_threshold(penalties, True, 2),
+        )
+        return plan, scores
+
+    def _decide_expert(
+        self, game, stage: int, available_moves: List[Tuple[DieColor, int]]
+    ) -> Optional[AIDecision]:
+        """
+        Expert decision: expectimax over the next rolls.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            available_moves: List of (color, number) tuples representing valid moves
+
+        Returns:
+            The AIDecision, or None if the search ran out of time
+        """
+        players = game.get_players()
+        current_index = players.index(game.get_current_player())
+        own_index = players.index(self)
+        state = state_from_scoresheet(self.get_scoresheet(), game.get_locked_colors())
+        options = self._root_options(game, stage, available_moves, state)
+
+        row_values = None
+        if self.row_values is not None:
+            row_values = self.row_values.for_players(len(players))[0]
+
+        search = ExpectimaxSearch(
+            len(players),
+            (current_index - own_index) % len(players),
+            row_values,
+            table=EXPERT_TRANSPOSITIONS,
+        )
+        result = search.search(options, self.search_depth, self.time_budget)
+        if not self.simulation:
+            self.logger.debug(f"{self.name} transposition table: {search.table.stats()}")
+        if result is None and row_values is not None:
+            # Out of time: score the moves by their row value delta alone
+            result = SearchResult(
+                [search.option_value(option, 0) for option in options], 0, 0
+            )
+        self.last_search = result
+        if result is None:
+            if not self.simulation:
+                self.logger.info(
+                    f"{self.name} search ran out of time, falling back to hard play"
+                )
+            return None
+        return self._decision_from_values(options, result.values)
+
+    def _decide_endgame(
+        self, game, stage: int, available_moves: List[Tuple[DieColor, int]]
+    ) -> Optional[AIDecision]:
+        """
+        Endgame decision: solve the own scoresheet to the end of the game.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            available_moves: List of (color, number) tuples representing valid moves
+
+        Returns:
+            The AIDecision, or None if the game is not in its endgame, the
+            sheet is still too open to solve or the solve ran over its
+            position budget
+        """
+        position = self._endgame_position(game)
+        if position is None:
+            return None
+
+        states, own_index = position
+        players = game.get_players()
+        options = self._root_options(game, stage, available_moves, states[own_index])
+        current_index = players.index(game.get_current_player())
+        solver = EndgameSolver(
+            opponent_model(states, own_index),
+            (current_index - own_index) % len(players),
+            table=ENDGAME_TRANSPOSITIONS,
+        )
+        result = solver.solve(options, max_nodes=ENDGAME_MAX_NODES)
+        self.last_search = result
+        if result is None:
+            if not self.simulation:
+                self.logger.debug(f"{self.name} endgame solve ran over its budget")
+            return None
+        if not self.simulation:
+            self.logger.debug(
+                f"{self.name} solved the endgame ({result.nodes} new positions)"
+            )
+        return self._decision_from_values(options, result.values)
+
+    def _endgame_position(self, game) -> Optional[Tuple[Tuple[SearchState, ...], int]]:
+        """
+        Get the position for the endgame solver, if it takes over.
+
+        Args:
+            game: The current game instance
+
+        Returns:
+            Tuple of (search state of every player, own seat), or None if the
+            game is not in its endgame or the own sheet is too open to solve
+        """
+        players = game.get_players()
+        locked_colors = game.get_locked_colors()
+        states = tuple(
+            state_from_scoresheet(player.get_scoresheet(), locked_colors)
+            for player in players
+        )
+        own_index = players.index(self)
+        state = states[own_index]
+        if not is_endgame(states) or reachable_positions(state) > ENDGAME_MAX_STATES:
+            return None
+        return states, own_index
+
+    def _root_options(
+        self,
+        game,
+        stage: int,
+        available_moves: List[Tuple[DieColor, int]],
+        state: SearchState,
+    ) -> List[RootOption]:
+        """
+        Build the search root: every available move and the skip.
+
+        On their own roll in stage 1 the player also considers the colored
+        combinations they can follow up with in stage 2.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            available_moves: List of (color, number) tuples representing valid moves
+            state: The player's search state
+
+        Returns:
+            One RootOption per available move, followed by the skip
+        """
+        roll_options = game.get_roll_options()
+        is_active_player = self == game.get_current_player()
+
+        def colored_outcomes(after_white: SearchState) -> List[SearchState]:
+            outcomes = []
+            for color, sums in roll_options.colored_sums.items():
+                row = COLOR_INDEX[color]
+                for number in sums:
+                    marked = mark(after_white, row, number)
+                    if marked is not None:
+                        outcomes.append(marked)
+            return outcomes
+
+        options = []
+        for color, number in available_moves:
+            marked = mark(state, COLOR_INDEX[color], number)
+            if stage == 1 and is_active_player:
+                outcomes = (marked, *colored_outcomes(marked))
+            else:
+                outcomes = (marked,)
+            options.append(RootOption((color, number), outcomes))
+
+        if not is_active_player:
+            skip_outcomes = (state,)
+        elif stage == 1:
+            # Skipping now only avoids the penalty with a colored mark later
+            skip_outcomes = tuple(colored_outcomes(state)) or (add_penalty(state),)
+        elif game.rolling_player_made_stage_1_move:
+            skip_outcomes = (state,)
+        else:
+            skip_outcomes = (add_penalty(state),)
+        options.append(RootOption(None, skip_outcomes))
+        return options
+
+    def _decision_from_values(
+        self, options: List[RootOption], values: List[float]
+    ) -> AIDecision:
+        """
+        Play the best valued root option.
+
+        Args:
+            options: Root options from _root_options()
+            values: Value of each option, in order
+
+        Returns:
+            The AIDecision with the moves scored by their values
+        """
+        scored_moves = sorted(
+            (
+                (value, option.move[0], option.move[1])
+                for value, option in zip(values, options)
+                if option.move is not None
+            ),
+            key=lambda x: x[0],
+            reverse=True,
+        )
+        best_value, best_color, best_number = scored_moves[0]
+        if best_value <= values[-1]:
+            return AIDecision(False, None, tuple(scored_moves))
+        return AIDecision(True, (best_color, best_number), tuple(scored_moves))
+
+    def _decide_mcts(
+        self, game, stage: int, available_moves: List[Tuple[DieColor, int]]
+    ) -> Optional[AIDecision]:
+        """
+        mcts decision: flat Monte Carlo rollouts of every move and the skip
+        on sampled dice.
+
+        Args:
+            game: The current game instance
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            available_moves: List of (color, number) tuples representing valid moves
+
+        Returns:
+            The AIDecision, or None if no rollout finished in time
+        """
+        options = [*available_moves, None]
+        result = mcts.search(
+            game.snapshot(),
+            game.get_players().index(self),
+            stage,
+            options,
+            self.rng.getrandbits(63),
+            workers=self.mcts_workers,
+            time_budget=self.mcts_time_budget,
+            max_rollouts=self.mcts_rollouts,
+        )
+        self.last_search = result
+        if result.rollouts == 0:
+            if not self.simulation:
+                self.logger.info(
+                    f"{self.name} search ran out of time, falling back to hard play"
+                )
+            return None
+
+        scored_moves = tuple(
+            sorted(
+                (
+                    (value, color, number)
+                    for value, (color, number) in zip(result.values, available_moves)
+                ),
+                key=lambda x: x[0],
+                reverse=True,
+            )
+        )
+        best = max(range(len(options)), key=lambda i: result.visits[i])
+        if options[best] is None:
+            return AIDecision(False, None, scored_moves)
+        return AIDecision(True, options[best], scored_moves)
 
     def make_move_decision(
         self, game, available_moves: List[Tuple[DieColor, int]]
@@ -44,21 +720,33 @@ class AIPlayer(Player):
             Tuple of (color, number) to mark, or None to skip
         """
         if not available_moves:
-            self.logger.debug(f"{self.name} has no available moves")
+            if not self.simulation:
+                self.logger.debug(f"{self.name} has no available moves")
             return None
 
+        if self.difficulty == "easy":
+            decision = self._make_easy_decision(available_moves)
+        else:
+            decision = self._select_move(
+                available_moves, self._score_moves(game, available_moves)
+            )
+
+        self._log_move_decision(decision, available_moves)
+        return decision
+
+    def _log_move_decision(
+        self,
+        decision: Optional[Tuple[DieColor, int]],
+        available_moves: List[Tuple[DieColor, int]],
+    ) -> None:
+        """Log the move chosen (or skipped) among the available moves."""
+        if self.simulation:
+            return
+
         self.logger.debug(
             f"{self.name} considering {len(available_moves)} moves: {available_moves}"
         )
 
-        decision = None
-        if self.difficulty == "easy":
-            decision = self._make_easy_decision(available_moves)
-        elif self.difficulty == "medium":
-            decision = self._make_medium_decision(game, available_moves)
-        else:  # hard
-            decision = self._make_hard_decision(game, available_moves)
-
         if decision:
             color, number = decision
             self.logger.info(
@@ -84,15 +772,109 @@ class AIPlayer(Player):
                 available_moves=[(c.value, n) for c, n in available_moves],
             )
 
-        return decision
+    def _score_moves(
+        self, game, available_moves: List[Tuple[DieColor, int]]
+    ) -> List[ScoredMove]:
+        """
+        Score every available move once with this difficulty's evaluator.
+
+        Args:
+            game: The current game instance
+            available_moves: List of (color, number) tuples representing valid moves
+
+        Returns:
+            List of (score, color, number) tuples, best first
+        """
+        features = self.get_board_features(game)
+        scores = self._evaluator().score_moves(available_moves, features)
+        return self._rank_moves(available_moves, scores)
+
+    def _evaluator(self) -> LinearEvaluator:
+        """Evaluator this difficulty scores moves with."""
+        if self.difficulty in ("hard", "expert", "mcts"):
+            return EVALUATORS["hard"]
+        return EVALUATORS["medium"]
+
+    def _rank_moves(
+        self, available_moves: List[Tuple[DieColor, int]], scores: Sequence[float]
+    ) -> List[ScoredMove]:
+        """Pair moves with their scores, best first."""
+        scored_moves = [
+            (score, color, number)
+            for score, (color, number) in zip(scores, available_moves)
+        ]
+
+        # Sort by score (highest first) - only compare the score (first element)
+        scored_moves.sort(key=lambda x: x[0], reverse=True)
+        return scored_moves
+
+    def get_board_features(self, game) -> BoardFeatures:
+        """
+        Extract the whole-board aggregates the evaluators need.
+
+        Called once per decision so that scoring a move only does the work
+        specific to that move.
+
+        Args:
+            game: The current game instance
+
+        Returns:
+            The board features
+        """
+        rows = self.get_scoresheet().rows
+        row_marks = {color: rows[color].mark_count for color in ROW_COLORS}
+        total_marks = sum(row_marks.values())
+
+        avg_other_marks = {}
+        for color in ROW_COLORS:
+            other_marks = [row_marks[c] for c in ROW_COLORS if c != color]
+            avg_other_marks[color] = sum(other_marks) / len(other_marks)
+
+        players = game.get_players()
+        opponent_rows = [
+            player.get_scoresheet().rows for player in players if player != self
+        ]
+        deltas = row_value_deltas(len(players))
+        opponent_marks = {
+            color: tuple(other[color].mark_count for other in opponent_rows)
+            for color in ROW_COLORS
+        }
+
+        return BoardFeatures(
+            row_marks=row_marks,
+            total_marks=total_marks,
+            avg_other_marks=avg_other_marks,
+            locked_colors=len(game.get_locked_colors()),
+            penalty_avoidance_bonus=self._calculate_penalty_avoidance_bonus(game),
+            opponent_marks=opponent_marks,
+            opponent_total_marks={
+                color: sum(marks) for color, marks in opponent_marks.items()
+            },
+            row_value_deltas={
+                color: deltas[rows[color].mask] for color in ROW_COLORS
+            },
+        )
+
+    def _select_move(
+        self,
+        available_moves: List[Tuple[DieColor, int]],
+        scored_moves: List[ScoredMove],
+    ) -> Optional[Tuple[DieColor, int]]:
+        """Pick a move from already scored moves according to the difficulty."""
+        if self.difficulty == "easy":
+            return self._make_easy_decision(available_moves)
+        elif self.difficulty == "medium":
+            return self._select_medium_move(scored_moves)
+        else:  # hard
+            return self._select_hard_move(scored_moves)
 
     def _make_easy_decision(
         self, available_moves: List[Tuple[DieColor, int]]
     ) -> Optional[Tuple[DieColor, int]]:
         """Easy AI: Random selection with 70% chance to make a move."""
-        if random.random() < 0.3:  # 30% chance to skip
+        if self.rng.random() < 0.3:  # 30% chance to skip
             return None
-        return random.choice(available_moves)
+        return self.rng.choice(available_moves)
 
     def _make_medium_decision(
         self, game, available_moves: List[Tuple[DieColor, int]]
@@ -101,23 +883,20 @@ class AIPlayer(Player):
         if not available_moves:
             return None
 
-        # Score each move based on various factors
-        scored_moves = []
-
-        for color, number in available_moves:
-            score = self._evaluate_move(game, color, number)
-            scored_moves.append((score, color, number))
-
-        # Sort by score (highest first) - only compare the score (first element)
-        scored_moves.sort(key=lambda x: x[0], reverse=True)
+        scored_moves = self._score_moves(game, available_moves)
+        return self._select_medium_move(scored_moves)
 
+    def _select_medium_move(
+        self, scored_moves: List[ScoredMove]
+    ) -> Tuple[DieColor, int]:
+        """Medium AI move choice from moves sorted best first."""
         # 85% chance to pick the best move, 15% chance for some randomness
-        if random.random() < 0.85:
+        if self.rng.random() < 0.85:
             return (scored_moves[0][1], scored_moves[0][2])
         else:
             # Pick from top 3 moves or all if fewer available
             top_moves = scored_moves[: min(3, len(scored_moves))]
-            _, color, number = random.choice(top_moves)
+            _, color, number = self.rng.choice(top_moves)
             return (color, number)
 
     def _make_hard_decision(
@@ -127,18 +906,13 @@ class AIPlayer(Player):
         if not available_moves:
             return None
 
-        # Score each move with advanced evaluation
-        scored_moves = []
-
-        for color, number in available_moves:
-            score = self._evaluate_move_advanced(game, color, number)
-            scored_moves.append((score, color, number))
-
-        # Sort by score (highest first) - only compare the score (first element)
-        scored_moves.sort(key=lambda x: x[0], reverse=True)
+        scored_moves = self._score_moves(game, available_moves)
+        return self._select_hard_move(scored_moves)
 
+    def _select_hard_move(self, scored_moves: List[ScoredMove]) -> Tuple[DieColor, int]:
+        """Hard AI move choice from moves sorted best first."""
         # 95% chance to pick the best move
-        if random.random() < 0.95:
+        if self.rng.random() < 0.95:
             return (scored_moves[0][1], scored_moves[0][2])
         else:
             # Small chance for suboptimal play to avoid being too predictable
@@ -148,7 +922,13 @@ class AIPlayer(Player):
                 else (scored_moves[1][1], scored_moves[1][2])
             )
 
-    def _evaluate_move(self, game, color: DieColor, number: int) -> float:
+    def _evaluate_move(
+        self,
+        game,
+        color: DieColor,
+        number: int,
+        features: Optional[BoardFeatures] = None,
+    ) -> float:
         """
         Evaluate a move with basic strategy.
 
@@ -156,61 +936,20 @@ class AIPlayer(Player):
             game: The current game instance
             color: The color row to mark
             number: The number to mark
+            features: Board features of this decision (extracted if None)
 
         Returns:
             Score for this move (higher is better)
         """
-        score = 0.0
-        scoresheet = self.get_scoresheet()
-        row = scoresheet.rows[color]
-
-        # Base score: prefer moves that advance further in the row
-        marked_count = len(row.marked)
-        score += marked_count * 2  # More marks = higher score potential
-
-        # CRITICAL: Early game positioning penalty for high numbers
-        early_game_penalty = self._calculate_early_game_positioning_penalty(
-            color, number, marked_count
-        )
-        score += early_game_penalty
-
-        # Enhanced: Prioritize numbers closer to the ends of rows (2s and 12s)
-        end_number_bonus = self._calculate_end_number_bonus(color, number)
-        score += end_number_bonus
-
-        # Bonus for getting closer to locking a row, but only if we have good positioning
-        if color in [DieColor.RED, DieColor.YELLOW]:
-            # For ascending rows, prefer higher numbers
-            progress = (number - 2) / 10.0  # Normalize to 0-1
-        else:
-            # For descending rows, prefer lower numbers
-            progress = (12 - number) / 10.0  # Normalize to 0-1
-
-        # Only give progress bonus if we're not making a bad early positioning move
-        if marked_count > 0 or not self._is_bad_early_positioning(color, number):
-            score += progress * 3
-
-        # Enhanced: Stronger bonus for moves that enable locking a row
-        if self._can_enable_row_lock(row, number, marked_count):
-            score += 8  # Increased from 5 to 8
-
-        # Enhanced: Improved penalty avoidance logic
-        penalty_risk_bonus = self._calculate_penalty_avoidance_bonus(game)
-        score += penalty_risk_bonus
-
-        # Penalty if the row is already well-advanced by others
-        # (Check if other players have many marks in this color)
-        other_players_marks = 0
-        for player in game.get_players():
-            if player != self:
-                other_players_marks += len(player.get_scoresheet().rows[color].marked)
-
-        if other_players_marks > marked_count + 2:
-            score -= 2  # Slight penalty for falling behind
-
-        return score
-
-    def _evaluate_move_advanced(self, game, color: DieColor, number: int) -> float:
+        return self._score_single_move(game, color, number, features, "medium")
+
+    def _evaluate_move_advanced(
+        self,
+        game,
+        color: DieColor,
+        number: int,
+        features: Optional[BoardFeatures] = None,
+    ) -> float:
         """
         Advanced move evaluation with more sophisticated strategy.
 
@@ -218,77 +957,29 @@ class AIPlayer(Player):
             game: The current game instance
             color: The color row to mark
             number: The number to mark
+            features: Board features of this decision (extracted if None)
 
         Returns:
             Score for this move (higher is better)
         """
-        score = self._evaluate_move(game, color, number)
-
-        scoresheet = self.get_scoresheet()
-        row = scoresheet.rows[color]
-
-        # Advanced factors
-
-        # 1. Enhanced opponent analysis and blocking
-        opponent_blocking_bonus = self._calculate_opponent_blocking_bonus(
-            game, color, number
-        )
-        score += opponent_blocking_bonus
-
-        # 2. Probabilistic analysis for future dice rolls
-        probability_bonus = self._calculate_probability_bonus(color, number)
-        score += probability_bonus
-
-        # 3. Dynamic strategy based on game phase
-        game_phase_bonus = self._calculate_game_phase_bonus(game, color, number)
-        score += game_phase_bonus
-
-        # 4. Enhanced row locking value calculation
-        row_lock_value = self._calculate_enhanced_row_lock_value(game, color, number)
-        score += row_lock_value
-
-        # 5. Consider synergy with other rows (improved)
-        synergy_bonus = self._calculate_row_synergy_bonus(scoresheet, color)
-        score += synergy_bonus
-
-        # 6. End-game considerations (enhanced)
-        locked_colors = len(game.get_locked_colors())
-        if locked_colors >= 1:  # End game approaching
-            # Prioritize rows with more potential points
-            potential_score = self._calculate_potential_row_score(
-                row, len(row.marked) + 1
-            )
-            score += potential_score * 0.7  # Increased weight
-
-        # 7. Advanced early game positioning analysis
-        advanced_positioning_bonus = self._calculate_advanced_positioning_bonus(
-            game, color, number
-        )
-        score += advanced_positioning_bonus
-
-        # 8. Hard mode specific penalty: Avoid marking 11 in red row as first move (legacy)
-        red_11_penalty = self._calculate_red_11_penalty(color, number)
-        score += red_11_penalty
-
-        return score
+        return self._score_single_move(game, color, number, features, "hard")
+
+    def _score_single_move(
+        self,
+        game,
+        color: DieColor,
+        number: int,
+        features: Optional[BoardFeatures],
+        difficulty: str,
+    ) -> float:
+        """Score one move with the linear evaluator of a difficulty."""
+        if features is None:
+            features = self.get_board_features(game)
+        return EVALUATORS[difficulty].score_moves([(color, number)], features)[0]
 
     def _calculate_potential_row_score(self, row, mark_count: int) -> int:
         """Calculate potential score for a row with given number of marks."""
-        if mark_count <= 0:
-            return 0
-        elif mark_count == 1:
-            return 1
-        elif mark_count == 2:
-            return 3
-        elif mark_count == 3:
-            return 6
-        elif mark_count == 4:
-            return 10
-        elif mark_count == 5:
-            return 15
-        elif mark_count >= 6:
-            return 21 + (mark_count - 6) * 7  # Locked row bonus
-        return 0
+        return potential_row_score(mark_count)
 
     def _calculate_end_number_bonus(self, color: DieColor, number: int) -> float:
         """
@@ -301,19 +992,7 @@ class AIPlayer(Player):
         Returns:
             Bonus score for the last number in the row
         """
-        if color in [DieColor.RED, DieColor.YELLOW]:
-            # For ascending rows (2-12), only 12 is the last number
-            if number == 12:
-                return 4.0
-            elif number >= 10:
-                return 2.0  # Close to end bonus
-        else:
-            # For descending rows (12-2), only 2 is the last number
-            if number == 2:
-                return 4.0
-            elif number <= 4:
-                return 2.0  # Close to end bonus
-        return 0.0
+        return end_number_bonus(color, number)
 
     def _can_enable_row_lock(self, row, number: int, marked_count: int) -> bool:
         """
@@ -345,20 +1024,14 @@ class AIPlayer(Player):
         Returns:
             Bonus score for penalty avoidance
         """
-        scoresheet = self.get_scoresheet()
-        penalty_count = scoresheet.penalties
-
-        # Higher bonus as penalty count increases
-        if penalty_count >= 3:
-            return 3.0  # Very high risk, prioritize any move
-        elif penalty_count >= 2:
-            return 2.0  # High risk
-        elif penalty_count >= 1:
-            return 1.0  # Moderate risk
-        return 0.0
+        return penalty_avoidance_bonus(self.get_scoresheet().penalties)
 
     def _calculate_opponent_blocking_bonus(
-        self, game, color: DieColor, number: int
+        self,
+        game,
+        color: DieColor,
+        number: int,
+        features: Optional[BoardFeatures] = None,
     ) -> float:
         """
         Calculate bonus for blocking opponents from high-value moves or row locks.
@@ -367,30 +1040,29 @@ class AIPlayer(Player):
             game: The current game instance
             color: The color row
             number: The number being evaluated
+            features: Board features of this decision (extracted if None)
 
         Returns:
             Bonus score for opponent blocking
         """
-        bonus = 0.0
-
-        for player in game.get_players():
-            if player != self:
-                other_scoresheet = player.get_scoresheet()
-                other_row = other_scoresheet.rows[color]
-
-                # High bonus if opponent is close to locking this row
-                if len(other_row.marked) >= 4:
-                    rightmost_number = other_row.numbers[-1]
-                    if number == rightmost_number:
-                        bonus += 6.0  # Block their lock attempt
-                    else:
-                        bonus += 3.0  # Compete in their strong row
+        if features is None:
+            features = self.get_board_features(game)
 
-                # Bonus for blocking high-value positions
-                elif len(other_row.marked) >= 2:
-                    bonus += 1.5  # Moderate competition bonus
+        # Every sheet has the same layout, so the opponents' rightmost number is ours
+        is_rightmost = number == self.get_scoresheet().rows[color].numbers[-1]
 
-        return bonus
+        bonus = 0.0
+        for opponent_marks in features.opponent_marks[color]:
+            # High bonus if opponent is close to locking this row
+            if opponent_marks >= 4:
+                if is_rightmost:
+                    bonus += ADVANCED_WEIGHTS[OPPONENT_LOCK_THREAT]
+                else:
+                    bonus += ADVANCED_WEIGHTS[OPPONENT_STRONG_ROW]
+            elif opponent_marks >= 2:
+                bonus += ADVANCED_WEIGHTS[OPPONENT_CONTEST]
+
+        return float(bonus)
 
     def _calculate_probability_bonus(self, color: DieColor, number: int) -> float:
         """
@@ -403,29 +1075,16 @@ class AIPlayer(Player):
         Returns:
             Bonus score based on roll probability
         """
-        # Dice roll probabilities for sums (2 white dice + 1 colored die scenarios)
-        # More likely sums get lower bonus (easier to get later)
-        # Less likely sums get higher bonus (harder to get later)
-
-        probability_map = {
-            2: 0.028,  # 1/36 (only 1+1)
-            3: 0.056,  # 2/36 (1+2, 2+1)
-            4: 0.083,  # 3/36 (1+3, 2+2, 3+1)
-            5: 0.111,  # 4/36
-            6: 0.139,  # 5/36
-            7: 0.167,  # 6/36 (most common)
-            8: 0.139,  # 5/36
-            9: 0.111,  # 4/36
-            10: 0.083,  # 3/36
-            11: 0.056,  # 2/36
-            12: 0.028,  # 1/36 (only 6+6)
-        }
-
-        prob = probability_map.get(number, 0.1)
-        # Inverse relationship: lower probability = higher bonus
-        return (0.2 - prob) * 10  # Scale to reasonable bonus range
-
-    def _calculate_game_phase_bonus(self, game, color: DieColor, number: int) -> float:
+        # Less likely sums get a higher bonus (harder to get later)
+        return rarity(number) * float(ADVANCED_WEIGHTS[RARITY])
+
+    def _calculate_game_phase_bonus(
+        self,
+        game,
+        color: DieColor,
+        number: int,
+        features: Optional[BoardFeatures] = None,
+    ) -> float:
         """
         Calculate bonus based on current game phase strategy.
 
@@ -433,42 +1092,24 @@ class AIPlayer(Player):
             game: The current game instance
             color: The color row
             number: The number being evaluated
+            features: Board features of this decision (extracted if None)
 
         Returns:
             Bonus score based on game phase
         """
-        scoresheet = self.get_scoresheet()
-        # Only count colored dice rows (exclude WHITE)
-        colored_dice = [DieColor.RED, DieColor.YELLOW, DieColor.GREEN, DieColor.BLUE]
-        total_marks = sum(len(scoresheet.rows[c].marked) for c in colored_dice)
-        locked_colors = len(game.get_locked_colors())
-        row = scoresheet.rows[color]
-
-        # Early game (0-8 total marks): Spread strategy
-        if total_marks <= 8:
-            if len(row.marked) == 0:
-                return 2.0  # Bonus for starting new rows
-            elif len(row.marked) <= 2:
-                return 1.0  # Moderate bonus for early development
-
-        # Mid game (9-16 total marks): Balanced strategy
-        elif total_marks <= 16:
-            if len(row.marked) >= 2:
-                return 2.0  # Focus on developing existing rows
-            elif len(row.marked) >= 4:
-                return 3.0  # High bonus for rows close to completion
-
-        # Late game (17+ total marks or any locked colors): Focus strategy
-        else:
-            if len(row.marked) >= 3:
-                return 4.0  # Very high bonus for advanced rows
-            elif locked_colors >= 1:
-                return 5.0  # Emergency focus in endgame
+        if features is None:
+            features = self.get_board_features(game)
 
-        return 0.0
+        return game_phase_bonus(
+            features.total_marks, features.locked_colors, features.row_marks[color]
+        )
 
     def _calculate_enhanced_row_lock_value(
-        self, game, color: DieColor, number: int
+        self,
+        game,
+        color: DieColor,
+        number: int,
+        features: Optional[BoardFeatures] = None,
     ) -> float:
         """
         Calculate enhanced value for locking a row, considering points and strategic denial.
@@ -477,256 +1118,99 @@ class AIPlayer(Player):
             game: The current game instance
             color: The color row
             number: The number being evaluated
+            features: Board features of this decision (extracted if None)
 
         Returns:
             Enhanced value score for row locking
         """
-        scoresheet = self.get_scoresheet()
-        row = scoresheet.rows[color]
+        row = self.get_scoresheet().rows[color]
+        marked_count = row.mark_count
 
-        if not self._can_enable_row_lock(row, number, len(row.marked)):
+        if not self._can_enable_row_lock(row, number, marked_count):
             return 0.0
 
+        if features is None:
+            features = self.get_board_features(game)
+
         # Base value: points gained from locking
-        current_score = row.get_score()
-        locked_score = self._calculate_potential_row_score(row, len(row.marked) + 1)
-        point_value = locked_score - current_score
+        point_value = potential_row_score(marked_count + 1) - row.get_score()
 
         # Strategic denial value: prevent opponents from using this color
-        denial_value = 0.0
-        for player in game.get_players():
-            if player != self:
-                other_row = player.get_scoresheet().rows[color]
-                opponent_marks = len(other_row.marked)
-                if opponent_marks >= 2:
-                    # Higher denial value for more advanced opponent rows
-                    denial_value += opponent_marks * 1.5
+        denial_marks = sum(m for m in features.opponent_marks[color] if m >= 2)
 
-        return point_value * 2.0 + denial_value
+        return float(
+            point_value * ADVANCED_WEIGHTS[LOCK_POINTS]
+            + denial_marks * ADVANCED_WEIGHTS[LOCK_DENIAL]
+        )
 
-    def _calculate_row_synergy_bonus(self, scoresheet, color: DieColor) -> float:
+    def _calculate_row_synergy_bonus(
+        self,
+        scoresheet,
+        color: DieColor,
+        features: Optional[BoardFeatures] = None,
+    ) -> float:
         """
         Calculate bonus for row synergy and balanced development.
 
         Args:
             scoresheet: The player's scoresheet
             color: The color row being evaluated
+            features: Board features of this decision (computed from the
+                scoresheet if None)
 
         Returns:
             Synergy bonus score
         """
-        row = scoresheet.rows[color]
-        current_marks = len(row.marked)
+        if features is not None:
+            return row_synergy_bonus(
+                features.row_marks[color], features.avg_other_marks[color]
+            )
 
         # Calculate marks in other rows (exclude WHITE)
-        colored_dice = [DieColor.RED, DieColor.YELLOW, DieColor.GREEN, DieColor.BLUE]
-        other_marks = []
-        for other_color in colored_dice:
-            if other_color != color:
-                other_marks.append(len(scoresheet.rows[other_color].marked))
-
-        avg_other_marks = sum(other_marks) / len(other_marks) if other_marks else 0
-
-        # Bonus for balanced development
-        if abs(current_marks - avg_other_marks) <= 1:
-            return 1.5  # Good balance
-        elif current_marks < avg_other_marks - 2:
-            return 2.0  # Catch up bonus
-        elif current_marks > avg_other_marks + 3:
-            return -1.0  # Penalty for over-development
-
-        return 0.0
-
-    def _calculate_early_game_positioning_penalty(
-        self, color: DieColor, number: int, marked_count: int
-    ) -> float:
-        """
-        Calculate penalty for poor early game positioning (marking high numbers early).
-
-        The key insight is that in Qwixx, preserving flexibility is crucial. Making a move
-        that blocks many future numbers is often worse than skipping entirely.
-
-        Args:
-            color: The color row being evaluated
-            number: The number being evaluated
-            marked_count: Current number of marks in this row
-
-        Returns:
-            Penalty score (negative) for bad positioning, 0 otherwise
-        """
-        # Only apply penalties for early moves in a row (0-3 marks)
-        if marked_count > 3:
-            return 0.0
-
-        penalty = 0.0
-
-        # For ascending rows (RED, YELLOW): penalize high numbers early
-        # Ideal first moves: 2, 3, 4, 5 (keep options open)
-        if color in [DieColor.RED, DieColor.YELLOW]:
-            if marked_count == 0:  # First move in row
-                if number >= 10:
-                    penalty = -50.0  # Extreme penalty - blocks 8+ numbers
-                elif number >= 8:
-                    penalty = -35.0  # Very severe - blocks 6-7 numbers
-                elif number >= 7:
-                    penalty = -20.0  # Severe - blocks 5 numbers
-                elif number >= 6:
-                    penalty = -10.0  # Moderate - blocks 4 numbers
-                elif number <= 4:
-                    penalty = 3.0  # Bonus for good starting positions
-            elif marked_count == 1:  # Second move in row
-                if number >= 11:
-                    penalty = -40.0  # Very bad - almost no room left
-                elif number >= 9:
-                    penalty = -25.0  # Bad positioning
-                elif number >= 8:
-                    penalty = -15.0  # Suboptimal
-            elif marked_count == 2:  # Third move in row
-                if number >= 11:
-                    penalty = -30.0  # Still very limiting
-                elif number >= 10:
-                    penalty = -15.0
-            elif marked_count == 3:  # Fourth move in row
-                if number == 12:
-                    penalty = -20.0  # Jumping to end too fast
-
-        # For descending rows (GREEN, BLUE): penalize low numbers early
-        # Ideal first moves: 12, 11, 10, 9 (keep options open)
-        else:
-            if marked_count == 0:  # First move in row
-                if number <= 4:
-                    penalty = -50.0  # Extreme penalty - blocks 8+ numbers
-                elif number <= 5:
-                    penalty = -35.0  # Very severe - blocks 6-7 numbers
-                elif number <= 6:
-                    penalty = -20.0  # Severe - blocks 5 numbers
-                elif number <= 7:
-                    penalty = -10.0  # Moderate - blocks 4 numbers
-                elif number >= 10:
-                    penalty = 3.0  # Bonus for good starting positions
-            elif marked_count == 1:  # Second move in row
-                if number <= 3:
-                    penalty = -40.0  # Very bad - almost no room left
-                elif number <= 5:
-                    penalty = -25.0  # Bad positioning
-                elif number <= 6:
-                    penalty = -15.0  # Suboptimal
-            elif marked_count == 2:  # Third move in row
-                if number <= 3:
-                    penalty = -30.0  # Still very limiting
-                elif number <= 4:
-                    penalty = -15.0
-            elif marked_count == 3:  # Fourth move in row
-                if number == 2:
-                    penalty = -20.0  # Jumping to end too fast
-
-        return penalty
-
-    def _is_bad_early_positioning(self, color: DieColor, number: int) -> bool:
-        """
-        Check if this would be bad early positioning.
-
-        Args:
-            color: The color row being evaluated
-            number: The number being evaluated
-
-        Returns:
-            True if this is bad early positioning
-        """
-        if color in [DieColor.RED, DieColor.YELLOW]:
-            # For ascending rows, numbers 9+ are bad for early positioning
-            return number >= 9
-        else:
-            # For descending rows, numbers 4 and below are bad for early positioning
-            return number <= 4
-
-    def _calculate_red_11_penalty(self, color: DieColor, number: int) -> float:
-        """
-        Calculate penalty for marking 11 in red row as the first move.
-
-        Args:
-            color: The color row being evaluated
-            number: The number being evaluated
+        other_marks = [
+            scoresheet.rows[other_color].mark_count
+            for other_color in ROW_COLORS
+            if other_color != color
+        ]
+        return row_synergy_bonus(
+            scoresheet.rows[color].mark_count, sum(other_marks) / len(other_marks)
+        )
 
-        Returns:
-            Penalty score (negative) if this is a bad Red 11 move, 0 otherwise
+    def should_make_move_in_stage(self, game, stage: int) -> bool:
         """
-        # This is now handled by the more comprehensive early game positioning penalty
-        # Keep this method for backward compatibility but make it less severe
-        if color != DieColor.RED or number != 11:
-            return 0.0
-
-        scoresheet = self.get_scoresheet()
-        red_row = scoresheet.rows[DieColor.RED]
-
-        # Apply moderate penalty if red row is empty (first move)
-        if len(red_row.marked) == 0:
-            return (
-                -5.0
-            )  # Reduced penalty since early game positioning handles this better
-
-        return 0.0
+        Decide whether to make a move in the given stage using strategic considerations.
 
-    def _calculate_advanced_positioning_bonus(
-        self, game, color: DieColor, number: int
-    ) -> float:
-        """
-        Calculate advanced positioning bonus considering future opportunities.
+        Key insight: In Qwixx, it's often better to skip a bad move and preserve flexibility
+        than to make a move that blocks future opportunities. Only the active player gets
+        a penalty for not making ANY move across both stages, so non-active players should
+        be very selective.
 
         Args:
             game: The current game instance
-            color: The color row being evaluated
-            number: The number being evaluated
+            stage: 1 for white dice sum stage, 2 for colored combination stage
 
         Returns:
-            Bonus score for good positioning strategy
+            True if AI should attempt to make a move, False to pass
         """
-        scoresheet = self.get_scoresheet()
-        row = scoresheet.rows[color]
-        marked_count = len(row.marked)
-
-        # Calculate how many numbers this move would "block" from future scoring
-        blocked_numbers = 0
+        # Evaluate available moves first
+        available_moves = self.get_available_moves(game)
+        if not available_moves:
+            return False
 
-        if color in [DieColor.RED, DieColor.YELLOW]:
-            # For ascending rows, marking a high number blocks all lower numbers
-            blocked_numbers = number - 2  # Numbers 2 through (number-1) are blocked
-        else:
-            # For descending rows, marking a low number blocks all higher numbers
-            blocked_numbers = 12 - number  # Numbers (number+1) through 12 are blocked
-
-        # Early in the row, heavily penalize moves that block many future opportunities
-        if marked_count <= 2:
-            if blocked_numbers >= 8:
-                return -25.0  # Severe penalty for blocking 8+ numbers early
-            elif blocked_numbers >= 6:
-                return -15.0  # Strong penalty for blocking 6-7 numbers early
-            elif blocked_numbers >= 4:
-                return -8.0  # Moderate penalty for blocking 4-5 numbers early
-            elif blocked_numbers <= 2:
-                return 5.0  # Bonus for keeping many options open
-
-        # Later in the row, blocking becomes less of an issue
-        elif marked_count <= 4:
-            if blocked_numbers >= 6:
-                return -10.0  # Reduced penalty later in development
-            elif blocked_numbers <= 2:
-                return 3.0  # Smaller bonus for good positioning
-
-        return 0.0
+        return self._decide_participation(
+            game, stage, self._score_moves(game, available_moves)
+        )
 
-    def should_make_move_in_stage(self, game, stage: int) -> bool:
+    def _decide_participation(
+        self, game, stage: int, scored_moves: List[ScoredMove]
+    ) -> bool:
         """
-        Decide whether to make a move in the given stage using strategic considerations.
-
-        Key insight: In Qwixx, it's often better to skip a bad move and preserve flexibility
-        than to make a move that blocks future opportunities. Only the active player gets
-        a penalty for not making ANY move across both stages, so non-active players should
-        be very selective.
+        Decide whether to participate in a stage given the scored moves.
 
         Args:
             game: The current game instance
             stage: 1 for white dice sum stage, 2 for colored combination stage
+            scored_moves: Available moves scored by _score_moves(), best first
 
         Returns:
             True if AI should attempt to make a move, False to pass
@@ -735,39 +1219,29 @@ class AIPlayer(Player):
         penalty_count = scoresheet.penalties
         is_active_player = self == game.get_current_player()
 
-        # Evaluate available moves first
-        available_moves = self.get_available_moves(game)
-        if not available_moves:
-            return False
-
         # Calculate best move score
-        best_score = -float("inf")
-        for color, number in available_moves:
-            if self.difficulty == "hard":
-                score = self._evaluate_move_advanced(game, color, number)
-            else:
-                score = self._evaluate_move(game, color, number)
-            best_score = max(best_score, score)
+        best_score = scored_moves[0][0]
 
         # CRITICAL: Skip threshold - if best move is very bad, skip it
         skip_threshold = self._get_skip_threshold(penalty_count, is_active_player, stage)
 
         if best_score < skip_threshold:
-            self.logger.debug(
-                f"{self.name} skipping - best score {best_score:.1f} below threshold {skip_threshold:.1f}"
-            )
-            log_game_event(
-                "AI_STAGE_DECISION",
-                f"{self.name} will skip in stage {stage} (bad move quality)",
-                ai_player=self.name,
-                stage=stage,
-                decision="skip",
-                probability=0.0,
-                best_move_score=best_score,
-                skip_threshold=skip_threshold,
-                penalty_count=penalty_count,
-                available_moves_count=len(available_moves),
-            )
+            if not self.simulation:
+                self.logger.debug(
+                    f"{self.name} skipping - best score {best_score:.1f} below threshold {skip_threshold:.1f}"
+                )
+                log_game_event(
+                    "AI_STAGE_DECISION",
+                    f"{self.name} will skip in stage {stage} (bad move quality)",
+                    ai_player=self.name,
+                    stage=stage,
+                    decision="skip",
+                    probability=0.0,
+                    best_move_score=best_score,
+                    skip_threshold=skip_threshold,
+                    penalty_count=penalty_count,
+                    available_moves_count=len(scored_moves),
+                )
             return False
 
         # Base probability based on difficulty and move quality
@@ -803,10 +1277,13 @@ class AIPlayer(Player):
             base_prob = min(base_prob, 0.7)  # Cap probability for non-active players
 
         # Add small random factor to avoid predictability
-        random_factor = random.uniform(-0.05, 0.05)
+        random_factor = self.rng.uniform(-0.05, 0.05)
         final_prob = max(0.05, min(0.95, base_prob + random_factor))
 
-        decision = random.random() < final_prob
+        decision = self.rng.random() < final_prob
+
+        if self.simulation:
+            return decision
 
         self.logger.debug(
             f"{self.name} stage {stage} decision: {'participate' if decision else 'skip'} "
@@ -822,7 +1299,7 @@ class AIPlayer(Player):
             probability=final_prob,
             best_move_score=best_score,
             penalty_count=penalty_count,
-            available_moves_count=len(available_moves),
+            available_moves_count=len(scored_moves),
         )
 
         return decision
@@ -874,9 +1351,9 @@ class AIPlayer(Player):
             List of (color, number) tuples representing valid moves
         """
         available_moves = []
-        dice_results = game.get_dice_results()
+        roll_options = game.get_roll_options()
 
-        if not dice_results:
+        if not roll_options:
             return available_moves
 
         game_state = game.get_state()
@@ -889,7 +1366,7 @@ class AIPlayer(Player):
 
             # Stage 1: White dice sum moves
             if game_state == GameState.STAGE_1_MOVES:
-                white_sum = dice_results["white1"] + dice_results["white2"]
+                white_sum = roll_options.white_sum
                 if (
                     self.get_scoresheet().can_mark_number(color, white_sum)
                     and self.can_use_white_sum()
@@ -901,9 +1378,8 @@ class AIPlayer(Player):
                 game_state == GameState.STAGE_2_MOVES
                 and self == game.get_current_player()
             ):
-                white_colored_sums = game.dice_roller.get_white_plus_colored_sums()
-                if color in white_colored_sums:
-                    for sum_value in white_colored_sums[color]:
+                if color in roll_options.colored_sums:
+                    for sum_value in roll_options.colored_sums[color]:
                         if (
                             self.get_scoresheet().can_mark_number(color, sum_value)
                             and self.can_use_colored_combination()
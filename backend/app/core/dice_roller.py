@@ -2,14 +2,45 @@
 DiceRoller class for managing all dice in the Qwixx game.
 """
 
-from typing import Dict, List, Tuple
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, Iterable, List, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
 from .die import Die, DieColor
+from .rng import SeedLike, make_generator
+
+# Column order used for batched rolls and pre-rolled dice
+DICE_ORDER: Tuple[str, ...] = ('white1', 'white2', 'red', 'yellow', 'green', 'blue')
+
+class RollOptions(NamedTuple):
+    """
+    Candidate sums for a single roll, computed once when the dice are rolled.
+    
+    Attributes:
+        white_sum: Sum of the two white dice
+        colored_sums: Distinct white + colored sums for each colored die
+    """
+    white_sum: int
+    colored_sums: Mapping[DieColor, Tuple[int, ...]]
+    
+    def is_colored_sum(self, color: DieColor, number: int) -> bool:
+        """Check whether number is a white + colored sum for the given color."""
+        sums = self.colored_sums.get(color)
+        return sums is not None and number in sums
 
 class DiceRoller:
     """Manages all six dice used in the Qwixx game."""
     
-    def __init__(self):
-        """Initialize the dice roller with all six dice."""
+    def __init__(self, seed: SeedLike = None):
+        """
+        Initialize the dice roller with all six dice.
+        
+        Args:
+            seed: Seed or NumPy generator for this roller's random stream
+                (None draws fresh OS entropy)
+        """
         self.dice: Dict[DieColor, Die] = {
             DieColor.WHITE: Die(DieColor.WHITE),
             DieColor.RED: Die(DieColor.RED),
@@ -25,26 +56,73 @@ class DiceRoller:
             Die(DieColor.GREEN),
             Die(DieColor.BLUE)
         ]
+        self.rng = make_generator(seed)
+        self.queued_rolls: Deque[List[int]] = deque()
     
     def roll_all(self) -> Dict[str, int]:
         """
-        Roll all six dice and return the results.
+        Roll all six dice (or use the next queued roll) and return the results.
         
         Returns:
             Dictionary with dice results: 
             {'white1': value, 'white2': value, 'red': value, 'yellow': value, 'green': value, 'blue': value}
         """
-        results = {}
+        if self.queued_rolls:
+            return self.set_values(self.queued_rolls.popleft())
+        
+        # Draw all six dice from this roller's stream in one call
+        return self.set_values(self.rng.integers(1, 7, size=6).tolist())
+    
+    def roll_batch(self, n: int) -> np.ndarray:
+        """
+        Roll all six dice n times in a single vectorized call.
         
-        # Roll white dice
-        results['white1'] = self.white_dice[0].roll()
-        results['white2'] = self.white_dice[1].roll()
+        Args:
+            n: Number of rolls
+            
+        Returns:
+            Integer array of shape (n, 6) with columns in DICE_ORDER
+        """
+        return self.rng.integers(1, 7, size=(n, 6), dtype=np.int8)
+    
+    def queue_rolls(self, rolls: Iterable[Sequence[int]]) -> None:
+        """
+        Queue pre-rolled dice to be used by the next calls to roll_all().
         
-        # Roll colored dice
-        for die in self.colored_dice:
-            results[die.color.value] = die.roll()
+        Once the queue is empty, roll_all() goes back to rolling the dice.
         
-        return results
+        Args:
+            rolls: Rows of six values in DICE_ORDER (e.g. from roll_batch())
+        """
+        if isinstance(rolls, np.ndarray):
+            rolls = rolls.tolist()
+        self.queued_rolls.extend(list(roll) for roll in rolls)
+    
+    def set_values(self, values: Sequence[int]) -> Dict[str, int]:
+        """
+        Set all six dice to the given values instead of rolling them.
+        
+        Args:
+            values: Six die values in DICE_ORDER
+            
+        Returns:
+            Dictionary with dice results, as returned by roll_all()
+        """
+        white1, white2, red, yellow, green, blue = values
+        self.white_dice[0].value = white1
+        self.white_dice[1].value = white2
+        self.colored_dice[0].value = red
+        self.colored_dice[1].value = yellow
+        self.colored_dice[2].value = green
+        self.colored_dice[3].value = blue
+        return {
+            'white1': white1,
+            'white2': white2,
+            'red': red,
+            'yellow': yellow,
+            'green': green,
+            'blue': blue
+        }
     
     def get_white_sum(self) -> int:
         """
@@ -71,6 +149,24 @@ class DiceRoller:
         
         return sums
     
+    def get_roll_options(self) -> RollOptions:
+        """
+        Get the white sum and the distinct white + colored sums of the current roll.
+        
+        Returns:
+            Immutable RollOptions for the current dice values
+        """
+        white1 = self.white_dice[0].get_value() or 0
+        white2 = self.white_dice[1].get_value() or 0
+        colored_sums = {}
+        for colored_die in self.colored_dice:
+            colored_value = colored_die.get_value() or 0
+            if white1 == white2:
+                colored_sums[colored_die.color] = (white1 + colored_value,)
+            else:
+                colored_sums[colored_die.color] = (white1 + colored_value, white2 + colored_value)
+        return RollOptions(white1 + white2, MappingProxyType(colored_sums))
+    
     def get_all_dice_values(self) -> Dict[str, int]:
         """
         Get current values of all dice.
@@ -6,6 +6,8 @@ import random
 from enum import Enum
 from typing import Optional
 
+import numpy as np
+
 class DieColor(Enum):
     """Enumeration for die colors."""
     WHITE = "white"
@@ -13,6 +15,10 @@ class DieColor(Enum):
     YELLOW = "yellow"
     GREEN = "green"
     BLUE = "blue"
+    
+    # Members are singletons, so identity hashing is safe and avoids the
+    # Python-level Enum.__hash__ on every dict and set lookup
+    __hash__ = object.__hash__
 
 class Die:
     """Represents a single die in the Qwixx game."""
@@ -27,14 +33,20 @@ class Die:
         self.color = color
         self.value: Optional[int] = None
     
-    def roll(self) -> int:
+    def roll(self, rng: Optional[np.random.Generator] = None) -> int:
         """
         Roll the die and return the result.
         
+        Args:
+            rng: Generator to roll with (defaults to the global random module)
+        
         Returns:
             The rolled value (1-6)
         """
-        self.value = random.randint(1, 6)
+        if rng is None:
+            self.value = random.randint(1, 6)
+        else:
+            self.value = int(rng.integers(1, 7))
         return self.value
     
     def get_value(self) -> Optional[int]:
@@ -0,0 +1,326 @@
+"""
+Endgame solver for the AI.
+
+Once a color is locked or a player has three penalties, one more lock or a
+fourth penalty ends the game. From then on the AI solves its own scoresheet
+to the end of the game instead of scoring moves with heuristics:
+
+* its own marks, locks and penalties are followed exactly, with the dice
+  distribution of the expectimax search;
+* the opponents enter through what their current sheets allow on each roll,
+  worked out exactly over the 6^6 dice: the chance that they end the game
+  and the points they are expected to score. The solver maximizes its final
+  score minus those points, so it hurries the end when waiting only feeds
+  the opponents.
+
+Every own roll adds a mark or a penalty, so the game tree is finite and is
+searched to its end. Solved positions are kept in a transposition table keyed
+by the position and the rounded opponent model, so later decisions, in this
+game or another one, reuse them. The solver only takes over when the
+reachable positions are few enough (ENDGAME_MAX_STATES) to solve quickly, and
+a solve that still needs more than ENDGAME_MAX_NODES new positions gives up
+(keeping what it solved) so the decision falls back to the regular play.
+Both limits count positions rather than seconds, so decisions do not depend
+on timing.
+"""
+
+import os
+import time
+from functools import lru_cache
+from typing import Callable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .expectimax import (
+    CLOSED,
+    LOCKS,
+    LOCKS_TO_END,
+    MAX_PENALTIES,
+    NUM_ROWS,
+    PENALTIES,
+    ROW_POSITIONS,
+    ExpectimaxSearch,
+    RootOption,
+    SearchResult,
+    SearchState,
+    SearchTimeout,
+    is_terminal,
+    mark,
+    score,
+)
+from .row_table import ROW_LENGTH
+from .transposition import MAX_PLAYERS, TranspositionTable, zobrist_key
+
+# Most reachable positions the solver takes on, and most new positions a solve
+# may evaluate before giving up (override with environment variables); a
+# position takes about 0.6 ms, so the defaults bound a solve to about 10 ms
+ENDGAME_MAX_STATES = int(os.environ.get("QWIXX_ENDGAME_MAX_STATES", "48"))
+ENDGAME_MAX_NODES = int(os.environ.get("QWIXX_ENDGAME_MAX_NODES", "16"))
+
+PENALTIES_TO_WATCH = MAX_PENALTIES - 1
+
+# Number that locks each row (ROW_COLORS order)
+LOCK_NUMBERS = (12, 12, 2, 2)
+
+# Most open positions an opponent is assumed to skip for a mark
+MAX_SKIPPED = 1
+
+# Least chance of the game ending on a roll: sheets that cannot end it yet
+# will be able to later (same rate as the row value table)
+MIN_HAZARD = 1 / 24
+
+# The opponent model is rounded to these steps so positions are shared
+HAZARD_STEP = 0.005
+HAZARD_LEVELS = int(round(1 / HAZARD_STEP)) + 1
+GAIN_STEP = 0.05
+GAIN_LEVELS = 1024
+
+# SearchResult.depth of a search solved to the end of the game
+SOLVED_DEPTH = -1
+
+# Every roll of the six dice, in DICE_ORDER
+ALL_DICE = np.stack(
+    np.meshgrid(*[np.arange(1, 7)] * 6, indexing="ij"), axis=-1
+).reshape(-1, 6)
+WHITE_SUMS = ALL_DICE[:, 0] + ALL_DICE[:, 1]
+
+_generator = np.random.default_rng(0xE4D6A3E)
+HAZARD_KEYS = _generator.integers(0, 2**64, size=(MAX_PLAYERS, HAZARD_LEVELS), dtype=np.uint64)
+GAIN_KEYS = _generator.integers(0, 2**64, size=(MAX_PLAYERS, GAIN_LEVELS), dtype=np.uint64)
+del _generator
+
+
+class OpponentModel(NamedTuple):
+    """
+    What the opponents do on each roll of a turn, starting with the player's own.
+
+    Attributes:
+        hazards: Chance that they end the game on the roll
+        gains: Points they are expected to score on the roll
+    """
+
+    hazards: Tuple[float, ...]
+    gains: Tuple[float, ...]
+
+
+def is_endgame(states: Sequence[SearchState]) -> bool:
+    """
+    Check whether the game is in its endgame.
+
+    Args:
+        states: Search state of every player
+
+    Returns:
+        True once a color is closed or a player has three penalties
+    """
+    return any(state[CLOSED] or state[PENALTIES] >= PENALTIES_TO_WATCH for state in states)
+
+
+def reachable_positions(state: SearchState) -> int:
+    """
+    Upper bound on the positions a player's sheet can still reach.
+
+    Args:
+        state: The player's search state
+
+    Returns:
+        The number of (row masks, penalties) combinations still reachable
+    """
+    count = MAX_PENALTIES - state[PENALTIES]
+    for row in range(NUM_ROWS):
+        if not state[CLOSED] >> row & 1:
+            count *= 1 << (ROW_LENGTH - state[row].bit_length())
+    return count
+
+
+def _mark_gains(state: SearchState, row: int) -> np.ndarray:
+    """
+    Points marking each number 0-12 adds to a row of a state.
+
+    Returns:
+        Array of gains; NaN if the mark is illegal, 0 if it skips more than
+        MAX_SKIPPED open positions (not worth taking)
+    """
+    gains = np.full(13, np.nan)
+    mask = state[row]
+    marks = mask.bit_count()
+    for number in range(13):
+        marked = mark(state, row, number)
+        if marked is None:
+            continue
+        if ROW_POSITIONS[row][number] - mask.bit_length() > MAX_SKIPPED:
+            gains[number] = 0.0
+        elif marked[LOCKS] >> row & 1:
+            # Locking the row also scores the lock symbol
+            gains[number] = 2 * marks + 3
+        else:
+            gains[number] = marks + 1
+    return gains
+
+
+@lru_cache(maxsize=4096)
+def opponent_model(states: Tuple[SearchState, ...], own_index: int) -> OpponentModel:
+    """
+    Work out what the opponents' current sheets allow them on each roll.
+
+    Opponents are assumed to lock a row and to avoid their fourth penalty
+    whenever they can, and otherwise to take their best mark that skips at
+    most MAX_SKIPPED positions.
+
+    Args:
+        states: Search state of every player, in seat order
+        own_index: Seat of the player solving the endgame
+
+    Returns:
+        The model, with every chance at least MIN_HAZARD
+    """
+    closed = 0
+    for state in states:
+        closed |= state[CLOSED]
+    locks_needed = LOCKS_TO_END - bin(closed).count("1")
+
+    hazards = []
+    gains = []
+    num_players = len(states)
+    for turn in range(num_players):
+        roller = (own_index + turn) % num_players
+        locked_rows = np.zeros((len(ALL_DICE), NUM_ROWS), dtype=bool)
+        ends = np.zeros(len(ALL_DICE), dtype=bool)
+        gain = 0.0
+        for index, state in enumerate(states):
+            if index == own_index:
+                continue
+            rolling = index == roller
+            best = np.full(len(ALL_DICE), np.nan)
+            for row in range(NUM_ROWS):
+                row_gains = _mark_gains(state, row)
+                sums = [WHITE_SUMS]
+                if rolling:
+                    sums.append(ALL_DICE[:, 0] + ALL_DICE[:, 2 + row])
+                    sums.append(ALL_DICE[:, 1] + ALL_DICE[:, 2 + row])
+                lock_number = LOCK_NUMBERS[row]
+                locked = mark(state, row, lock_number)
+                can_lock = locked is not None and locked[LOCKS] >> row & 1
+                for numbers in sums:
+                    best = np.fmax(best, row_gains[numbers])
+                    if can_lock:
+                        locked_rows[:, row] |= numbers == lock_number
+            if rolling and state[PENALTIES] >= PENALTIES_TO_WATCH:
+                # No mark at all on their own roll is their fourth penalty
+                ends |= np.isnan(best)
+            gain += float(np.nan_to_num(best).mean())
+        ends |= locked_rows.sum(axis=1) >= locks_needed
+        hazards.append(max(MIN_HAZARD, float(ends.mean())))
+        gains.append(gain)
+    return OpponentModel(tuple(hazards), tuple(gains))
+
+
+def profile_key(model: OpponentModel) -> Tuple[OpponentModel, int]:
+    """
+    Round an opponent model and key the result.
+
+    Args:
+        model: The opponent model
+
+    Returns:
+        Tuple of (rounded model, 64-bit key)
+    """
+    hazard_levels = [min(HAZARD_LEVELS - 1, int(round(h / HAZARD_STEP))) for h in model.hazards]
+    gain_levels = [min(GAIN_LEVELS - 1, int(round(g / GAIN_STEP))) for g in model.gains]
+    key = 0
+    for turn, (hazard, gain) in enumerate(zip(hazard_levels, gain_levels)):
+        key ^= int(HAZARD_KEYS[turn, hazard]) ^ int(GAIN_KEYS[turn, gain])
+    rounded = OpponentModel(
+        tuple(level * HAZARD_STEP for level in hazard_levels),
+        tuple(level * GAIN_STEP for level in gain_levels),
+    )
+    return rounded, key
+
+
+class EndgameSolver(ExpectimaxSearch):
+    """Expectimax over one player's scoresheet to the end of the game."""
+
+    def __init__(
+        self,
+        model: OpponentModel,
+        turn_offset: int,
+        clock: Callable[[], float] = time.perf_counter,
+        table: Optional[TranspositionTable] = None,
+    ):
+        """
+        Initialize a solver.
+
+        Args:
+            model: What the opponents do on each roll (see opponent_model())
+            turn_offset: Rolls until the player's next turn, counted from the
+                current roll (0 if it is theirs)
+            clock: Time source for the deadline
+            table: Transposition table to reuse across solves (a new one if
+                None); positions are keyed with the rounded model, so one
+                table serves every model
+        """
+        self.model, self.profile = profile_key(model)
+        super().__init__(len(model.hazards), turn_offset, clock=clock, table=table)
+        self.max_nodes = float("inf")
+
+    def value(self, state: SearchState, rolls_left: int, roll_index: int) -> float:
+        """
+        Expected final score, less the opponents' expected points, of a state
+        once the previous roll is played.
+
+        Args:
+            state: The search state
+            rolls_left: Ignored, the search always runs to the end of the game
+            roll_index: Index of the next roll, counted from the root roll
+
+        Returns:
+            The expected value
+        """
+        if is_terminal(state):
+            return float(score(state))
+
+        turn = (roll_index + self.turn_offset) % self.num_players
+        key = zobrist_key(state, turn, self.num_players) ^ self.profile
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        if self.nodes >= self.max_nodes or self.clock() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+
+        # The previous roll may have ended the game through an opponent
+        hazard = self.model.hazards[(turn - 1) % self.num_players]
+        if turn == 0:
+            after = self._own_roll_value(state, rolls_left, roll_index)
+        else:
+            after = self._other_roll_value(state, rolls_left, roll_index)
+        result = hazard * score(state) + (1 - hazard) * (after - self.model.gains[turn])
+        self.table.put(key, result)
+        return result
+
+    def solve(
+        self,
+        options: Sequence[RootOption],
+        time_budget: Optional[float] = None,
+        max_nodes: Optional[int] = None,
+    ) -> Optional[SearchResult]:
+        """
+        Value the root options to the end of the game.
+
+        Args:
+            options: The choices available now
+            time_budget: Seconds allowed (None for no limit)
+            max_nodes: Most new positions to evaluate (None for no limit)
+
+        Returns:
+            The result with depth SOLVED_DEPTH, or None if the solve ran out
+            of time or positions (the positions solved so far stay in the table)
+        """
+        self.deadline = float("inf") if time_budget is None else self.clock() + time_budget
+        self.max_nodes = float("inf") if max_nodes is None else max_nodes
+        try:
+            values = [self.option_value(option, 0) for option in options]
+        except SearchTimeout:
+            return None
+        return SearchResult(values, SOLVED_DEPTH, self.nodes)
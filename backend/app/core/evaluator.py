@@ -0,0 +1,513 @@
+"""
+Linear move evaluator for the AI players.
+
+Every candidate move is described by a row of features and scored with one
+matrix-vector product against the weight vector of the AI's difficulty. The
+per-move features only depend on (color, number, marks in the row), so they
+are tabulated once at import time; the whole-board features are filled in
+once per decision from BoardFeatures.
+
+Where a mark sits in its row is valued by the solved single-row table (see
+row_values): the row_value feature is the change in the row's expected
+final points that the mark makes, read from BoardFeatures.row_value_deltas.
+"""
+
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from .die import DieColor
+
+# The four scoring rows (there is no white row)
+ROW_COLORS = (DieColor.RED, DieColor.YELLOW, DieColor.GREEN, DieColor.BLUE)
+COLOR_INDEX = {color: index for index, color in enumerate(ROW_COLORS)}
+ASCENDING_COLORS = (DieColor.RED, DieColor.YELLOW)
+
+# Rightmost number of each row (the one that locks it), by color index
+LAST_NUMBERS = np.array([12, 12, 2, 2])
+
+MAX_MARKS = 11
+
+# Position of each number (index 0-12) in a row, by row index; -1 if absent
+ROW_POSITIONS = tuple(
+    tuple(
+        (number - 2 if color in ASCENDING_COLORS else 12 - number)
+        if 2 <= number <= 12
+        else -1
+        for number in range(13)
+    )
+    for color in ROW_COLORS
+)
+
+# Chance of rolling each sum with two dice
+SUM_PROBABILITIES = {
+    2: 0.028,  # 1/36 (only 1+1)
+    3: 0.056,  # 2/36 (1+2, 2+1)
+    4: 0.083,  # 3/36 (1+3, 2+2, 3+1)
+    5: 0.111,  # 4/36
+    6: 0.139,  # 5/36
+    7: 0.167,  # 6/36 (most common)
+    8: 0.139,  # 5/36
+    9: 0.111,  # 4/36
+    10: 0.083,  # 3/36
+    11: 0.056,  # 2/36
+    12: 0.028,  # 1/36 (only 6+6)
+}
+
+# Feature columns
+FEATURE_NAMES = (
+    "marks",  # Marks already in the row
+    "row_value",  # Change in the row's solved value made by the mark
+    "end_number",  # Bonus for numbers at the end of the row
+    "enables_lock",  # Marks the rightmost number with enough marks to lock
+    "penalty_risk",  # Urgency from the player's penalty count
+    "falling_behind",  # Opponents are well ahead in this color
+    "opponent_lock_threat",  # Opponents close to locking a row we can lock
+    "opponent_strong_row",  # Opponents close to locking this row
+    "opponent_contest",  # Opponents developing this row
+    "rarity",  # How unlikely the sum is to come up again
+    "game_phase",  # Row development bonus for the phase of the game
+    "lock_points",  # Points gained by locking the row
+    "lock_denial",  # Opponent marks made worthless by locking the row
+    "synergy",  # Balanced development across rows
+    "endgame_potential",  # Row value once the end of the game approaches
+)
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+NUM_FEATURES = len(FEATURE_NAMES)
+
+MARKS = FEATURE_INDEX["marks"]
+ROW_VALUE = FEATURE_INDEX["row_value"]
+END_NUMBER = FEATURE_INDEX["end_number"]
+ENABLES_LOCK = FEATURE_INDEX["enables_lock"]
+PENALTY_RISK = FEATURE_INDEX["penalty_risk"]
+FALLING_BEHIND = FEATURE_INDEX["falling_behind"]
+OPPONENT_LOCK_THREAT = FEATURE_INDEX["opponent_lock_threat"]
+OPPONENT_STRONG_ROW = FEATURE_INDEX["opponent_strong_row"]
+OPPONENT_CONTEST = FEATURE_INDEX["opponent_contest"]
+RARITY = FEATURE_INDEX["rarity"]
+GAME_PHASE = FEATURE_INDEX["game_phase"]
+LOCK_POINTS = FEATURE_INDEX["lock_points"]
+LOCK_DENIAL = FEATURE_INDEX["lock_denial"]
+SYNERGY = FEATURE_INDEX["synergy"]
+ENDGAME_POTENTIAL = FEATURE_INDEX["endgame_potential"]
+
+# Board-dependent columns only the advanced evaluation uses
+STRATEGIC_BOARD_FEATURES = (
+    OPPONENT_LOCK_THREAT,
+    OPPONENT_STRONG_ROW,
+    OPPONENT_CONTEST,
+    GAME_PHASE,
+    LOCK_DENIAL,
+    SYNERGY,
+    ENDGAME_POTENTIAL,
+)
+
+
+def _weights(**weights: float) -> np.ndarray:
+    """Build a weight vector from per-feature weights (missing ones are 0)."""
+    vector = np.zeros(NUM_FEATURES)
+    for name, weight in weights.items():
+        vector[FEATURE_INDEX[name]] = weight
+    return vector
+
+
+# Basic evaluation (easy and medium)
+BASIC_WEIGHTS = _weights(
+    marks=2.0,  # More marks = higher score potential
+    row_value=3.0,  # Solved row value points gained (or lost) by the mark
+    end_number=1.0,
+    enables_lock=8.0,
+    penalty_risk=1.0,
+    falling_behind=-2.0,  # Slight penalty for falling behind
+)
+
+# Advanced evaluation (hard): the basic chain plus the strategic terms
+ADVANCED_WEIGHTS = BASIC_WEIGHTS + _weights(
+    opponent_lock_threat=6.0,  # Block their lock attempt
+    opponent_strong_row=3.0,  # Compete in their strong row
+    opponent_contest=1.5,  # Moderate competition bonus
+    rarity=10.0,  # Lower probability = higher bonus
+    game_phase=1.0,
+    lock_points=2.0,
+    lock_denial=1.5,  # Higher denial value for more advanced opponent rows
+    synergy=1.0,
+    endgame_potential=0.7,
+)
+
+WEIGHTS: Dict[str, np.ndarray] = {
+    "easy": BASIC_WEIGHTS,
+    "medium": BASIC_WEIGHTS,
+    "hard": ADVANCED_WEIGHTS,
+}
+
+
+class BoardFeatures(NamedTuple):
+    """
+    Whole-board aggregates shared by every candidate move of one decision.
+
+    Attributes:
+        row_marks: Marks in each of this player's rows
+        total_marks: Marks across all of this player's rows
+        avg_other_marks: For each row, the average marks in this player's other rows
+        locked_colors: Number of colors locked in the game
+        penalty_avoidance_bonus: Bonus from this player's penalty count
+        opponent_marks: For each row, every opponent's marks in it (seat order)
+        opponent_total_marks: For each row, the opponents' marks summed
+        row_value_deltas: For each row, the change in its solved value made
+            by marking each position (ROW_POSITIONS order, 0 if illegal)
+    """
+
+    row_marks: Dict[DieColor, int]
+    total_marks: int
+    avg_other_marks: Dict[DieColor, float]
+    locked_colors: int
+    penalty_avoidance_bonus: float
+    opponent_marks: Dict[DieColor, Tuple[int, ...]]
+    opponent_total_marks: Dict[DieColor, int]
+    row_value_deltas: Dict[DieColor, Sequence[float]]
+
+
+def potential_row_score(mark_count: int) -> int:
+    """Calculate potential score for a row with given number of marks."""
+    if mark_count <= 0:
+        return 0
+    elif mark_count == 1:
+        return 1
+    elif mark_count == 2:
+        return 3
+    elif mark_count == 3:
+        return 6
+    elif mark_count == 4:
+        return 10
+    elif mark_count == 5:
+        return 15
+    return 21 + (mark_count - 6) * 7  # Locked row bonus
+
+
+def end_number_bonus(color: DieColor, number: int) -> float:
+    """
+    Calculate bonus for the last number in each row (enables row locking).
+
+    Args:
+        color: The color row
+        number: The number being evaluated
+
+    Returns:
+        Bonus score for the last number in the row
+    """
+    if color in ASCENDING_COLORS:
+        # For ascending rows (2-12), only 12 is the last number
+        if number == 12:
+            return 4.0
+        elif number >= 10:
+            return 2.0  # Close to end bonus
+    else:
+        # For descending rows (12-2), only 2 is the last number
+        if number == 2:
+            return 4.0
+        elif number <= 4:
+            return 2.0  # Close to end bonus
+    return 0.0
+
+
+def penalty_avoidance_bonus(penalty_count: int) -> float:
+    """
+    Calculate bonus for penalty avoidance based on current penalty count.
+
+    Args:
+        penalty_count: The player's penalties
+
+    Returns:
+        Bonus score for penalty avoidance
+    """
+    # Higher bonus as penalty count increases
+    if penalty_count >= 3:
+        return 3.0  # Very high risk, prioritize any move
+    elif penalty_count >= 2:
+        return 2.0  # High risk
+    elif penalty_count >= 1:
+        return 1.0  # Moderate risk
+    return 0.0
+
+
+def rarity(number: int) -> float:
+    """
+    Get how unlikely a sum is to be rolled again (higher is rarer).
+
+    Args:
+        number: The number being evaluated
+
+    Returns:
+        0.2 minus the sum's probability
+    """
+    return 0.2 - SUM_PROBABILITIES.get(number, 0.1)
+
+
+def game_phase_bonus(total_marks: int, locked_colors: int, row_marks: int) -> float:
+    """
+    Calculate bonus based on current game phase strategy.
+
+    Args:
+        total_marks: Marks across all of the player's rows
+        locked_colors: Number of locked colors
+        row_marks: Marks in the row being evaluated
+
+    Returns:
+        Bonus score based on game phase
+    """
+    # Early game (0-8 total marks): Spread strategy
+    if total_marks <= 8:
+        if row_marks == 0:
+            return 2.0  # Bonus for starting new rows
+        elif row_marks <= 2:
+            return 1.0  # Moderate bonus for early development
+
+    # Mid game (9-16 total marks): Balanced strategy
+    elif total_marks <= 16:
+        if row_marks >= 2:
+            return 2.0  # Focus on developing existing rows
+        elif row_marks >= 4:
+            return 3.0  # High bonus for rows close to completion
+
+    # Late game (17+ total marks or any locked colors): Focus strategy
+    else:
+        if row_marks >= 3:
+            return 4.0  # Very high bonus for advanced rows
+        elif locked_colors >= 1:
+            return 5.0  # Emergency focus in endgame
+
+    return 0.0
+
+
+def row_synergy_bonus(current_marks: int, avg_other_marks: float) -> float:
+    """
+    Calculate bonus for row synergy and balanced development.
+
+    Args:
+        current_marks: Marks in the row being evaluated
+        avg_other_marks: Average marks in the other rows
+
+    Returns:
+        Synergy bonus score
+    """
+    # Bonus for balanced development
+    if abs(current_marks - avg_other_marks) <= 1:
+        return 1.5  # Good balance
+    elif current_marks < avg_other_marks - 2:
+        return 2.0  # Catch up bonus
+    elif current_marks > avg_other_marks + 3:
+        return -1.0  # Penalty for over-development
+
+    return 0.0
+
+
+def _build_move_table() -> np.ndarray:
+    """
+    Tabulate the features that only depend on the move and its row.
+
+    Returns:
+        Array of shape (colors, 13, MAX_MARKS + 1, NUM_FEATURES) indexed by
+        (color index, number, marks in the row)
+    """
+    table = np.zeros((len(ROW_COLORS), 13, MAX_MARKS + 1, NUM_FEATURES))
+    for color_index, color in enumerate(ROW_COLORS):
+        last_number = LAST_NUMBERS[color_index]
+        for number in range(2, 13):
+            for marks in range(MAX_MARKS + 1):
+                row = table[color_index, number, marks]
+                row[MARKS] = marks
+                row[END_NUMBER] = end_number_bonus(color, number)
+                row[RARITY] = rarity(number)
+
+                # Need at least 4 marks already to lock with the rightmost number
+                if marks >= 4 and number == last_number:
+                    row[ENABLES_LOCK] = 1.0
+                    row[LOCK_POINTS] = potential_row_score(marks + 1) - (
+                        marks * (marks + 1) // 2
+                    )
+    return table
+
+
+# Move-only features by (color index, number, marks in the row)
+MOVE_FEATURES = _build_move_table()
+
+
+def board_tables(
+    features: BoardFeatures, strategic: bool = True
+) -> Tuple[List[int], List[List[float]], List[List[float]]]:
+    """
+    Compute the whole-board feature rows of one decision.
+
+    Args:
+        features: Board features of the decision
+        strategic: Also fill in the strategic (advanced-only) columns
+
+    Returns:
+        Tuple of (row_marks, per_color, rightmost) where row_marks holds the
+        marks per color index, per_color the features added to every move in
+        a color, and rightmost the adjustment for the row's rightmost number
+    """
+    row_marks = []
+    per_color = []
+    rightmost = []
+
+    for color in ROW_COLORS:
+        marks = features.row_marks[color]
+
+        row = [0.0] * NUM_FEATURES
+        row[PENALTY_RISK] = features.penalty_avoidance_bonus
+        row[FALLING_BEHIND] = features.opponent_total_marks[color] > marks + 2
+        last = [0.0] * NUM_FEATURES
+
+        row_marks.append(marks)
+        per_color.append(row)
+        rightmost.append(last)
+        if not strategic:
+            continue
+
+        opponent_marks = features.opponent_marks[color]
+        strong_rows = sum(1 for m in opponent_marks if m >= 4)
+        row[OPPONENT_STRONG_ROW] = strong_rows
+        row[OPPONENT_CONTEST] = sum(1 for m in opponent_marks if 2 <= m < 4)
+        row[GAME_PHASE] = game_phase_bonus(
+            features.total_marks, features.locked_colors, marks
+        )
+        row[SYNERGY] = row_synergy_bonus(marks, features.avg_other_marks[color])
+        if features.locked_colors >= 1:  # End game approaching
+            row[ENDGAME_POTENTIAL] = potential_row_score(marks + 1)
+
+        # Marking the rightmost number blocks opponents' locks instead
+        last[OPPONENT_STRONG_ROW] = -strong_rows
+        last[OPPONENT_LOCK_THREAT] = strong_rows
+        if marks >= 4:
+            last[LOCK_DENIAL] = sum(m for m in opponent_marks if m >= 2)
+
+    return row_marks, per_color, rightmost
+
+
+def feature_matrix(
+    moves: Sequence[Tuple[DieColor, int]], features: BoardFeatures
+) -> np.ndarray:
+    """
+    Build the feature matrix of a decision's candidate moves.
+
+    Args:
+        moves: Candidate (color, number) moves
+        features: Board features of the decision
+
+    Returns:
+        Array of shape (len(moves), NUM_FEATURES)
+    """
+    row_marks, per_color, rightmost = (np.array(t) for t in board_tables(features))
+    colors = np.array([COLOR_INDEX[color] for color, _ in moves], dtype=np.intp)
+    numbers = np.array([number for _, number in moves], dtype=np.intp)
+
+    matrix = MOVE_FEATURES[colors, numbers, row_marks[colors]] + per_color[colors]
+    is_rightmost = numbers == LAST_NUMBERS[colors]
+    matrix[is_rightmost] += rightmost[colors[is_rightmost]]
+    matrix[:, ROW_VALUE] = [
+        features.row_value_deltas[color][ROW_POSITIONS[COLOR_INDEX[color]][number]]
+        for color, number in moves
+    ]
+    return matrix
+
+
+def score_matrix(matrix: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Score every row of a feature matrix.
+
+    Scores are rounded to 9 decimals so that moves worth the same keep
+    comparing equal whatever the summation order.
+
+    Args:
+        matrix: Feature matrix from feature_matrix()
+        weights: Weight vector (e.g. from WEIGHTS)
+
+    Returns:
+        Array of scores, one per row
+    """
+    return np.round(matrix @ weights, 9)
+
+
+def score_batch(matrices: Sequence[np.ndarray], weights: np.ndarray) -> List[np.ndarray]:
+    """
+    Score the candidate moves of many decisions in one product.
+
+    Args:
+        matrices: Feature matrices of the decisions
+        weights: Weight vector shared by the decisions
+
+    Returns:
+        List of score arrays, one per matrix
+    """
+    if not matrices:
+        return []
+    scores = score_matrix(np.concatenate(matrices), weights)
+    return np.split(scores, np.cumsum([len(m) for m in matrices])[:-1])
+
+
+class LinearEvaluator:
+    """
+    Scores one decision's moves with a fixed weight vector.
+
+    The model is linear, so the move-only part of every score is projected
+    onto the weights once (a product over the whole move table) and a
+    decision only adds its four per-color board terms and each move's row
+    value delta. Scores equal
+    score_matrix(feature_matrix(moves, features), weights).
+    """
+
+    def __init__(self, weights: np.ndarray):
+        """
+        Initialize the evaluator.
+
+        Args:
+            weights: Weight vector (e.g. from WEIGHTS)
+        """
+        self.weights = weights
+        self._active_weights = [
+            (index, weight) for index, weight in enumerate(weights.tolist()) if weight
+        ]
+        self._move_scores = (MOVE_FEATURES @ weights).tolist()
+        self._row_value_weight = float(weights[ROW_VALUE])
+        self._strategic = bool(weights[list(STRATEGIC_BOARD_FEATURES)].any())
+
+    def _dot(self, row: List[float]) -> float:
+        """Weighted sum of a feature row."""
+        return sum(row[index] * weight for index, weight in self._active_weights)
+
+    def score_moves(
+        self, moves: Sequence[Tuple[DieColor, int]], features: BoardFeatures
+    ) -> List[float]:
+        """
+        Score candidate moves.
+
+        Args:
+            moves: Candidate (color, number) moves
+            features: Board features of the decision
+
+        Returns:
+            List of scores, one per move
+        """
+        row_marks, per_color, rightmost = board_tables(features, self._strategic)
+        color_scores = [self._dot(row) for row in per_color]
+
+        scores = []
+        for color, number in moves:
+            index = COLOR_INDEX[color]
+            score = self._move_scores[index][number][row_marks[index]]
+            score += color_scores[index]
+            score += (
+                self._row_value_weight
+                * features.row_value_deltas[color][ROW_POSITIONS[index][number]]
+            )
+            if number == LAST_NUMBERS[index]:
+                score += self._dot(rightmost[index])
+            scores.append(round(score, 9))
+        return scores
+
+
+# Evaluator of each difficulty
+EVALUATORS: Dict[str, LinearEvaluator] = {
+    difficulty: LinearEvaluator(weights) for difficulty, weights in WEIGHTS.items()
+}
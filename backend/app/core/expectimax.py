@@ -0,0 +1,397 @@
+"""
+Expectimax search for the expert AI.
+
+The search follows the expert's own scoresheet over the next rolls. Chance
+nodes use the exact distribution of the six dice:
+
+* on other players' rolls only the white sum matters, so the 36 white
+  outcomes collapse to the 11 sums;
+* on the expert's own rolls the 6^6 outcomes collapse to the 21 unordered
+  white pairs, and given the white pair the four colored dice are
+  independent, so the best response over all 6^4 colored outcomes is taken
+  in one vectorized pass.
+
+Leaf positions are valued with the solved single-row table (see
+row_values) when it is available. Positions reached through different move
+orders are looked up in a transposition table, which can be shared between
+searches. Opponents are not modelled beyond the
+turn order. Searches deepen one roll at a time until the depth limit or the
+time budget is reached.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .die import DieColor
+from .evaluator import ROW_COLORS, ROW_POSITIONS
+from .row_table import LAST_POSITION, NEXT_STATE, NUM_ROW_STATES, ROW_LENGTH
+from .scoresheet import PENALTY_POINTS
+from .transposition import TranspositionTable, zobrist_key
+
+# Rolls to look ahead and seconds per decision (override with environment variables)
+DEFAULT_SEARCH_DEPTH = int(os.environ.get("QWIXX_EXPERT_DEPTH", "2"))
+DEFAULT_TIME_BUDGET = float(os.environ.get("QWIXX_EXPERT_TIME_BUDGET", "0.25"))
+
+MAX_PENALTIES = 4
+LOCKS_TO_END = 2
+NUM_ROWS = len(ROW_COLORS)
+ALL_ROWS = (1 << NUM_ROWS) - 1
+
+# Share of a row's open positions assumed to be marked before the game ends
+FLEXIBILITY = 0.45
+
+# Unordered white pairs as (low, high, probability)
+WHITE_PAIRS: Tuple[Tuple[int, int, float], ...] = tuple(
+    (low, high, (1 if low == high else 2) / 36)
+    for low in range(1, 7)
+    for high in range(low, 7)
+)
+
+# Probability of each white sum
+WHITE_SUM_PROBABILITIES: Dict[int, float] = {
+    total: (6 - abs(total - 7)) / 36 for total in range(2, 13)
+}
+
+# (mask of row 0, ..., mask of row 3, own locks, closed rows, penalties)
+SearchState = Tuple[int, int, int, int, int, int, int]
+
+LOCKS = NUM_ROWS
+CLOSED = NUM_ROWS + 1
+PENALTIES = NUM_ROWS + 2
+
+
+class SearchTimeout(Exception):
+    """Raised when a search runs past its deadline."""
+
+
+def _triangular(marks: float) -> float:
+    """Points for a row with the given number of marks (lock included)."""
+    return marks * (marks + 1) / 2
+
+
+def heuristic_row_values() -> List[float]:
+    """
+    Value of every open row state: its points if a share of the open
+    positions were still marked.
+
+    Returns:
+        List of values indexed by row mask
+    """
+    values = []
+    for mask in range(NUM_ROW_STATES):
+        open_positions = LAST_POSITION - (mask.bit_length() - 1)
+        values.append(_triangular(mask.bit_count() + FLEXIBILITY * open_positions))
+    return values
+
+
+ROW_VALUES = heuristic_row_values()
+
+
+def state_from_scoresheet(scoresheet, locked_colors) -> SearchState:
+    """
+    Build a search state from a scoresheet.
+
+    Args:
+        scoresheet: The searching player's scoresheet
+        locked_colors: Colors locked in the game (by anyone)
+
+    Returns:
+        The search state
+    """
+    masks = []
+    locks = 0
+    closed = 0
+    for index, color in enumerate(ROW_COLORS):
+        row = scoresheet.rows[color]
+        masks.append(row.mask)
+        if row.is_locked:
+            locks |= 1 << index
+        if row.is_locked or color in locked_colors:
+            closed |= 1 << index
+    return (*masks, locks, closed, scoresheet.penalties)
+
+
+def mark(state: SearchState, row: int, number: int) -> Optional[SearchState]:
+    """
+    Mark a number in a row of a search state.
+
+    Args:
+        state: The search state
+        row: Row index (ROW_COLORS order)
+        number: The number to mark
+
+    Returns:
+        The new state, or None if the mark is illegal
+    """
+    if state[CLOSED] >> row & 1:
+        return None
+    position = ROW_POSITIONS[row][number]
+    if position < 0:
+        return None
+    next_mask = NEXT_STATE[state[row] * ROW_LENGTH + position]
+    if next_mask < 0:
+        return None
+
+    new_state = list(state)
+    new_state[row] = next_mask
+    if position == LAST_POSITION:
+        # Marking the rightmost number locks the row
+        new_state[LOCKS] |= 1 << row
+        new_state[CLOSED] |= 1 << row
+    return tuple(new_state)
+
+
+def add_penalty(state: SearchState) -> SearchState:
+    """Return the state with one more penalty."""
+    return state[:PENALTIES] + (state[PENALTIES] + 1,)
+
+
+def is_terminal(state: SearchState) -> bool:
+    """Check whether the state ends the game."""
+    return (
+        state[PENALTIES] >= MAX_PENALTIES
+        or bin(state[CLOSED]).count("1") >= LOCKS_TO_END
+    )
+
+
+def score(state: SearchState) -> int:
+    """Final score of a search state."""
+    total = 0
+    for row in range(NUM_ROWS):
+        marks = state[row].bit_count() + (state[LOCKS] >> row & 1)
+        total += marks * (marks + 1) // 2
+    return total - state[PENALTIES] * PENALTY_POINTS
+
+
+def _expected_best(base: np.ndarray, colored: np.ndarray) -> float:
+    """
+    Expected best outcome over the colored dice for one white pair.
+
+    Args:
+        base: Value of each white option without a colored mark, shape (W,)
+        colored: Value of each white option followed by the best colored
+            mark with each die value, shape (W, 4, 6) (-inf if none)
+
+    Returns:
+        The expectation over the 6^4 colored outcomes of the best choice
+    """
+    best = np.maximum(base[:, None, None, None, None], colored[:, 0, :, None, None, None])
+    best = np.maximum(best, colored[:, 1, None, :, None, None])
+    best = np.maximum(best, colored[:, 2, None, None, :, None])
+    best = np.maximum(best, colored[:, 3, None, None, None, :])
+    return float(best.max(axis=0).mean())
+
+
+class RootOption(NamedTuple):
+    """
+    One choice available at the root of a search.
+
+    Attributes:
+        move: (color, number) to mark now, or None to skip
+        outcomes: States the choice can lead to this turn (its value is the best one)
+    """
+
+    move: Optional[Tuple[DieColor, int]]
+    outcomes: Tuple[SearchState, ...]
+
+
+class SearchResult(NamedTuple):
+    """
+    Result of a completed search.
+
+    Attributes:
+        values: Value of each root option, in order
+        depth: Rolls looked ahead
+        nodes: Positions evaluated
+    """
+
+    values: List[float]
+    depth: int
+    nodes: int
+
+
+class ExpectimaxSearch:
+    """Depth-limited expectimax over one player's scoresheet."""
+
+    def __init__(
+        self,
+        num_players: int,
+        turn_offset: int,
+        row_values: Optional[Sequence[float]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+        table: Optional[TranspositionTable] = None,
+    ):
+        """
+        Initialize a search.
+
+        Args:
+            num_players: Number of players in the game
+            turn_offset: Rolls until the searching player's next turn,
+                counted from the current roll (0 if it is theirs)
+            row_values: Leaf value of each open row state, e.g. from the
+                solved row value table (heuristic if None)
+            clock: Time source for the deadline
+            table: Transposition table to reuse across searches (a new one
+                if None); only share it between searches with the same row
+                values
+        """
+        self.num_players = num_players
+        self.turn_offset = turn_offset
+        self.row_values = ROW_VALUES if row_values is None else row_values
+        self.clock = clock
+        self.deadline = float("inf")
+        self.nodes = 0
+        self.table = TranspositionTable() if table is None else table
+
+    def leaf_value(self, state: SearchState) -> float:
+        """
+        Heuristic value of a state at the search horizon.
+
+        Args:
+            state: The search state
+
+        Returns:
+            Final score if the game is over, otherwise the sum of the row values
+        """
+        if is_terminal(state):
+            return float(score(state))
+        value = 0.0
+        closed = state[CLOSED]
+        for row in range(NUM_ROWS):
+            if closed >> row & 1:
+                value += _triangular(state[row].bit_count() + (state[LOCKS] >> row & 1))
+            else:
+                value += self.row_values[state[row]]
+        return value - state[PENALTIES] * PENALTY_POINTS
+
+    def value(self, state: SearchState, rolls_left: int, roll_index: int) -> float:
+        """
+        Expected value of a state before a roll.
+
+        Args:
+            state: The search state
+            rolls_left: Rolls still to look ahead (0 for the leaf value)
+            roll_index: Index of the next roll, counted from the root roll
+
+        Returns:
+            The expected value
+        """
+        if rolls_left <= 0 or is_terminal(state):
+            return self.leaf_value(state)
+
+        turn = (roll_index + self.turn_offset) % self.num_players
+        key = zobrist_key(state, turn, self.num_players, rolls_left)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        if self.clock() > self.deadline:
+            raise SearchTimeout()
+        self.nodes += 1
+
+        if turn == 0:
+            result = self._own_roll_value(state, rolls_left, roll_index)
+        else:
+            result = self._other_roll_value(state, rolls_left, roll_index)
+        self.table.put(key, result)
+        return result
+
+    def _other_roll_value(
+        self, state: SearchState, rolls_left: int, roll_index: int
+    ) -> float:
+        """Expected value over another player's roll (white sum only)."""
+        skip_value = self.value(state, rolls_left - 1, roll_index + 1)
+        total = 0.0
+        for white_sum, probability in WHITE_SUM_PROBABILITIES.items():
+            best = skip_value
+            for row in range(NUM_ROWS):
+                marked = mark(state, row, white_sum)
+                if marked is not None:
+                    best = max(best, self.value(marked, rolls_left - 1, roll_index + 1))
+            total += probability * best
+        return total
+
+    def _own_roll_value(
+        self, state: SearchState, rolls_left: int, roll_index: int
+    ) -> float:
+        """Expected value over the player's own roll (all six dice)."""
+        total = 0.0
+        for low, high, probability in WHITE_PAIRS:
+            white_sum = low + high
+            white_states = [state]
+            for row in range(NUM_ROWS):
+                marked = mark(state, row, white_sum)
+                if marked is not None:
+                    white_states.append(marked)
+
+            base = np.empty(len(white_states))
+            colored = np.full((len(white_states), NUM_ROWS, 6), -np.inf)
+            for option, white_state in enumerate(white_states):
+                if option == 0:
+                    # Marking nothing at all on your own roll costs a penalty
+                    base[option] = self.value(
+                        add_penalty(state), rolls_left - 1, roll_index + 1
+                    )
+                else:
+                    base[option] = self.value(white_state, rolls_left - 1, roll_index + 1)
+
+                for row in range(NUM_ROWS):
+                    for die in range(1, 7):
+                        best = -np.inf
+                        for number in (low + die, high + die):
+                            marked = mark(white_state, row, number)
+                            if marked is not None:
+                                best = max(
+                                    best,
+                                    self.value(marked, rolls_left - 1, roll_index + 1),
+                                )
+                        colored[option, row, die - 1] = best
+
+            total += probability * _expected_best(base, colored)
+        return total
+
+    def option_value(self, option: RootOption, depth: int) -> float:
+        """
+        Value of a root option when looking depth rolls ahead.
+
+        Args:
+            option: The root option
+            depth: Rolls to look ahead after the current one
+
+        Returns:
+            The best value among the option's outcomes
+        """
+        return max(self.value(state, depth, 1) for state in option.outcomes)
+
+    def search(
+        self,
+        options: Sequence[RootOption],
+        max_depth: int = DEFAULT_SEARCH_DEPTH,
+        time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+    ) -> Optional[SearchResult]:
+        """
+        Value the root options, deepening one roll at a time.
+
+        Args:
+            options: The choices available now
+            max_depth: Most rolls to look ahead
+            time_budget: Seconds allowed (None for no limit)
+
+        Returns:
+            Result of the deepest completed search, or None if not even a
+            one-roll search finished in time
+        """
+        start = self.clock()
+        self.deadline = float("inf") if time_budget is None else start + time_budget
+
+        result = None
+        for depth in range(1, max_depth + 1):
+            try:
+                values = [self.option_value(option, depth) for option in options]
+            except SearchTimeout:
+                break
+            result = SearchResult(values, depth, self.nodes)
+        return result
@@ -2,14 +2,18 @@
 Main Game class for the Qwixx game.
 """
 
-from typing import List, Optional, Dict, Tuple
+from typing import Iterable, List, NamedTuple, Optional, Dict, Sequence, Tuple
 
+from .action_log import ActionLog
 from .player import Player
-from .ai_player import AIPlayer
-from .dice_roller import DiceRoller
+from .ai_player import AIDecision, AIPlayer
+from .dice_roller import DICE_ORDER, DiceRoller, RollOptions
 from .die import DieColor
 from .game_state import GameState
+from .rng import SeedLike, python_random, spawn_generators
+from .scoresheet import Scoresheet
 from .logger import (
+    get_ai_logger,
     get_game_logger,
     log_game_event,
     log_dice_roll,
@@ -19,24 +23,69 @@ from .logger import (
 )
 
 
+class GameSnapshot(NamedTuple):
+    """
+    Picklable copy of a game position, e.g. to search it in another process.
+
+    Attributes:
+        scoresheets: Scoresheet.pack() of each player
+        turn_moves: (white sum moves, colored moves) of each player this turn
+        current_player_index: Index of the rolling player
+        state: The game state
+        dice: Current dice in DICE_ORDER, or None before the roll
+        locked_colors: Colors locked in the game
+        stage_1_players_finished: IDs of players done with stage 1
+        rolling_player_made_stage_1_move: Whether the roller marked in stage 1
+        rolling_player_made_stage_2_move: Whether the roller marked in stage 2
+    """
+
+    scoresheets: Tuple[int, ...]
+    turn_moves: Tuple[Tuple[int, int], ...]
+    current_player_index: int
+    state: GameState
+    dice: Optional[Tuple[int, ...]]
+    locked_colors: Tuple[DieColor, ...]
+    stage_1_players_finished: Tuple[int, ...]
+    rolling_player_made_stage_1_move: bool
+    rolling_player_made_stage_2_move: bool
+
+
 class Game:
     """Main game controller for Qwixx."""
 
-    def __init__(self, num_players: int = 2, ai_strategy: str = "medium"):
+    def __init__(
+        self,
+        num_players: int = 2,
+        ai_strategy: str = "medium",
+        seed: SeedLike = None,
+        simulation: bool = False,
+        ai_strategies: Optional[Sequence[str]] = None,
+    ):
         """
         Initialize the game.
 
         Args:
             num_players: Number of human players (1 or 2)
-            ai_strategy: AI difficulty strategy ("easy", "medium", "hard")
+            ai_strategy: AI difficulty strategy ("easy", "medium", "hard", "expert",
+                "mcts")
+            seed: Seed, SeedSequence or NumPy generator for the game's random
+                streams; the same seed replays the same dice and AI choices
+            simulation: Headless mode for self-play: same rules, but no
+                messages and no logging
+            ai_strategies: One difficulty per player for an all-AI game
+                (overrides num_players and ai_strategy)
         """
-        self.dice_roller = DiceRoller()
+        # Independent streams for the dice and for AI decisions
+        dice_generator, self.ai_generator = spawn_generators(seed, 2)
+        self.dice_roller = DiceRoller(dice_generator)
         self.players: List[Player] = []
         self.current_player_index = 0
         self.state = GameState.SETUP
         self.dice_results: Optional[Dict[str, int]] = None
+        self.roll_options: Optional[RollOptions] = None  # Candidate sums for this roll
         self.locked_colors: set = set()  # Track which colors are locked globally
         self.message = "Welcome to Qwixx!"
+        self.action_log = ActionLog()  # Actions since creation or the last snapshot
         self.players_finished_moves: set = (
             set()
         )  # Track which players have finished their moves
@@ -57,10 +106,14 @@ class Game:
         self.ai_strategy = (
             ai_strategy if ai_strategy else "medium"
         )  # Default to medium if None
+        self.ai_strategies = list(ai_strategies) if ai_strategies else None
+        self.simulation = simulation
 
-        # Initialize logging
-        self.logger = get_game_logger()
-        setup_logging()
+        # Initialize logging (skipped entirely in simulation mode)
+        self.logger = None
+        if not simulation:
+            self.logger = get_game_logger()
+            setup_logging()
 
         # Initialize players
         self.setup_players()
@@ -69,19 +122,33 @@ class Game:
         """Set up the players for the game."""
         self.players = []
 
-        if self.num_players == 1:
+        if self.ai_strategies:
+            # Self-play mode: every player is an AI
+            self.players = [
+                AIPlayer(
+                    f"Auto Player {i + 1}",
+                    i,
+                    difficulty=difficulty,
+                    rng=python_random(self.ai_generator),
+                    simulation=self.simulation,
+                )
+                for i, difficulty in enumerate(self.ai_strategies)
+            ]
+        elif self.num_players == 1:
             # Single player mode: Human player 1 vs AI player 2
             self.players = [
                 Player("Player 1", 0),
-                AIPlayer("Auto Player", 1, difficulty=self.ai_strategy),
+                AIPlayer(
+                    "Auto Player",
+                    1,
+                    difficulty=self.ai_strategy,
+                    rng=python_random(self.ai_generator),
+                    simulation=self.simulation,
+                ),
             ]
-            self.logger.info(
-                f"Game setup: 1 human player vs AI ({self.ai_strategy} difficulty)"
-            )
         else:
             # Two player mode: Both human players
             self.players = [Player("Player 1", 0), Player("Player 2", 1)]
-            self.logger.info("Game setup: 2 human players")
 
         if self.players:
             self.players[0].set_active(True)
@@ -89,6 +156,19 @@ class Game:
 
         old_state = self.state.name
         self.state = GameState.WAITING_FOR_ROLL
+        if self.simulation:
+            return
+
+        if self.ai_strategies:
+            self.logger.info(
+                f"Game setup: AI self-play ({', '.join(self.ai_strategies)})"
+            )
+        elif self.num_players == 1:
+            self.logger.info(
+                f"Game setup: 1 human player vs AI ({self.ai_strategy} difficulty)"
+            )
+        else:
+            self.logger.info("Game setup: 2 human players")
         log_game_state_change(old_state, self.state.name, "Players initialized")
 
         self.message = f"{self.get_current_player().get_name()}'s turn. Click 'Roll Dice' to start."
@@ -102,6 +182,104 @@ class Game:
             "PLAYERS_SETUP", f"Players: {', '.join(player_info)}", players=player_info
         )
 
+    def snapshot(self) -> GameSnapshot:
+        """
+        Capture the current position.
+
+        Returns:
+            A GameSnapshot that from_snapshot() can rebuild
+        """
+        return GameSnapshot(
+            scoresheets=tuple(p.get_scoresheet().pack() for p in self.players),
+            turn_moves=tuple(
+                (p.white_sum_moves_this_turn, p.colored_combination_moves_this_turn)
+                for p in self.players
+            ),
+            current_player_index=self.current_player_index,
+            state=self.state,
+            dice=(
+                tuple(self.dice_results[name] for name in DICE_ORDER)
+                if self.dice_results
+                else None
+            ),
+            locked_colors=tuple(self.locked_colors),
+            stage_1_players_finished=tuple(self.stage_1_players_finished),
+            rolling_player_made_stage_1_move=self.rolling_player_made_stage_1_move,
+            rolling_player_made_stage_2_move=self.rolling_player_made_stage_2_move,
+        )
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        snapshot: GameSnapshot,
+        ai_strategies: Sequence[str],
+        seed: SeedLike = None,
+    ) -> "Game":
+        """
+        Rebuild a position as a headless all-AI game.
+
+        Args:
+            snapshot: Position from snapshot()
+            ai_strategies: One difficulty per player to play on with
+            seed: Seed for the rebuilt game's dice and AI choices
+
+        Returns:
+            A simulation game in the snapshot's position
+        """
+        game = cls(simulation=True, ai_strategies=ai_strategies, seed=seed)
+        game.load_snapshot(snapshot)
+        return game
+
+    def load_snapshot(self, snapshot: GameSnapshot) -> None:
+        """
+        Put this game, set up with the same players, in a captured position.
+
+        Args:
+            snapshot: Position from snapshot()
+        """
+        self.players[0].set_active(False)
+        for player, packed, (white_moves, colored_moves) in zip(
+            self.players, snapshot.scoresheets, snapshot.turn_moves
+        ):
+            player.scoresheet = Scoresheet.unpack(packed)
+            player.white_sum_moves_this_turn = white_moves
+            player.colored_combination_moves_this_turn = colored_moves
+            player.total_moves_this_turn = white_moves + colored_moves
+
+        self.current_player_index = snapshot.current_player_index
+        self.get_current_player().set_active(True)
+        self.state = snapshot.state
+        if snapshot.dice is not None:
+            self.dice_results = self.dice_roller.set_values(snapshot.dice)
+            self.roll_options = self.dice_roller.get_roll_options()
+        else:
+            self.dice_results = None
+            self.roll_options = None
+        self.locked_colors = set(snapshot.locked_colors)
+        self.stage_1_players_finished = set(snapshot.stage_1_players_finished)
+        self.rolling_player_made_stage_1_move = snapshot.rolling_player_made_stage_1_move
+        self.rolling_player_made_stage_2_move = snapshot.rolling_player_made_stage_2_move
+        self.active_player_made_move = (
+            snapshot.rolling_player_made_stage_1_move
+            or snapshot.rolling_player_made_stage_2_move
+        )
+
+    def set_simulation(self, simulation: bool) -> None:
+        """
+        Turn headless mode on or off, e.g. for a game rebuilt in simulation mode.
+
+        Unlike setting up a game, this logs nothing.
+
+        Args:
+            simulation: Headless mode (see __init__)
+        """
+        self.simulation = simulation
+        self.logger = None if simulation else get_game_logger()
+        for player in self.players:
+            if isinstance(player, AIPlayer):
+                player.simulation = simulation
+                player.logger = None if simulation else get_ai_logger()
+
     def get_current_player(self) -> Player:
         """Get the currently active player."""
         return self.players[self.current_player_index]
@@ -119,16 +297,17 @@ class Game:
         new_player = self.players[self.current_player_index]
         new_player.set_active(True)
 
-        self.logger.info(
-            f"Turn changed: {old_player.get_name()} -> {new_player.get_name()}"
-        )
-        log_game_event(
-            "TURN_CHANGE",
-            f"Turn changed from {old_player.get_name()} to {new_player.get_name()}",
-            previous_player=old_player.get_name(),
-            current_player=new_player.get_name(),
-            turn_number=self.current_player_index + 1,
-        )
+        if not self.simulation:
+            self.logger.info(
+                f"Turn changed: {old_player.get_name()} -> {new_player.get_name()}"
+            )
+            log_game_event(
+                "TURN_CHANGE",
+                f"Turn changed from {old_player.get_name()} to {new_player.get_name()}",
+                previous_player=old_player.get_name(),
+                current_player=new_player.get_name(),
+                turn_number=self.current_player_index + 1,
+            )
 
         # Reset turn tracking for all players
         for player in self.players:
@@ -144,12 +323,15 @@ class Game:
 
         old_state = self.state.name
         self.state = GameState.WAITING_FOR_ROLL
+        self.dice_results = None
+        self.roll_options = None
+        if self.simulation:
+            return
+
         log_game_state_change(
             old_state, self.state.name, f"{new_player.get_name()}'s turn"
         )
-
-        self.dice_results = None
-        self.message = f"{new_player.get_name()}'s turn. Click 'Roll Dice' to start."
+        self.message = self.describe_state()
 
     def roll_dice(self) -> None:
         """Roll all dice and update game state."""
@@ -157,71 +339,98 @@ class Game:
             return
 
         self.dice_results = self.dice_roller.roll_all()
+        self.roll_options = self.dice_roller.get_roll_options()
+        self.action_log.record_roll(
+            self.current_player_index,
+            tuple(self.dice_results[name] for name in DICE_ORDER),
+        )
         current_player = self.get_current_player()
+        verbose = not self.simulation
 
         # Log dice roll
-        self.logger.info(
-            f"{current_player.get_name()} rolled dice: {self.dice_results}"
-        )
-        log_dice_roll(self.dice_results)
+        if verbose:
+            self.logger.info(
+                f"{current_player.get_name()} rolled dice: {self.dice_results}"
+            )
+            log_dice_roll(self.dice_results)
 
         old_state = self.state.name
         self.state = GameState.DICE_ROLLED
-        log_game_state_change(
-            old_state, self.state.name, f"{current_player.get_name()} rolled dice"
-        )
+        if verbose:
+            log_game_state_change(
+                old_state, self.state.name, f"{current_player.get_name()} rolled dice"
+            )
 
         # Check if any moves are possible in Stage 1 (white dice sum only)
         if self.has_stage_1_moves():
             old_state = self.state.name
             self.state = GameState.STAGE_1_MOVES
-            log_game_state_change(old_state, self.state.name, "Stage 1 moves available")
 
             self.stage_1_players_finished.clear()
             self.rolling_player_made_stage_1_move = False
-            white_sum = self.dice_results["white1"] + self.dice_results["white2"]
-            self.message = f"Stage 1: All players can mark using white dice sum ({white_sum}). Click 'Done' when finished."
 
-            self.logger.info(f"Stage 1 started - white dice sum: {white_sum}")
+            if verbose:
+                log_game_state_change(
+                    old_state, self.state.name, "Stage 1 moves available"
+                )
+                self.message = self.describe_state()
+
+                self.logger.info(
+                    f"Stage 1 started - white dice sum: {self.roll_options.white_sum}"
+                )
         else:
             # No Stage 1 moves possible, check Stage 2
             if self.has_stage_2_moves():
                 old_state = self.state.name
                 self.state = GameState.STAGE_2_MOVES
-                log_game_state_change(
-                    old_state, self.state.name, "Stage 2 moves available"
-                )
 
                 self.stage_2_rolling_player_finished = False
                 self.rolling_player_made_stage_2_move = False
-                self.message = f"Stage 2: {current_player.get_name()} can mark using white + colored combinations. Click 'Done' when finished."
 
-                self.logger.info(f"Stage 2 started for {current_player.get_name()}")
+                if verbose:
+                    log_game_state_change(
+                        old_state, self.state.name, "Stage 2 moves available"
+                    )
+                    self.message = self.describe_state()
+
+                    self.logger.info(
+                        f"Stage 2 started for {current_player.get_name()}"
+                    )
             else:
                 # No moves possible in either stage, rolling player gets penalty
-                self.logger.warning(
-                    f"No valid moves available for {current_player.get_name()}, applying penalty"
-                )
-                log_game_event(
-                    "PENALTY_APPLIED",
-                    f"{current_player.get_name()} received penalty - no valid moves",
-                    player=current_player.get_name(),
-                    reason="no_valid_moves",
-                    penalty_count=current_player.get_scoresheet().penalties + 1,
-                )
+                if verbose:
+                    self.logger.warning(
+                        f"No valid moves available for {current_player.get_name()}, applying penalty"
+                    )
+                    log_game_event(
+                        "PENALTY_APPLIED",
+                        f"{current_player.get_name()} received penalty - no valid moves",
+                        player=current_player.get_name(),
+                        reason="no_valid_moves",
+                        penalty_count=current_player.get_scoresheet().penalties + 1,
+                    )
+                    self.message = f"No valid moves available. {current_player.get_name()} receives a penalty."
 
                 current_player.get_scoresheet().add_penalty()
-                self.message = f"No valid moves available. {current_player.get_name()} receives a penalty."
                 self.check_game_over()
                 if self.state != GameState.GAME_OVER:
                     self.next_player()
 
+    def queue_dice(self, rolls: Iterable[Sequence[int]]) -> None:
+        """
+        Queue pre-rolled dice to be used by the next calls to roll_dice().
+
+        Args:
+            rolls: Rows of six values in DICE_ORDER, e.g. from DiceRoller.roll_batch()
+        """
+        self.dice_roller.queue_rolls(rolls)
+
     def has_possible_moves(self) -> bool:
         """Check if any player has possible moves with current dice."""
-        if not self.dice_results:
+        if not self.roll_options:
             return False
 
-        white_sum = self.dice_results["white1"] + self.dice_results["white2"]
+        white_sum = self.roll_options.white_sum
 
         # Check if any player can mark the white sum
         for player in self.players:
@@ -232,9 +441,8 @@ class Game:
 
         # Check if active player can mark white + colored combinations
         current_player = self.get_current_player()
-        white_colored_sums = self.dice_roller.get_white_plus_colored_sums()
 
-        for color, sums in white_colored_sums.items():
+        for color, sums in self.roll_options.colored_sums.items():
             if color not in self.locked_colors:
                 for sum_value in sums:
                     if current_player.get_scoresheet().can_mark_number(
@@ -246,10 +454,10 @@ class Game:
 
     def has_stage_1_moves(self) -> bool:
         """Check if any player has possible moves in Stage 1 (white dice sum only)."""
-        if not self.dice_results:
+        if not self.roll_options:
             return False
 
-        white_sum = self.dice_results["white1"] + self.dice_results["white2"]
+        white_sum = self.roll_options.white_sum
 
         # Check if any player can mark the white sum
         for player in self.players:
@@ -262,14 +470,13 @@ class Game:
 
     def has_stage_2_moves(self) -> bool:
         """Check if the rolling player has possible moves in Stage 2 (white + colored combinations)."""
-        if not self.dice_results:
+        if not self.roll_options:
             return False
 
         # Only the rolling player can make moves in Stage 2
         current_player = self.get_current_player()
-        white_colored_sums = self.dice_roller.get_white_plus_colored_sums()
 
-        for color, sums in white_colored_sums.items():
+        for color, sums in self.roll_options.colored_sums.items():
             if color not in self.locked_colors:
                 for sum_value in sums:
                     if current_player.get_scoresheet().can_mark_number(
@@ -292,21 +499,25 @@ class Game:
             True if successfully marked, False otherwise
         """
         if color in self.locked_colors:
-            self.logger.debug(
-                f"{player.get_name()} tried to mark {number} in locked {color.value} row"
-            )
+            if not self.simulation:
+                self.logger.debug(
+                    f"{player.get_name()} tried to mark {number} in locked {color.value} row"
+                )
             return False
 
         if not self.is_valid_move(player, color, number):
-            self.logger.debug(
-                f"Invalid move: {player.get_name()} tried to mark {number} in {color.value} row"
-            )
+            if not self.simulation:
+                self.logger.debug(
+                    f"Invalid move: {player.get_name()} tried to mark {number} in {color.value} row"
+                )
             return False
 
         # Mark the number
         if player.get_scoresheet().mark_number(color, number):
+            self.action_log.record_mark(player.get_id(), color, number)
+
             # Record the move type for tracking
-            white_sum = self.dice_results["white1"] + self.dice_results["white2"]
+            white_sum = self.roll_options.white_sum
             move_type = "unknown"
             stage = 0
 
@@ -322,8 +533,7 @@ class Game:
                     stage = 1
             elif player == self.get_current_player():
                 # This must be a colored combination move
-                white_colored_sums = self.dice_roller.get_white_plus_colored_sums()
-                if color in white_colored_sums and number in white_colored_sums[color]:
+                if self.roll_options.is_colored_sum(color, number):
                     player.record_colored_combination_move()
                     move_type = "colored_combination"
                     # Track stage-specific moves
@@ -332,24 +542,25 @@ class Game:
                         stage = 2
 
             # Log the player move
-            self.logger.info(
-                f"{player.get_name()} marked {number} in {color.value} row ({move_type})"
-            )
-            log_player_decision(
-                player.get_name(),
-                stage
-                if stage > 0
-                else (1 if self.state == GameState.STAGE_1_MOVES else 2),
-                "MARK",
-                {
-                    "color": color.value,
-                    "number": number,
-                    "move_type": move_type,
-                    "dice_results": self.dice_results.copy()
-                    if self.dice_results
-                    else {},
-                },
-            )
+            if not self.simulation:
+                self.logger.info(
+                    f"{player.get_name()} marked {number} in {color.value} row ({move_type})"
+                )
+                log_player_decision(
+                    player.get_name(),
+                    stage
+                    if stage > 0
+                    else (1 if self.state == GameState.STAGE_1_MOVES else 2),
+                    "MARK",
+                    {
+                        "color": color.value,
+                        "number": number,
+                        "move_type": move_type,
+                        "dice_results": self.dice_results.copy()
+                        if self.dice_results
+                        else {},
+                    },
+                )
 
             # Track if active player made a move (legacy tracking)
             if player == self.get_current_player():
@@ -359,20 +570,25 @@ class Game:
             if player.get_scoresheet().can_lock_row(color):
                 if player.get_scoresheet().lock_row(color):
                     self.locked_colors.add(color)
-                    self.message = f"{player.get_name()} locked the {color.value} row!"
-
-                    # Log row locking
-                    self.logger.info(
-                        f"{player.get_name()} locked the {color.value} row!"
-                    )
-                    log_game_event(
-                        "ROW_LOCKED",
-                        f"{player.get_name()} locked the {color.value} row",
-                        player=player.get_name(),
-                        color=color.value,
-                        locked_colors_count=len(self.locked_colors),
-                        total_locked_colors=list(c.value for c in self.locked_colors),
-                    )
+                    if not self.simulation:
+                        self.message = (
+                            f"{player.get_name()} locked the {color.value} row!"
+                        )
+
+                        # Log row locking
+                        self.logger.info(
+                            f"{player.get_name()} locked the {color.value} row!"
+                        )
+                        log_game_event(
+                            "ROW_LOCKED",
+                            f"{player.get_name()} locked the {color.value} row",
+                            player=player.get_name(),
+                            color=color.value,
+                            locked_colors_count=len(self.locked_colors),
+                            total_locked_colors=list(
+                                c.value for c in self.locked_colors
+                            ),
+                        )
 
             return True
 
@@ -398,14 +614,14 @@ class Game:
                 GameState.STAGE_2_MOVES,
                 GameState.WAITING_FOR_MOVES,
             ]
-            or not self.dice_results
+            or not self.roll_options
         ):
             return False
 
         if not player.get_scoresheet().can_mark_number(color, number):
             return False
 
-        white_sum = self.dice_results["white1"] + self.dice_results["white2"]
+        white_sum = self.roll_options.white_sum
 
         # Stage 1: Only white sum moves allowed for all players
         if self.state == GameState.STAGE_1_MOVES:
@@ -419,8 +635,7 @@ class Game:
             if player != self.get_current_player():
                 return False  # Only rolling player can move in Stage 2
 
-            white_colored_sums = self.dice_roller.get_white_plus_colored_sums()
-            if color in white_colored_sums and number in white_colored_sums[color]:
+            if self.roll_options.is_colored_sum(color, number):
                 return player.can_use_colored_combination()
             else:
                 return False
@@ -433,8 +648,7 @@ class Game:
 
             # Check if this is a white + colored combination move (active player only)
             if player == self.get_current_player():
-                white_colored_sums = self.dice_roller.get_white_plus_colored_sums()
-                if color in white_colored_sums and number in white_colored_sums[color]:
+                if self.roll_options.is_colored_sum(color, number):
                     return player.can_use_colored_combination()
 
         return False
@@ -483,14 +697,22 @@ class Game:
 
     def player_done_making_moves(self, player: Player = None) -> None:
         """Handle when a player indicates they are done making moves."""
+        if self.state not in (
+            GameState.STAGE_1_MOVES,
+            GameState.STAGE_2_MOVES,
+            GameState.WAITING_FOR_MOVES,
+        ):
+            return
+        if player is None:
+            player = self.get_current_player()
+        self.action_log.record_done(player.get_id())
+
         if self.state == GameState.STAGE_1_MOVES:
             self.stage_1_done()
         elif self.state == GameState.STAGE_2_MOVES:
             self.stage_2_done()
-        elif self.state == GameState.WAITING_FOR_MOVES:
+        else:
             # Legacy handling
-            if player is None:
-                player = self.get_current_player()
             self.player_finished_moves(player)
             self.message = f"{player.get_name()} is done making moves."
 
@@ -503,8 +725,8 @@ class Game:
         if self.has_stage_2_moves():
             self.state = GameState.STAGE_2_MOVES
             self.stage_2_rolling_player_finished = False
-            current_player = self.get_current_player()
-            self.message = f"Stage 2: {current_player.get_name()} can mark using white + colored combinations. Click 'Done' when finished."
+            if not self.simulation:
+                self.message = self.describe_state()
         else:
             # No Stage 2 moves, end turn with penalty check
             self.end_stage_based_turn()
@@ -526,7 +748,8 @@ class Game:
         ):
             current_player = self.get_current_player()
             current_player.get_scoresheet().add_penalty()
-            self.message = f"{current_player.get_name()} made no moves in both stages and receives a penalty."
+            if not self.simulation:
+                self.message = f"{current_player.get_name()} made no moves in both stages and receives a penalty."
 
         self.check_game_over()
         if self.state != GameState.GAME_OVER:
@@ -537,23 +760,15 @@ class Game:
         # Game ends if 2 colors are locked or any player has 4 penalties
         if len(self.locked_colors) >= 2:
             self.state = GameState.GAME_OVER
-            winner = self.get_winner()
-            if winner:
-                self.message = f"Game Over! Two colors locked. {winner.get_name()} wins with {winner.get_total_score()} points!"
-            else:
-                self.message = "Game Over! Two colors have been locked."
+            if not self.simulation:
+                self.message = self.describe_state()
             return
 
         for player in self.players:
             if player.is_game_over():
                 self.state = GameState.GAME_OVER
-                winner = self.get_winner()
-                if winner:
-                    self.message = f"Game Over! {player.get_name()} reached penalty limit. {winner.get_name()} wins with {winner.get_total_score()} points!"
-                else:
-                    self.message = (
-                        f"Game Over! {player.get_name()} has reached the penalty limit."
-                    )
+                if not self.simulation:
+                    self.message = self.describe_state()
                 return
 
     def get_winner(self) -> Optional[Player]:
@@ -605,52 +820,105 @@ class Game:
 
     def handle_ai_stage_1_move(self) -> None:
         """Handle AI decision making for stage 1 moves."""
-        # Check if any AI players want to make moves
-        ai_players_to_process = []
+        pending = self.pending_ai_decision()
+        if pending is not None and pending[1] == 1:
+            ai_player, stage = pending
+            self.apply_ai_decision(ai_player, stage, ai_player.decide(self, stage))
 
-        for player in self.players:
+    def handle_ai_stage_2_move(self) -> None:
+        """Handle AI decision making for stage 2 moves."""
+        pending = self.pending_ai_decision()
+        if pending is not None and pending[1] == 2:
+            ai_player, stage = pending
+            self.apply_ai_decision(ai_player, stage, ai_player.decide(self, stage))
+
+    def pending_ai_decision(self) -> Optional[Tuple[AIPlayer, int]]:
+        """
+        Find the AI decision the game is waiting for.
+
+        In stage 1 AI players decide one at a time, in seat order; in stage 2
+        only a rolling AI player decides.
+
+        Returns:
+            Tuple of (AI player, stage), or None if no AI has to decide
+        """
+        if self.state == GameState.STAGE_1_MOVES:
+            for player in self.players:
+                if (
+                    hasattr(player, "is_ai")
+                    and player.is_ai
+                    and player.get_id() not in self.stage_1_players_finished
+                ):
+                    return player, 1
+        elif self.state == GameState.STAGE_2_MOVES:
+            current_player = self.get_current_player()
+            if hasattr(current_player, "is_ai") and current_player.is_ai:
+                return current_player, 2
+        return None
+
+    def apply_ai_decision(
+        self, ai_player: AIPlayer, stage: int, decision: AIDecision
+    ) -> None:
+        """
+        Play an AI player's decision for a stage and finish its stage.
+
+        Args:
+            ai_player: The deciding AI player (see pending_ai_decision())
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+            decision: The player's AIDecision
+        """
+        if decision.participate and decision.move:
+            color, number = decision.move
             if (
-                hasattr(player, "is_ai")
-                and player.is_ai
-                and player.get_id() not in self.stage_1_players_finished
+                self.try_mark_number(ai_player, color, number)
+                and not self.simulation
             ):
-                ai_players_to_process.append(player)
+                self.message = f"{ai_player.get_name()} marked {number} in {color.value} row."
 
-        # Process one AI player at a time
-        if ai_players_to_process:
-            ai_player = ai_players_to_process[0]
-            available_moves = ai_player.get_available_moves(self)
+        self.finish_ai_stage(ai_player, stage)
 
-            if available_moves and ai_player.should_make_move_in_stage(self, 1):
-                move = ai_player.make_move_decision(self, available_moves)
-                if move:
-                    color, number = move
-                    if self.try_mark_number(ai_player, color, number):
-                        self.message = f"{ai_player.get_name()} marked {number} in {color.value} row."
+    def finish_ai_stage(self, ai_player: AIPlayer, stage: int) -> None:
+        """
+        Finish an AI player's stage after its decision.
 
+        Args:
+            ai_player: The AI player
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+        """
+        self.action_log.record_ai_done(ai_player.get_id(), stage)
+        if stage == 1:
             # Mark this AI player as finished with stage 1
             self.stage_1_players_finished.add(ai_player.get_id())
 
             # Check if all players are done with stage 1
             if len(self.stage_1_players_finished) >= len(self.players):
                 self.stage_1_done()
+        else:
+            # AI is done with stage 2
+            self.stage_2_done()
 
-    def handle_ai_stage_2_move(self) -> None:
-        """Handle AI decision making for stage 2 moves."""
-        current_player = self.get_current_player()
-
-        if hasattr(current_player, "is_ai") and current_player.is_ai:
-            available_moves = current_player.get_available_moves(self)
+    def play_ai_game(self, max_rolls: int = 1000) -> int:
+        """
+        Play an all-AI game until it is over.
 
-            if available_moves and current_player.should_make_move_in_stage(self, 2):
-                move = current_player.make_move_decision(self, available_moves)
-                if move:
-                    color, number = move
-                    if self.try_mark_number(current_player, color, number):
-                        self.message = f"{current_player.get_name()} marked {number} in {color.value} row."
+        Args:
+            max_rolls: Safety limit on the number of rolls
 
-            # AI is done with stage 2
-            self.stage_2_done()
+        Returns:
+            Number of rolls played
+        """
+        rolls = 0
+        while self.state != GameState.GAME_OVER and rolls < max_rolls:
+            if self.state == GameState.WAITING_FOR_ROLL:
+                self.roll_dice()
+                rolls += 1
+            elif self.state == GameState.STAGE_1_MOVES:
+                self.handle_ai_stage_1_move()
+            elif self.state == GameState.STAGE_2_MOVES:
+                self.handle_ai_stage_2_move()
+            else:
+                break
+        return rolls
 
     def get_state(self) -> GameState:
         """Get the current game state."""
@@ -660,10 +928,42 @@ class Game:
         """Get the current game message."""
         return self.message
 
+    def describe_state(self) -> str:
+        """
+        Describe what the game waits for, as its state changes announce it.
+
+        Returns:
+            The message of the current state, e.g. for a game replayed headless
+        """
+        current_player = self.get_current_player().get_name()
+        if self.state == GameState.STAGE_1_MOVES:
+            white_sum = self.roll_options.white_sum
+            return f"Stage 1: All players can mark using white dice sum ({white_sum}). Click 'Done' when finished."
+        if self.state == GameState.STAGE_2_MOVES:
+            return f"Stage 2: {current_player} can mark using white + colored combinations. Click 'Done' when finished."
+        if self.state != GameState.GAME_OVER:
+            return f"{current_player}'s turn. Click 'Roll Dice' to start."
+
+        winner = self.get_winner()
+        if len(self.locked_colors) >= 2:
+            if winner:
+                return f"Game Over! Two colors locked. {winner.get_name()} wins with {winner.get_total_score()} points!"
+            return "Game Over! Two colors have been locked."
+        player = next((p.get_name() for p in self.players if p.is_game_over()), None)
+        if player is None:
+            return "Game Over!"
+        if winner:
+            return f"Game Over! {player} reached penalty limit. {winner.get_name()} wins with {winner.get_total_score()} points!"
+        return f"Game Over! {player} has reached the penalty limit."
+
     def get_dice_results(self) -> Optional[Dict[str, int]]:
         """Get the current dice results."""
         return self.dice_results
 
+    def get_roll_options(self) -> Optional[RollOptions]:
+        """Get the candidate sums of the current roll."""
+        return self.roll_options
+
     def get_players(self) -> List[Player]:
         """Get all players."""
         return self.players
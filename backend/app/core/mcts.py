@@ -0,0 +1,286 @@
+"""
+Flat Monte Carlo search for the mcts AI.
+
+The position is public but the dice still to come are not, so every rollout
+plays the game out on freshly sampled dice with a fast headless policy for
+every player. There is no tree below the root: with 6^6 outcomes per roll,
+sampled dice almost never revisit a position, so statistics are only kept
+for the root choices, and UCB1 spreads the rollouts over the candidate
+moves and the skip. (The difficulty keeps its historical name, mcts.)
+
+Search is root-parallel: each worker process searches the same root with its
+own random stream until the shared deadline, and the visit counts and reward
+totals are merged. The most visited option is played. The worker count is
+the caller's to choose: callers that already spread decisions over worker
+processes (the API's executor, qwixx-sim's game workers) search with one
+worker, so there is only ever one layer of processes.
+"""
+
+import atexit
+import math
+import multiprocessing
+import multiprocessing.pool
+import os
+import random
+import time
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .die import DieColor
+from .rng import stream_seed
+
+# Worker processes (0 for the CPU count), seconds and rollout cap per decision
+# (override with environment variables)
+DEFAULT_MCTS_WORKERS = int(os.environ.get("QWIXX_MCTS_WORKERS", "0")) or os.cpu_count() or 1
+DEFAULT_MCTS_TIME_BUDGET = float(os.environ.get("QWIXX_MCTS_TIME_BUDGET", "0.5"))
+DEFAULT_MCTS_ROLLOUTS = int(os.environ.get("QWIXX_MCTS_ROLLOUTS", "2000"))
+
+# Policy every player follows during a rollout
+ROLLOUT_STRATEGY = "medium"
+
+# UCB1 exploration constant for rewards in [0, 1]
+EXPLORATION = 0.5
+
+# Score margin (own score minus best opponent) that maps to reward 1
+MARGIN_SCALE = 40.0
+
+# Extra seconds to wait for worker results past the deadline before dropping them
+WORKER_GRACE = 0.05
+
+# (color, number) to mark, or None to skip
+Move = Optional[Tuple[DieColor, int]]
+
+
+class RootStats(NamedTuple):
+    """
+    Rollout statistics of the root options.
+
+    Attributes:
+        visits: Rollouts of each option
+        rewards: Total reward of each option
+    """
+
+    visits: List[int]
+    rewards: List[float]
+
+
+class MCTSResult(NamedTuple):
+    """
+    Result of a search.
+
+    Attributes:
+        visits: Rollouts of each option, merged over workers
+        values: Mean reward of each option (0 if never visited)
+        rollouts: Total rollouts
+        workers: Workers whose statistics were merged
+    """
+
+    visits: List[int]
+    values: List[float]
+    rollouts: int
+    workers: int
+
+
+def reward(scores: Sequence[int], player_index: int) -> float:
+    """
+    Reward of a finished game for one player.
+
+    Args:
+        scores: Final score of every player
+        player_index: Index of the searching player
+
+    Returns:
+        The score margin over the best opponent, mapped from
+        [-MARGIN_SCALE, MARGIN_SCALE] to [0, 1]
+    """
+    best_other = max(s for i, s in enumerate(scores) if i != player_index)
+    margin = (scores[player_index] - best_other) / MARGIN_SCALE
+    return 0.5 + 0.5 * max(-1.0, min(1.0, margin))
+
+
+def rollout(
+    snapshot,
+    player_index: int,
+    stage: int,
+    move: Move,
+    seed: int,
+    strategy: str = ROLLOUT_STRATEGY,
+) -> float:
+    """
+    Play one root option and the rest of the game on sampled dice.
+
+    Args:
+        snapshot: GameSnapshot of the decision
+        player_index: Index of the searching player
+        stage: Stage of the decision (1 or 2)
+        move: The root option
+        seed: Seed for the rollout's dice and policy choices
+        strategy: Difficulty every player plays the rest of the game with
+
+    Returns:
+        The reward of the finished game
+    """
+    # Imported here: game imports ai_player, which imports this module
+    from .game import Game
+
+    game = Game.from_snapshot(
+        snapshot, [strategy] * len(snapshot.scoresheets), seed=seed
+    )
+    players = game.get_players()
+    player = players[player_index]
+    if move is not None:
+        game.try_mark_number(player, *move)
+
+    if stage == 1:
+        game.stage_1_players_finished.add(player.get_id())
+        if len(game.stage_1_players_finished) >= len(players):
+            game.stage_1_done()
+    else:
+        game.stage_2_done()
+
+    game.play_ai_game()
+    return reward([p.get_total_score() for p in players], player_index)
+
+
+def select_option(visits: Sequence[int], rewards: Sequence[float]) -> int:
+    """
+    Pick the option to roll out next with UCB1.
+
+    Args:
+        visits: Rollouts of each option so far
+        rewards: Total reward of each option so far
+
+    Returns:
+        Index of the option (unvisited options first)
+    """
+    for index, count in enumerate(visits):
+        if count == 0:
+            return index
+    log_total = math.log(sum(visits))
+    return max(
+        range(len(visits)),
+        key=lambda i: rewards[i] / visits[i]
+        + EXPLORATION * math.sqrt(log_total / visits[i]),
+    )
+
+
+def search_root(task: tuple) -> RootStats:
+    """
+    Search one root in this process until the deadline or the rollout cap.
+
+    Args:
+        task: Tuple of (snapshot, player index, stage, moves, seed,
+            deadline as a time.monotonic() value or None, rollout cap); the
+            monotonic clock is system-wide, so a task queued behind others
+            still stops at the decision's deadline
+
+    Returns:
+        The root statistics
+    """
+    snapshot, player_index, stage, moves, seed, deadline, max_rollouts = task
+    rng = random.Random(seed)
+    visits = [0] * len(moves)
+    rewards = [0.0] * len(moves)
+
+    for _ in range(max_rollouts):
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        index = select_option(visits, rewards)
+        rewards[index] += rollout(
+            snapshot, player_index, stage, moves[index], rng.getrandbits(63)
+        )
+        visits[index] += 1
+    return RootStats(visits, rewards)
+
+
+_pool: Optional[multiprocessing.pool.Pool] = None
+_pool_workers = 0
+
+
+def get_pool(workers: int) -> multiprocessing.pool.Pool:
+    """
+    Get the shared process pool for root-parallel search.
+
+    The pool is created on first use and reused by every decision, so
+    processes are not spawned per move. Its workers are daemonic and are
+    terminated with the process, which also lets qwixx-sim's workers exit.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        The process pool
+    """
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            atexit.unregister(_pool.terminate)
+            _pool.terminate()
+        _pool = multiprocessing.Pool(processes=workers)
+        _pool_workers = workers
+        atexit.register(_pool.terminate)
+    return _pool
+
+
+def search(
+    snapshot,
+    player_index: int,
+    stage: int,
+    moves: Sequence[Move],
+    seed: int,
+    workers: int = DEFAULT_MCTS_WORKERS,
+    time_budget: Optional[float] = DEFAULT_MCTS_TIME_BUDGET,
+    max_rollouts: int = DEFAULT_MCTS_ROLLOUTS,
+    pool_factory: Callable[[int], multiprocessing.pool.Pool] = get_pool,
+) -> MCTSResult:
+    """
+    Root-parallel search of one decision.
+
+    The calling process searches one share of the root itself; the other
+    workers run in the process pool. Every worker stops at the decision's
+    deadline, and results not back WORKER_GRACE seconds later are left out
+    of the merge, so a slow or busy pool never holds up the decision.
+
+    Args:
+        snapshot: GameSnapshot of the decision
+        player_index: Index of the searching player
+        stage: Stage of the decision (1 or 2)
+        moves: The root options
+        seed: Root seed; worker i searches with its i-th substream
+        workers: Searches to run in parallel (1 searches in this process
+            only, as callers running in a worker process should; the default
+            is QWIXX_MCTS_WORKERS, or the CPU count)
+        time_budget: Seconds per decision (None for no limit)
+        max_rollouts: Most rollouts per worker
+        pool_factory: Returns the process pool for a worker count
+
+    Returns:
+        The merged search result
+    """
+
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+
+    def task(worker: int) -> tuple:
+        worker_seed = int(stream_seed(seed, worker).generate_state(1, np.uint64)[0])
+        return (snapshot, player_index, stage, list(moves), worker_seed, deadline, max_rollouts)
+
+    pending = []
+    if workers > 1:
+        pool = pool_factory(workers - 1)
+        pending = [pool.apply_async(search_root, (task(w),)) for w in range(1, workers)]
+
+    merged = [search_root(task(0))]
+    grace_end = time.monotonic() + WORKER_GRACE
+    for result in pending:
+        timeout = None if deadline is None else max(0.0, grace_end - time.monotonic())
+        try:
+            merged.append(result.get(timeout))
+        except multiprocessing.TimeoutError:
+            # Late worker: its rollouts are simply not merged
+            continue
+
+    visits = [sum(stats.visits[i] for stats in merged) for i in range(len(moves))]
+    rewards = [sum(stats.rewards[i] for stats in merged) for i in range(len(moves))]
+    values = [total / count if count else 0.0 for total, count in zip(rewards, visits)]
+    return MCTSResult(visits, values, sum(visits), len(merged))
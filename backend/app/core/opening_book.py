@@ -0,0 +1,178 @@
+"""
+Opening book for the first marks of a game.
+
+Early white-sum decisions (which row to open, or whether to wait) are looked
+up instead of scored: the book is built offline by
+app.tools.build_opening_book from self-play rollouts and memory-mapped
+read-only, like the row value table.
+
+A position is in the book while the player has fewer than BOOK_MARKS marks,
+no penalties and no closed rows. It is keyed by the player's row masks, the
+white sum, whether the player is rolling and the number of players. Each
+record holds the mean self-play reward of every action: skipping, or marking
+the white sum in each row.
+
+File layout (little endian):
+    header   magic b"QXOB", version (uint16), book marks (uint16),
+             records (uint32), padded to HEADER_SIZE bytes
+    records  sorted by key: key (uint64), values float16[ACTIONS]
+             (skip, then each row in ROW_COLORS order; NaN if illegal)
+"""
+
+import os
+import struct
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from .expectimax import CLOSED, NUM_ROWS, PENALTIES, SearchState
+from .row_table import ROW_LENGTH
+
+MAGIC = b"QXOB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+HEADER_SIZE = 16
+
+# Positions with fewer marks than this are in the book
+BOOK_MARKS = 2
+
+# Action index of skipping; marking row i is action i + 1
+SKIP = 0
+ACTIONS = 1 + NUM_ROWS
+
+RECORD = np.dtype([("key", "<u8"), ("values", "<f2", (ACTIONS,))])
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "opening_book.bin")
+
+# Set QWIXX_OPENING_BOOK to load another book
+OPENING_BOOK_PATH = os.environ.get("QWIXX_OPENING_BOOK", DEFAULT_PATH)
+
+
+def book_key(
+    state: SearchState, white_sum: int, rolling: bool, num_players: int
+) -> Optional[int]:
+    """
+    Key of a white-sum decision in the book.
+
+    Args:
+        state: The deciding player's search state
+        white_sum: Sum of the white dice
+        rolling: Whether the deciding player rolled the dice
+        num_players: Number of players in the game
+
+    Returns:
+        The key, or None if the position is past the opening
+    """
+    if state[PENALTIES] or state[CLOSED]:
+        return None
+    key = 0
+    marks = 0
+    for row in range(NUM_ROWS):
+        key |= state[row] << (row * ROW_LENGTH)
+        marks += state[row].bit_count()
+    if marks >= BOOK_MARKS:
+        return None
+    key |= white_sum << (NUM_ROWS * ROW_LENGTH)
+    key |= int(rolling) << (NUM_ROWS * ROW_LENGTH + 4)
+    return key | num_players << (NUM_ROWS * ROW_LENGTH + 5)
+
+
+class OpeningBook:
+    """Action values of opening positions, looked up by book key."""
+
+    def __init__(self, records: np.ndarray):
+        """
+        Initialize a book.
+
+        Args:
+            records: RECORD array sorted by key
+        """
+        self.records = records
+        self.keys = records["key"]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def lookup(self, key: int) -> Optional[np.ndarray]:
+        """
+        Look up a position.
+
+        Args:
+            key: Key from book_key()
+
+        Returns:
+            The value of each action (NaN if illegal), or None if the
+            position is not in the book
+        """
+        index = int(np.searchsorted(self.keys, np.uint64(key)))
+        if index == len(self.keys) or self.keys[index] != key:
+            return None
+        return self.records["values"][index]
+
+
+def write_opening_book(path: str, records: np.ndarray) -> None:
+    """
+    Write an opening book.
+
+    Args:
+        path: Destination file
+        records: RECORD array (sorted here by key)
+    """
+    records = np.sort(np.asarray(records, dtype=RECORD), order="key")
+    if len(np.unique(records["key"])) != len(records):
+        raise ValueError("Opening book keys must be unique")
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, BOOK_MARKS, len(records))
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(records.tobytes())
+
+
+def read_opening_book(path: str) -> OpeningBook:
+    """
+    Memory-map an opening book.
+
+    Args:
+        path: File written by write_opening_book()
+
+    Returns:
+        The book (backed by a read-only memory map)
+
+    Raises:
+        ValueError: If the file is not an opening book of this version
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is too short to be an opening book")
+
+    magic, version, book_marks, count = HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an opening book")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has book version {version}, expected {FORMAT_VERSION}")
+    if book_marks != BOOK_MARKS:
+        raise ValueError(f"{path} covers {book_marks} marks, expected {BOOK_MARKS}")
+
+    if count == 0:
+        return OpeningBook(np.zeros(0, dtype=RECORD))
+    records = np.memmap(path, dtype=RECORD, mode="r", offset=HEADER_SIZE, shape=(count,))
+    return OpeningBook(records)
+
+
+@lru_cache(maxsize=None)
+def load_opening_book(path: Optional[str] = None) -> Optional[OpeningBook]:
+    """
+    Load the opening book once per process.
+
+    Args:
+        path: Book file (defaults to OPENING_BOOK_PATH)
+
+    Returns:
+        The book, or None if the file does not exist
+    """
+    path = path or OPENING_BOOK_PATH
+    if not os.path.exists(path):
+        return None
+    return read_opening_book(path)
@@ -0,0 +1,111 @@
+"""
+Joint planning of the rolling player's marks for one roll.
+
+On their own roll a player may mark the white sum in stage 1 and a white +
+colored sum in stage 2. Deciding the stages one after the other is greedy:
+a white mark can block a better colored mark in the same row, and a weak
+white mark may be taken although a colored mark alone would have avoided
+the penalty. The planner enumerates every (white, colored) pair once per
+roll, keeps the legal sequences and picks the best one.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .die import DieColor
+from .evaluator import COLOR_INDEX
+from .expectimax import SearchState, mark
+
+# (color, number) to mark
+Move = Tuple[DieColor, int]
+
+
+class TurnPlan(NamedTuple):
+    """
+    Marks planned for both stages of a roll.
+
+    Attributes:
+        white: Stage 1 mark, or None to skip it
+        colored: Stage 2 mark, or None to skip it
+        score: Total score of the planned marks
+    """
+
+    white: Optional[Move]
+    colored: Optional[Move]
+    score: float
+
+
+def joint_actions(
+    state: SearchState,
+    white_moves: Sequence[Move],
+    colored_moves: Sequence[Move],
+) -> List[Tuple[Optional[Move], Optional[Move]]]:
+    """
+    Enumerate the legal (white, colored) sequences of a roll.
+
+    Args:
+        state: The rolling player's search state before the roll
+        white_moves: Legal stage 1 marks
+        colored_moves: White + colored sums of the roll (legal now or once
+            the white mark is made)
+
+    Returns:
+        Every legal pair, including skipping either or both stages
+    """
+    actions: List[Tuple[Optional[Move], Optional[Move]]] = [(None, None)]
+    after_white = [(None, state)]
+    for color, number in white_moves:
+        marked = mark(state, COLOR_INDEX[color], number)
+        if marked is not None:
+            actions.append(((color, number), None))
+            after_white.append(((color, number), marked))
+
+    for white, white_state in after_white:
+        for color, number in colored_moves:
+            if mark(white_state, COLOR_INDEX[color], number) is not None:
+                actions.append((white, (color, number)))
+    return actions
+
+
+def plan_turn(
+    state: SearchState,
+    white_scores: Dict[Move, float],
+    colored_scores: Dict[Move, float],
+    white_threshold: float,
+    colored_threshold: float,
+) -> TurnPlan:
+    """
+    Pick the best sequence of marks for a roll.
+
+    A mark scoring below its stage's skip threshold is never worth making,
+    so sequences containing one are dominated by the same sequence without
+    it and are dropped. Among the rest the highest total wins; a single
+    mark always beats skipping both stages, which costs a penalty.
+
+    Args:
+        state: The rolling player's search state before the roll
+        white_scores: Score of each legal stage 1 mark
+        colored_scores: Score of each white + colored sum of the roll
+        white_threshold: Stage 1 skip threshold
+        colored_threshold: Stage 2 skip threshold
+
+    Returns:
+        The plan (both marks None if no mark clears its threshold)
+    """
+    white_moves = [move for move, score in white_scores.items() if score >= white_threshold]
+    colored_moves = [
+        move for move, score in colored_scores.items() if score >= colored_threshold
+    ]
+
+    best = TurnPlan(None, None, float("-inf"))
+    for white, colored in joint_actions(state, white_moves, colored_moves):
+        if white is None and colored is None:
+            continue
+        score = (white_scores[white] if white else 0.0) + (
+            colored_scores[colored] if colored else 0.0
+        )
+        if score > best.score:
+            best = TurnPlan(white, colored, score)
+
+    if best.score == float("-inf"):
+        return TurnPlan(None, None, 0.0)
+    return best
@@ -0,0 +1,88 @@
+"""
+Random number streams for reproducible games and parallel simulations.
+"""
+
+import random
+from typing import List, Union
+
+import numpy as np
+
+# Anything accepted where a game or dice roller takes a seed
+SeedLike = Union[None, int, np.random.SeedSequence, np.random.Generator]
+
+
+def make_generator(seed: SeedLike = None) -> np.random.Generator:
+    """
+    Create a NumPy generator from a seed, or pass an existing generator through.
+
+    Args:
+        seed: None for OS entropy, an int, a SeedSequence or a Generator
+
+    Returns:
+        A NumPy random generator
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def spawn_generators(seed: SeedLike, n: int) -> List[np.random.Generator]:
+    """
+    Create n statistically independent generators from one seed.
+
+    Args:
+        seed: None for OS entropy, an int, a SeedSequence or a Generator
+        n: Number of generators
+
+    Returns:
+        List of independent generators
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed.spawn(n)
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed.spawn(n)]
+
+
+def stream_seed(root_seed: int, index: int) -> np.random.SeedSequence:
+    """
+    Get the seed of the index-th independent substream of a root seed.
+
+    The result only depends on (root_seed, index), so work split across any
+    number of worker processes is reproducible bit for bit.
+
+    Args:
+        root_seed: Seed of the whole run
+        index: Substream index (e.g. the game number)
+
+    Returns:
+        SeedSequence for the substream
+    """
+    return np.random.SeedSequence(root_seed, spawn_key=(index,))
+
+
+def jumped_generator(root_seed: int, jumps: int) -> np.random.Generator:
+    """
+    Create a PCG64 generator advanced by jumps * 2**127 draws.
+
+    Args:
+        root_seed: Seed of the whole run
+        jumps: Number of jumps (e.g. the worker index)
+
+    Returns:
+        Generator for a non-overlapping block of the root stream
+    """
+    return np.random.Generator(np.random.PCG64(root_seed).jumped(jumps))
+
+
+def python_random(generator: np.random.Generator) -> random.Random:
+    """
+    Derive a standard library Random from a NumPy generator.
+
+    Args:
+        generator: Generator to draw the seed from
+
+    Returns:
+        A seeded random.Random instance
+    """
+    return random.Random(int(generator.integers(2**63)))
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Precomputed marking tables for a single Qwixx row.
+
+A row state is the bitmask of marked positions (bit ``i`` is the i-th
+number from the left). The marking rules are the same for every row and
+every game, so they are evaluated once at import time for all 2048 states.
+"""
+
+from typing import List, Tuple
+
+ROW_LENGTH = 11
+LAST_POSITION = ROW_LENGTH - 1
+NUM_ROW_STATES = 1 << ROW_LENGTH
+MARKS_NEEDED_FOR_LAST = 5  # Marks required before the rightmost number
+
+
+def _build_tables() -> Tuple[List[int], List[Tuple[int, ...]]]:
+    """
+    Build the transition and legal-position tables.
+
+    Returns:
+        Tuple of (next_state, legal_positions) where next_state is indexed by
+        ``mask * ROW_LENGTH + position`` and holds the resulting mask, or -1
+        if the mark is illegal
+    """
+    next_state = [-1] * (NUM_ROW_STATES * ROW_LENGTH)
+    legal_positions = []
+
+    for mask in range(NUM_ROW_STATES):
+        enough_marks = mask.bit_count() >= MARKS_NEEDED_FOR_LAST
+        legal = []
+        for position in range(ROW_LENGTH):
+            # Nothing may be marked at or to the right of this position
+            if mask >> position:
+                continue
+            if position == LAST_POSITION and not enough_marks:
+                continue
+            next_state[mask * ROW_LENGTH + position] = mask | (1 << position)
+            legal.append(position)
+        legal_positions.append(tuple(legal))
+
+    return next_state, legal_positions
+
+
+# Resulting mask for (mask, position), or -1 when the mark is illegal
+NEXT_STATE, LEGAL_POSITIONS = _build_tables()
+
+
+def can_mark_position(mask: int, position: int) -> bool:
+    """
+    Check whether a position can be marked in a row with the given mask.
+
+    Args:
+        mask: Bitmask of marked positions
+        position: Position to mark (0-10)
+
+    Returns:
+        True if the mark is legal, False otherwise
+    """
+    return NEXT_STATE[mask * ROW_LENGTH + position] >= 0
\ No newline at end of file
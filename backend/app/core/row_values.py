@@ -0,0 +1,169 @@
+"""
+Precomputed value of every single-row state.
+
+The table is produced offline by app.tools.solve_row_values and memory-mapped
+read-only, so every worker process shares the same pages. It holds, for each
+player count, the expected final points of a row in every (lock, mask) state.
+
+File layout (little endian):
+    header  magic b"QXRV", version (uint16), min players (uint16),
+            max players (uint16), row states (uint16), hazard (float64),
+            padded to HEADER_SIZE bytes
+    values  float32[max - min + 1][2][row states], indexed by
+            (players - min, locked, mask)
+"""
+
+import os
+import struct
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .row_table import LAST_POSITION, NEXT_STATE, NUM_ROW_STATES, ROW_LENGTH
+
+MAGIC = b"QXRV"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHHHd")
+HEADER_SIZE = 32
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "row_values.bin")
+
+# Set QWIXX_ROW_VALUES to load another table
+ROW_VALUES_PATH = os.environ.get("QWIXX_ROW_VALUES", DEFAULT_PATH)
+
+
+class RowValueTable:
+    """Expected final row points by player count, lock flag and row mask."""
+
+    def __init__(self, values: np.ndarray, min_players: int, hazard: float):
+        """
+        Initialize a table.
+
+        Args:
+            values: Array of shape (player counts, 2, NUM_ROW_STATES)
+            min_players: Player count of the first table
+            hazard: Per-roll chance of the game ending the table was solved with
+        """
+        self.values = values
+        self.min_players = min_players
+        self.max_players = min_players + len(values) - 1
+        self.hazard = hazard
+
+    def for_players(self, num_players: int) -> np.ndarray:
+        """
+        Get the table for a player count (clamped to the solved range).
+
+        Args:
+            num_players: Number of players in the game
+
+        Returns:
+            Array of shape (2, NUM_ROW_STATES) indexed by (locked, mask)
+        """
+        num_players = min(max(num_players, self.min_players), self.max_players)
+        return self.values[num_players - self.min_players]
+
+
+def write_row_values(path: str, values: np.ndarray, min_players: int, hazard: float) -> None:
+    """
+    Write a row value table.
+
+    Args:
+        path: Destination file
+        values: Array of shape (player counts, 2, NUM_ROW_STATES)
+        min_players: Player count of the first table
+        hazard: Per-roll chance of the game ending the table was solved with
+    """
+    values = np.ascontiguousarray(values, dtype="<f4")
+    if values.shape[1:] != (2, NUM_ROW_STATES):
+        raise ValueError(f"Unexpected row value table shape {values.shape}")
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        min_players,
+        min_players + len(values) - 1,
+        NUM_ROW_STATES,
+        hazard,
+    )
+    with open(path, "wb") as f:
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(values.tobytes())
+
+
+def read_row_values(path: str) -> RowValueTable:
+    """
+    Memory-map a row value table.
+
+    Args:
+        path: File written by write_row_values()
+
+    Returns:
+        The table (backed by a read-only memory map)
+
+    Raises:
+        ValueError: If the file is not a row value table of this version
+    """
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is too short to be a row value table")
+
+    magic, version, min_players, max_players, row_states, hazard = HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a row value table")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has table version {version}, expected {FORMAT_VERSION}")
+    if row_states != NUM_ROW_STATES or max_players < min_players:
+        raise ValueError(f"{path} has an unexpected layout")
+
+    values = np.memmap(
+        path,
+        dtype="<f4",
+        mode="r",
+        offset=HEADER_SIZE,
+        shape=(max_players - min_players + 1, 2, NUM_ROW_STATES),
+    )
+    return RowValueTable(values, min_players, hazard)
+
+
+@lru_cache(maxsize=None)
+def load_row_values(path: Optional[str] = None) -> Optional[RowValueTable]:
+    """
+    Load the row value table once per process.
+
+    Args:
+        path: Table file (defaults to ROW_VALUES_PATH)
+
+    Returns:
+        The table, or None if the file does not exist
+    """
+    path = path or ROW_VALUES_PATH
+    if not os.path.exists(path):
+        return None
+    return read_row_values(path)
+
+
+def mark_deltas(open_values: Sequence[float]) -> np.ndarray:
+    """
+    Tabulate how much marking each position changes a row's value.
+
+    Marking the rightmost position locks the row, which is then worth its
+    points (lock included) rather than its open value.
+
+    Args:
+        open_values: Value of each open row state, e.g. for_players(n)[0]
+
+    Returns:
+        Array of shape (NUM_ROW_STATES, ROW_LENGTH) indexed by (mask,
+        position); 0 where the mark is illegal
+    """
+    open_values = np.asarray(open_values, dtype=float)
+    next_state = np.array(NEXT_STATE).reshape(NUM_ROW_STATES, ROW_LENGTH)
+    legal = next_state >= 0
+    marks = np.array([mask.bit_count() for mask in range(NUM_ROW_STATES)])
+
+    after = open_values[np.where(legal, next_state, 0)]
+    locked_marks = marks[next_state[:, LAST_POSITION]] + 1
+    after[:, LAST_POSITION] = locked_marks * (locked_marks + 1) / 2
+    return np.where(legal, after - open_values[:, None], 0.0)
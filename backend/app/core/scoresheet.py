@@ -2,202 +2,297 @@
 Scoresheet class for the Qwixx game.
 """
 
-from typing import Dict, List, Optional, Set
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from .die import DieColor
+from .row_table import (
+    LAST_POSITION,
+    LEGAL_POSITIONS,
+    MARKS_NEEDED_FOR_LAST,
+    NEXT_STATE,
+    ROW_LENGTH,
+)
+
+# Numbers printed on each row, left to right
+ASCENDING_NUMBERS: Tuple[int, ...] = tuple(range(2, 13))   # 2-12 (red/yellow)
+DESCENDING_NUMBERS: Tuple[int, ...] = tuple(range(12, 1, -1))  # 12-2 (green/blue)
+
+# Packed layout: 12 bits per row (11 position bits + lock flag), then penalties
+ROW_BITS = 12
+LOCK_BIT = 1 << 11
+PENALTY_SHIFT = ROW_BITS * 4
+
+PENALTY_POINTS = 5  # Each penalty is worth -5 points
+
+# Set QWIXX_VERIFY_SCORES=1 to check cached scores against a full recompute
+VERIFY_SCORES = os.environ.get("QWIXX_VERIFY_SCORES", "") not in ("", "0")
+
+
+@lru_cache(maxsize=None)
+def _position_lookup(numbers: Tuple[int, ...]) -> Dict[int, int]:
+    """Map each number in a row to its position (shared between rows)."""
+    return {number: position for position, number in enumerate(numbers)}
+
 
 class ColorRow:
-    """Represents a single colored row on the scoresheet."""
-    
-    def __init__(self, color: DieColor, numbers: List[int]):
+    """
+    Represents a single colored row on the scoresheet.
+
+    Marks are kept in an integer bitmask where bit ``i`` is set when
+    ``numbers[i]`` is marked. Legality checks are lookups into the
+    precomputed tables in row_table.
+    """
+
+    __slots__ = ("color", "numbers", "mask", "is_locked", "_positions")
+
+    def __init__(self, color: DieColor, numbers: Sequence[int]):
         """
         Initialize a color row.
-        
+
         Args:
             color: The color of this row
             numbers: List of numbers in this row (e.g., [2,3,4,5,6,7,8,9,10,11,12] for red/yellow)
         """
         self.color = color
         self.numbers = numbers
-        self.marked: Set[int] = set()
+        self.mask = 0  # Bit i set when numbers[i] is marked
         self.is_locked = False
-        self.rightmost_marked = -1  # Track the rightmost marked position for validation
-    
+        self._positions = _position_lookup(tuple(numbers))
+
+    @property
+    def marked(self) -> Set[int]:
+        """Set of marked numbers (a fresh copy built from the bitmask)."""
+        mask = self.mask
+        return {number for i, number in enumerate(self.numbers) if mask >> i & 1}
+
+    @property
+    def mark_count(self) -> int:
+        """Number of marked numbers in this row."""
+        return self.mask.bit_count()
+
+    @property
+    def rightmost_marked(self) -> int:
+        """Position of the rightmost marked number, or -1 if none is marked."""
+        return self.mask.bit_length() - 1
+
     def can_mark(self, number: int) -> bool:
         """
         Check if a number can be marked in this row.
-        
+
         Args:
             number: The number to check
-            
+
         Returns:
             True if the number can be marked, False otherwise
         """
-        if self.is_locked or number in self.marked or number not in self.numbers:
+        if self.is_locked:
             return False
-        
-        # Check if marking the rightmost number (12 for red/yellow, 2 for green/blue)
-        # Rule: Can only mark the rightmost number if at least 5 numbers are ALREADY marked
-        if number == self.numbers[-1]:
-            if len(self.marked) < 5:
-                return False
-        
-        # Find the position of this number
-        try:
-            position = self.numbers.index(number)
-        except ValueError:
+
+        position = self._positions.get(number)
+        if position is None:
             return False
-        
-        # Can only mark if it's to the right of or at the rightmost marked position
-        return position >= self.rightmost_marked
-    
+
+        # The table encodes both rules: only mark to the right of every marked
+        # position, and the rightmost number needs 5 marks ALREADY made
+        return NEXT_STATE[self.mask * ROW_LENGTH + position] >= 0
+
     def mark_number(self, number: int) -> bool:
         """
         Mark a number in this row.
-        
+
         Args:
             number: The number to mark
-            
+
         Returns:
             True if successfully marked, False otherwise
         """
-        if not self.can_mark(number):
+        if self.is_locked:
+            return False
+
+        position = self._positions.get(number)
+        if position is None:
+            return False
+
+        next_mask = NEXT_STATE[self.mask * ROW_LENGTH + position]
+        if next_mask < 0:
             return False
-        
-        self.marked.add(number)
-        position = self.numbers.index(number)
-        self.rightmost_marked = max(self.rightmost_marked, position)
-        
+
+        self.mask = next_mask
         return True
-    
+
     def can_lock(self) -> bool:
         """
         Check if this row can be locked.
         A row can be locked if:
         1. At least 5 numbers are marked
         2. The rightmost number (12 for red/yellow, 2 for green/blue) is marked
-        
+
         Returns:
             True if the row can be locked, False otherwise
         """
-        if len(self.marked) < 5:
-            # This check is technically redundant if can_mark enforces it,
-            # but good for safety. Note: if the rightmost is marked,
-            # we must have had >=5 marks before that, so marked count is >= 6 now.
+        # Note: if the rightmost is marked, we must have had >=5 marks before
+        # that, so the count check is only a safety net.
+        if self.mask.bit_count() < MARKS_NEEDED_FOR_LAST:
             return False
-        
+
         # Check if the rightmost number is marked
-        rightmost_number = self.numbers[-1]
-        return rightmost_number in self.marked
-    
+        return bool(self.mask >> LAST_POSITION & 1)
+
     def lock_row(self) -> bool:
         """
         Lock this row if possible.
-        
+
         Returns:
             True if successfully locked, False otherwise
         """
         if not self.can_lock():
             return False
-        
+
         self.is_locked = True
         return True
-    
+
     def get_score(self) -> int:
         """
         Calculate the score for this row.
         Score is based on the number of marked numbers:
         1 mark = 1 point, 2 marks = 3 points, 3 marks = 6 points, etc.
         Formula: n * (n + 1) / 2
-        
+
         Rule: If the row is locked, count one extra mark for the lock itself.
-        
+
         Returns:
             The score for this row
         """
-        n = len(self.marked)
-        if self.is_locked:
-            n += 1
-            
+        n = self.mask.bit_count() + self.is_locked
         return n * (n + 1) // 2
 
+    def pack(self) -> int:
+        """
+        Pack this row into a 12-bit integer (position bits plus lock flag).
+
+        Returns:
+            The packed row
+        """
+        return self.mask | (LOCK_BIT if self.is_locked else 0)
+
+    def load(self, packed: int) -> None:
+        """
+        Restore this row from a value produced by pack().
+
+        Args:
+            packed: The packed row
+        """
+        self.mask = packed & (LOCK_BIT - 1)
+        self.is_locked = bool(packed & LOCK_BIT)
+
 class Scoresheet:
-    """Represents a player's scoresheet in Qwixx."""
-    
-    def __init__(self):
-        """Initialize a new scoresheet."""
+    """
+    Represents a player's scoresheet in Qwixx.
+
+    Row scores and their sum are updated on every mark and lock, so reading
+    the total score does not rescan the rows.
+    """
+
+    __slots__ = (
+        "rows",
+        "penalties",
+        "max_penalties",
+        "row_scores",
+        "_row_score_total",
+        "verify_scores",
+    )
+
+    def __init__(self, verify_scores: Optional[bool] = None):
+        """
+        Initialize a new scoresheet.
+
+        Args:
+            verify_scores: Check the cached score against a full recompute on
+                every read (defaults to the QWIXX_VERIFY_SCORES setting)
+        """
         # Create the four colored rows
         self.rows: Dict[DieColor, ColorRow] = {
-            DieColor.RED: ColorRow(DieColor.RED, list(range(2, 13))),      # 2-12
-            DieColor.YELLOW: ColorRow(DieColor.YELLOW, list(range(2, 13))), # 2-12
-            DieColor.GREEN: ColorRow(DieColor.GREEN, list(range(12, 1, -1))), # 12-2
-            DieColor.BLUE: ColorRow(DieColor.BLUE, list(range(12, 1, -1)))   # 12-2
+            DieColor.RED: ColorRow(DieColor.RED, ASCENDING_NUMBERS),      # 2-12
+            DieColor.YELLOW: ColorRow(DieColor.YELLOW, ASCENDING_NUMBERS), # 2-12
+            DieColor.GREEN: ColorRow(DieColor.GREEN, DESCENDING_NUMBERS), # 12-2
+            DieColor.BLUE: ColorRow(DieColor.BLUE, DESCENDING_NUMBERS)   # 12-2
         }
-        
+
         self.penalties = 0
         self.max_penalties = 4
-    
+
+        self.row_scores: Dict[DieColor, int] = {color: 0 for color in self.rows}
+        self._row_score_total = 0
+        self.verify_scores = VERIFY_SCORES if verify_scores is None else verify_scores
+
     def can_mark_number(self, color: DieColor, number: int) -> bool:
         """
         Check if a number can be marked in the specified color row.
-        
+
         Args:
             color: The color row to check
             number: The number to mark
-            
+
         Returns:
             True if the number can be marked, False otherwise
         """
-        if color not in self.rows:
+        row = self.rows.get(color)
+        if row is None:
             return False
-        return self.rows[color].can_mark(number)
-    
+        return row.can_mark(number)
+
     def mark_number(self, color: DieColor, number: int) -> bool:
         """
         Mark a number in the specified color row.
-        
+
         Args:
             color: The color row to mark in
             number: The number to mark
-            
+
         Returns:
             True if successfully marked, False otherwise
         """
-        if color not in self.rows:
+        row = self.rows.get(color)
+        if row is None or not row.mark_number(number):
             return False
-        return self.rows[color].mark_number(number)
-    
+        self._update_row_score(color, row)
+        return True
+
     def can_lock_row(self, color: DieColor) -> bool:
         """
         Check if a row can be locked.
-        
+
         Args:
             color: The color row to check
-            
+
         Returns:
             True if the row can be locked, False otherwise
         """
         if color not in self.rows:
             return False
         return self.rows[color].can_lock()
-    
+
     def lock_row(self, color: DieColor) -> bool:
         """
         Lock a row if possible.
-        
+
         Args:
             color: The color row to lock
-            
+
         Returns:
             True if successfully locked, False otherwise
         """
-        if color not in self.rows:
+        row = self.rows.get(color)
+        if row is None or not row.lock_row():
             return False
-        return self.rows[color].lock_row()
-    
+        self._update_row_score(color, row)
+        return True
+
     def add_penalty(self) -> bool:
         """
         Add a penalty mark.
-        
+
         Returns:
             True if penalty added, False if already at maximum penalties
         """
@@ -205,55 +300,111 @@ class Scoresheet:
             self.penalties += 1
             return True
         return False
-    
+
     def get_locked_rows_count(self) -> int:
         """
         Get the number of locked rows.
-        
+
         Returns:
             Number of locked rows
         """
         return sum(1 for row in self.rows.values() if row.is_locked)
-    
+
     def is_game_over(self) -> bool:
         """
         Check if the game is over for this player.
         Game is over if player has 4 penalties or 2 rows are locked.
-        
+
         Returns:
             True if game is over, False otherwise
         """
         return self.penalties >= self.max_penalties or self.get_locked_rows_count() >= 2
-    
+
     def calculate_total_score(self) -> int:
         """
-        Calculate the total score for this scoresheet.
-        
+        Get the total score for this scoresheet from the cached row scores.
+
+        Returns:
+            Total score (sum of all row scores minus penalty points)
+        """
+        total = self._row_score_total - self.penalties * PENALTY_POINTS
+        if self.verify_scores:
+            expected = self.recalculate_total_score()
+            if total != expected:
+                raise AssertionError(
+                    f"Cached score {total} does not match recomputed score {expected}"
+                )
+        return total
+
+    def recalculate_total_score(self) -> int:
+        """
+        Calculate the total score by rescanning every row.
+
         Returns:
             Total score (sum of all row scores minus penalty points)
         """
         row_scores = sum(row.get_score() for row in self.rows.values())
-        penalty_score = self.penalties * 5  # Each penalty is worth -5 points
+        penalty_score = self.penalties * PENALTY_POINTS
         return row_scores - penalty_score
-    
+
+    def refresh_scores(self) -> None:
+        """Rebuild the cached row scores after rows were changed directly."""
+        for color, row in self.rows.items():
+            self.row_scores[color] = row.get_score()
+        self._row_score_total = sum(self.row_scores.values())
+
+    def _update_row_score(self, color: DieColor, row: ColorRow) -> None:
+        """Apply the score change of a single row to the cached totals."""
+        score = row.get_score()
+        self._row_score_total += score - self.row_scores[color]
+        self.row_scores[color] = score
+
     def get_available_numbers(self, color: DieColor) -> List[int]:
         """
         Get the list of numbers that can still be marked in a color row.
-        
+
         Args:
             color: The color row to check
-            
+
         Returns:
             List of available numbers
         """
         if color not in self.rows or self.rows[color].is_locked:
             return []
-        
+
         row = self.rows[color]
-        available = []
-        
-        for i, number in enumerate(row.numbers):
-            if i >= row.rightmost_marked and number not in row.marked:
-                available.append(number)
-        
-        return available
\ No newline at end of file
+        numbers = row.numbers
+        return [numbers[position] for position in LEGAL_POSITIONS[row.mask]]
+
+    def pack(self) -> int:
+        """
+        Pack the whole scoresheet into a single integer.
+
+        Each row takes 12 bits (in red, yellow, green, blue order) and the
+        penalty count sits in the bits above them.
+
+        Returns:
+            The packed scoresheet
+        """
+        packed = self.penalties << PENALTY_SHIFT
+        for i, row in enumerate(self.rows.values()):
+            packed |= row.pack() << (i * ROW_BITS)
+        return packed
+
+    @classmethod
+    def unpack(cls, packed: int) -> "Scoresheet":
+        """
+        Build a scoresheet from a value produced by pack().
+
+        Args:
+            packed: The packed scoresheet
+
+        Returns:
+            The restored scoresheet
+        """
+        scoresheet = cls()
+        for i, row in enumerate(scoresheet.rows.values()):
+            row.load(packed >> (i * ROW_BITS) & ((1 << ROW_BITS) - 1))
+        scoresheet.penalties = packed >> PENALTY_SHIFT
+        scoresheet.refresh_scores()
+        return scoresheet
\ No newline at end of file
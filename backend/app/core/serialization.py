@@ -0,0 +1,362 @@
+"""
+Compact binary encoding of games.
+
+Pickling a Game drags along its players, rows, dice and logger; a position
+is really a few dozen small integers. The codec writes them into one
+little-endian bit stream behind a format version byte:
+
+* each scoresheet as Scoresheet.pack() (12 bits per row, lock flag
+  included, then the penalty count), with the player's move counts this turn;
+* the rolling player, the game state and the six dice (3 bits each);
+* the locked colors and the finished players as bitmasks;
+* the stage flags of the turn.
+
+encode_snapshot() covers a GameSnapshot; encode_game() adds the game's setup
+(players and difficulties) and the rest of its turn state, so decode_game()
+rebuilds a playable game. A 2-player game takes under 25 bytes.
+
+checkpoint() encodes a game and restarts its action log, and replay_game()
+rebuilds the game from the last checkpoint plus the actions logged since.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+from .action_log import ActionKind, ActionLog
+from .ai_player import DIFFICULTIES
+from .dice_roller import DICE_ORDER
+from .evaluator import COLOR_INDEX, ROW_COLORS
+from .game import Game, GameSnapshot
+from .game_state import GameState
+from .player import Player
+from .scoresheet import PENALTY_SHIFT
+
+# Version byte of the format; bump it whenever the layout changes
+CODEC_VERSION = 1
+
+# AI difficulties (in the order of DIFFICULTIES), by their index in the stream
+DIFFICULTY_INDEX = {difficulty: index for index, difficulty in enumerate(DIFFICULTIES)}
+
+# Game states, by their index in the stream
+STATES: Tuple[GameState, ...] = tuple(GameState)
+STATE_INDEX = {state: index for index, state in enumerate(STATES)}
+
+# Field widths in bits
+SEAT_BITS = 4
+DIFFICULTY_BITS = 3
+STATE_BITS = (len(STATES) - 1).bit_length()
+SCORESHEET_BITS = PENALTY_SHIFT + 3
+TURN_MOVE_BITS = 2
+DIE_BITS = 3
+
+MAX_PENALTIES = 4
+
+
+class _BitWriter:
+    """Appends fixed-width unsigned fields to a bit stream."""
+
+    __slots__ = ("value", "size")
+
+    def __init__(self):
+        self.value = 0
+        self.size = 0
+
+    def write(self, value: int, bits: int) -> None:
+        """Append value in bits bits; ValueError if it does not fit."""
+        if not 0 <= value < 1 << bits:
+            raise ValueError(f"{value} does not fit in {bits} bits")
+        self.value |= value << self.size
+        self.size += bits
+
+    def to_bytes(self) -> bytes:
+        """The version byte and the stream, padded to whole bytes."""
+        return bytes((CODEC_VERSION,)) + self.value.to_bytes((self.size + 7) // 8, "little")
+
+
+class _BitReader:
+    """Reads back the fields of a _BitWriter stream."""
+
+    __slots__ = ("value", "size", "position")
+
+    def __init__(self, data: bytes):
+        if not data:
+            raise ValueError("Empty game data")
+        if data[0] != CODEC_VERSION:
+            raise ValueError(f"Unsupported game format {data[0]}")
+        self.value = int.from_bytes(data[1:], "little")
+        self.size = 8 * (len(data) - 1)
+        self.position = 0
+
+    def read(self, bits: int) -> int:
+        """Read the next bits-bit field; ValueError past the end."""
+        if self.position + bits > self.size:
+            raise ValueError("Truncated game data")
+        value = self.value >> self.position & ((1 << bits) - 1)
+        self.position += bits
+        return value
+
+    def read_flag(self) -> bool:
+        """Read the next 1-bit field."""
+        return bool(self.read(1))
+
+    def finish(self) -> None:
+        """Check that only zero padding is left."""
+        if self.size - self.position >= 8 or self.value >> self.position:
+            raise ValueError("Trailing game data")
+
+
+def _mask(indexes: Iterable[int]) -> int:
+    """Bitmask with the given bits set."""
+    mask = 0
+    for index in indexes:
+        mask |= 1 << index
+    return mask
+
+
+def _indexes(mask: int) -> Tuple[int, ...]:
+    """Set bits of a bitmask, lowest first."""
+    return tuple(index for index in range(mask.bit_length()) if mask >> index & 1)
+
+
+def _difficulty(index: int) -> str:
+    """Difficulty at a stream index; ValueError if there is none."""
+    if index >= len(DIFFICULTIES):
+        raise ValueError(f"Unknown difficulty index {index}")
+    return DIFFICULTIES[index]
+
+
+def _difficulty_index(difficulty: str) -> int:
+    """Stream index of a difficulty; ValueError if it has none."""
+    try:
+        return DIFFICULTY_INDEX[difficulty]
+    except KeyError:
+        raise ValueError(f"Unknown difficulty: {difficulty}") from None
+
+
+def _write_position(writer: _BitWriter, snapshot: GameSnapshot) -> None:
+    """Append a snapshot's fields."""
+    seats = len(snapshot.scoresheets)
+    writer.write(seats, SEAT_BITS)
+    for packed, (white_moves, colored_moves) in zip(snapshot.scoresheets, snapshot.turn_moves):
+        writer.write(packed, SCORESHEET_BITS)
+        writer.write(white_moves, TURN_MOVE_BITS)
+        writer.write(colored_moves, TURN_MOVE_BITS)
+    writer.write(snapshot.current_player_index, SEAT_BITS)
+    writer.write(STATE_INDEX[snapshot.state], STATE_BITS)
+    writer.write(snapshot.dice is not None, 1)
+    if snapshot.dice is not None:
+        for value in snapshot.dice:
+            writer.write(value - 1, DIE_BITS)
+    writer.write(_mask(COLOR_INDEX[color] for color in snapshot.locked_colors), len(ROW_COLORS))
+    writer.write(_mask(snapshot.stage_1_players_finished), seats)
+    writer.write(snapshot.rolling_player_made_stage_1_move, 1)
+    writer.write(snapshot.rolling_player_made_stage_2_move, 1)
+
+
+def _read_position(reader: _BitReader) -> GameSnapshot:
+    """Read back the fields _write_position() appended."""
+    seats = reader.read(SEAT_BITS)
+    if not seats:
+        raise ValueError("Game without players")
+    scoresheets: List[int] = []
+    turn_moves: List[Tuple[int, int]] = []
+    for _ in range(seats):
+        packed = reader.read(SCORESHEET_BITS)
+        if packed >> PENALTY_SHIFT > MAX_PENALTIES:
+            raise ValueError("Too many penalties")
+        scoresheets.append(packed)
+        turn_moves.append((reader.read(TURN_MOVE_BITS), reader.read(TURN_MOVE_BITS)))
+    current_player_index = reader.read(SEAT_BITS)
+    if current_player_index >= seats:
+        raise ValueError(f"No player {current_player_index}")
+    state_index = reader.read(STATE_BITS)
+    if state_index >= len(STATES):
+        raise ValueError(f"Unknown game state index {state_index}")
+    dice: Optional[Tuple[int, ...]] = None
+    if reader.read_flag():
+        dice = tuple(reader.read(DIE_BITS) + 1 for _ in DICE_ORDER)
+        if max(dice) > 6:
+            raise ValueError(f"Invalid dice {dice}")
+    locked_colors = tuple(ROW_COLORS[index] for index in _indexes(reader.read(len(ROW_COLORS))))
+    return GameSnapshot(
+        scoresheets=tuple(scoresheets),
+        turn_moves=tuple(turn_moves),
+        current_player_index=current_player_index,
+        state=STATES[state_index],
+        dice=dice,
+        locked_colors=locked_colors,
+        stage_1_players_finished=_indexes(reader.read(seats)),
+        rolling_player_made_stage_1_move=reader.read_flag(),
+        rolling_player_made_stage_2_move=reader.read_flag(),
+    )
+
+
+def encode_snapshot(snapshot: GameSnapshot) -> bytes:
+    """
+    Encode a game position.
+
+    Args:
+        snapshot: Position from Game.snapshot()
+
+    Returns:
+        The encoded bytes
+
+    Raises:
+        ValueError: If a field is out of the format's range
+    """
+    writer = _BitWriter()
+    _write_position(writer, snapshot)
+    return writer.to_bytes()
+
+
+def decode_snapshot(data: bytes) -> GameSnapshot:
+    """
+    Decode encode_snapshot() bytes.
+
+    Args:
+        data: The encoded bytes
+
+    Returns:
+        The position; its locked colors and finished players are in order
+
+    Raises:
+        ValueError: If the bytes are not a position of this format
+    """
+    reader = _BitReader(data)
+    snapshot = _read_position(reader)
+    reader.finish()
+    return snapshot
+
+
+def encode_game(game: Game) -> bytes:
+    """
+    Encode a game's setup and position.
+
+    The random streams and the message are not part of the encoding.
+
+    Args:
+        game: The game
+
+    Returns:
+        The encoded bytes
+
+    Raises:
+        ValueError: If the game has an unknown difficulty or too many players
+    """
+    writer = _BitWriter()
+    writer.write(game.num_players, SEAT_BITS)
+    writer.write(_difficulty_index(game.ai_strategy), DIFFICULTY_BITS)
+    strategies: Sequence[str] = game.ai_strategies or ()
+    writer.write(len(strategies), SEAT_BITS)
+    for difficulty in strategies:
+        writer.write(_difficulty_index(difficulty), DIFFICULTY_BITS)
+    writer.write(game.simulation, 1)
+    _write_position(writer, game.snapshot())
+    writer.write(_mask(game.players_finished_moves), len(game.players))
+    writer.write(game.stage_2_rolling_player_finished, 1)
+    return writer.to_bytes()
+
+
+def decode_game(data: bytes) -> Game:
+    """
+    Rebuild a game from encode_game() bytes.
+
+    Args:
+        data: The encoded bytes
+
+    Returns:
+        The game, with fresh random streams; set up without logging, even if
+        it logs what happens from now on
+
+    Raises:
+        ValueError: If the bytes are not a game of this format
+    """
+    reader = _BitReader(data)
+    num_players = reader.read(SEAT_BITS)
+    ai_strategy = _difficulty(reader.read(DIFFICULTY_BITS))
+    strategies = [_difficulty(reader.read(DIFFICULTY_BITS)) for _ in range(reader.read(SEAT_BITS))]
+    simulation = reader.read_flag()
+    snapshot = _read_position(reader)
+    seats = len(snapshot.scoresheets)
+    players_finished_moves = _indexes(reader.read(seats))
+    stage_2_rolling_player_finished = reader.read_flag()
+    reader.finish()
+    if not strategies and num_players not in (1, 2):
+        raise ValueError(f"Invalid number of players {num_players}")
+
+    # Built headless: a rebuilt game was already set up (and logged) once
+    game = Game(
+        num_players=num_players,
+        ai_strategy=ai_strategy,
+        simulation=True,
+        ai_strategies=strategies or None,
+    )
+    if len(game.players) != seats:
+        raise ValueError(f"Setup has {len(game.players)} players, position has {seats}")
+    game.load_snapshot(snapshot)
+    game.players_finished_moves = set(players_finished_moves)
+    game.stage_2_rolling_player_finished = stage_2_rolling_player_finished
+    game.set_simulation(simulation)
+    return game
+
+
+def checkpoint(game: Game) -> bytes:
+    """
+    Encode a game and start a fresh action log from its position.
+
+    Args:
+        game: The game
+
+    Returns:
+        encode_game() bytes for replay_game()
+    """
+    data = encode_game(game)
+    game.action_log.clear()
+    return data
+
+
+def replay_game(data: bytes, actions: Union[bytes, ActionLog]) -> Game:
+    """
+    Rebuild a game from a checkpoint and the actions logged after it.
+
+    Args:
+        data: encode_game() bytes, e.g. from checkpoint()
+        actions: The game's action log since then, or its to_bytes()
+
+    Returns:
+        The game after the actions, with exactly the actions in its log; the
+        replay logs nothing, and the message describes the game's state
+
+    Raises:
+        ValueError: If the bytes are not a game of this format, or an action
+            does not apply to the position it is replayed on
+    """
+    game = decode_game(data)
+    if not isinstance(actions, ActionLog):
+        actions = ActionLog(actions)
+    if not actions:
+        return game
+    # Replayed headless: the actions were logged when they were played
+    simulation = game.simulation
+    game.set_simulation(True)
+    players: List[Player] = game.get_players()
+    for action in actions:
+        if action.seat >= len(players):
+            raise ValueError(f"No player {action.seat}")
+        player = players[action.seat]
+        if action.kind == ActionKind.ROLL:
+            if game.state != GameState.WAITING_FOR_ROLL or action.seat != game.current_player_index:
+                raise ValueError(f"Unexpected roll by player {action.seat}")
+            game.queue_dice([action.dice])
+            game.roll_dice()
+        elif action.kind == ActionKind.MARK:
+            if not game.try_mark_number(player, action.color, action.number):
+                raise ValueError(f"Invalid mark {action.number} in {action.color.value}")
+        elif action.kind == ActionKind.DONE:
+            game.player_done_making_moves(player)
+        else:
+            game.finish_ai_stage(player, action.stage)
+    game.set_simulation(simulation)
+    game.message = game.describe_state()
+    # The log is the one replayed, whatever the replay recorded
+    game.action_log = ActionLog(actions.to_bytes())
+    return game
@@ -0,0 +1,173 @@
+"""
+Transposition table for the AI searches.
+
+Different move orders reach the same scoresheet (marking red 4 then green 9
+or the other way round), so searches key positions by a Zobrist hash: one
+fixed random 64-bit key per row bit, lock, closed row, penalty count, turn
+and depth, XORed together. The table is a bounded LRU map from those keys
+to values, so memory stays capped however long a server runs.
+"""
+
+import os
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from .row_table import ROW_LENGTH
+
+# Positions kept per table (override with an environment variable)
+DEFAULT_TABLE_SIZE = int(os.environ.get("QWIXX_TRANSPOSITION_TABLE_SIZE", "200000"))
+
+NUM_ROWS = 4
+MAX_PENALTIES = 4
+MAX_PLAYERS = 8
+MAX_DEPTH = 16
+
+# Fixed seed: keys must be identical in every process
+ZOBRIST_SEED = 0x51C0FFEE
+
+
+def _keys(generator: np.random.Generator, count: int) -> List[int]:
+    """Draw count random 64-bit keys as Python ints."""
+    return [int(key) for key in generator.integers(0, 2**64, size=count, dtype=np.uint64)]
+
+
+def _mask_keys(bit_keys: List[int]) -> List[int]:
+    """Key of every bitmask over len(bit_keys) bits: the XOR of its set bits' keys."""
+    keys = [0] * (1 << len(bit_keys))
+    for mask in range(1, len(keys)):
+        low_bit = (mask & -mask).bit_length() - 1
+        keys[mask] = keys[mask & (mask - 1)] ^ bit_keys[low_bit]
+    return keys
+
+
+_generator = np.random.default_rng(ZOBRIST_SEED)
+ROW_KEYS = tuple(_mask_keys(_keys(_generator, ROW_LENGTH)) for _ in range(NUM_ROWS))
+LOCK_KEYS = _mask_keys(_keys(_generator, NUM_ROWS))
+CLOSED_KEYS = _mask_keys(_keys(_generator, NUM_ROWS))
+PENALTY_KEYS = _keys(_generator, MAX_PENALTIES + 1)
+TURN_KEYS = tuple(_keys(_generator, MAX_PLAYERS) for _ in range(MAX_PLAYERS + 1))
+DEPTH_KEYS = _keys(_generator, MAX_DEPTH + 1)
+del _generator
+
+
+def zobrist_key(
+    state: tuple, turn: int = 0, num_players: int = 1, depth: int = 0
+) -> int:
+    """
+    Zobrist hash of a search position.
+
+    Args:
+        state: Search state (row masks, own locks, closed rows, penalties)
+        turn: Player whose roll comes next, counted from the searching player
+        num_players: Number of players in the game
+        depth: Rolls still to look ahead
+
+    Returns:
+        The 64-bit key
+    """
+    mask_0, mask_1, mask_2, mask_3, locks, closed, penalties = state
+    return (
+        ROW_KEYS[0][mask_0]
+        ^ ROW_KEYS[1][mask_1]
+        ^ ROW_KEYS[2][mask_2]
+        ^ ROW_KEYS[3][mask_3]
+        ^ LOCK_KEYS[locks]
+        ^ CLOSED_KEYS[closed]
+        ^ PENALTY_KEYS[min(penalties, MAX_PENALTIES)]
+        ^ TURN_KEYS[num_players][turn]
+        ^ DEPTH_KEYS[depth]
+    )
+
+
+class TableStats(NamedTuple):
+    """
+    Counters of a transposition table.
+
+    Attributes:
+        size: Positions stored
+        capacity: Most positions stored
+        hits: Lookups that found a value
+        misses: Lookups that did not
+        evictions: Positions dropped to make room
+    """
+
+    size: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups that found a value."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TranspositionTable:
+    """Bounded least-recently-used map from position keys to values."""
+
+    def __init__(self, capacity: int = DEFAULT_TABLE_SIZE):
+        """
+        Initialize an empty table.
+
+        Args:
+            capacity: Most positions kept; the least recently used one is
+                evicted when a new position would exceed it
+        """
+        if capacity < 1:
+            raise ValueError("Transposition table capacity must be positive")
+        self.capacity = capacity
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: int) -> Optional[float]:
+        """
+        Look up a position and mark it as recently used.
+
+        Args:
+            key: The position key
+
+        Returns:
+            The stored value, or None if the position is not in the table
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: int, value: float) -> None:
+        """
+        Store the value of a position, evicting the least recently used one if full.
+
+        Args:
+            key: The position key
+            value: Its value
+        """
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = value
+
+    def clear(self) -> None:
+        """Drop every position (the counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> TableStats:
+        """Get the table's size and counters."""
+        return TableStats(
+            len(self._entries), self.capacity, self.hits, self.misses, self.evictions
+        )
@@ -29,6 +29,7 @@ class PlayerSchema(BaseModel):
 
 
 class GameStateSchema(BaseModel):
+    session_id: str
     state: str
     current_player_index: int
     dice_results: Optional[Dict[str, int]]
@@ -0,0 +1,195 @@
+"""
+Batched AI decisions across concurrent games.
+
+Each game's coroutine asks the batcher for its AI decisions. Decisions that
+need the heuristic move scores are held for a few milliseconds (or until the
+batch is full), then every pending decision of an evaluator is scored with
+one vectorized product (evaluator.score_batch) and each game's future is
+resolved with its AIDecision. Decisions made without those scores (no moves,
+opening book, turn plans) resolve at once.
+
+Only cheap work runs here, on the event loop: a decision that needs a search
+(endgame solver, expert, mcts) is handed back as SearchRequired, and
+play_ai_moves() makes it in the executor's process pool.
+
+The batcher belongs to one event loop and is not thread-safe; requests on
+one game must be serialized by the caller, since the game must not change
+between a decision's start and its resolution.
+"""
+
+import asyncio
+import os
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
+
+from app.core.ai_player import AIDecision, AIPlayer, PendingScores, SearchRequired
+from app.core.evaluator import feature_matrix, score_batch
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.services.ai_executor import AIExecutor
+
+# Seconds a decision waits for others to join its batch (override with an environment variable)
+BATCH_WINDOW = float(os.environ.get("QWIXX_AI_BATCH_WINDOW", "0.002"))
+
+# Most decisions scored in one batch
+MAX_BATCH_SIZE = int(os.environ.get("QWIXX_AI_BATCH_SIZE", "64"))
+
+# Safety limit on the AI actions play_ai_moves() takes in one call
+MAX_AI_ACTIONS = 1000
+
+
+class _Request(NamedTuple):
+    """A decision waiting in the batch."""
+
+    game: Game
+    player: AIPlayer
+    stage: int
+    pending: PendingScores
+    future: asyncio.Future
+
+
+class AIBatcher:
+    """Collects AI decisions across games and scores them in batches."""
+
+    def __init__(self, window: float = BATCH_WINDOW, max_batch_size: int = MAX_BATCH_SIZE):
+        """
+        Initialize a batcher.
+
+        Args:
+            window: Seconds the first decision of a batch waits for others
+            max_batch_size: Decisions that flush a batch without waiting
+        """
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.decisions = 0
+        self._requests: List[_Request] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def decide(
+        self, game: Game, player: AIPlayer, stage: int
+    ) -> Union[AIDecision, SearchRequired]:
+        """
+        Make an AI player's decision for a stage, batched with other games'.
+
+        Args:
+            game: The game, left unchanged until the decision resolves
+            player: The deciding AI player
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+
+        Returns:
+            The same AIDecision as player.decide(game, stage), or
+            SearchRequired if making it needs a search (which the batcher
+            never runs)
+        """
+        pending = player.begin_decision(game, stage, search=False)
+        if isinstance(pending, (AIDecision, SearchRequired)):
+            return pending
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._requests.append(_Request(game, player, stage, pending, future))
+        if len(self._requests) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Score every waiting decision now and resolve their futures."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        requests, self._requests = self._requests, []
+        if not requests:
+            return
+
+        groups: Dict[int, List[_Request]] = {}
+        for request in requests:
+            groups.setdefault(id(request.pending.evaluator), []).append(request)
+
+        self.batches += 1
+        self.decisions += len(requests)
+        for group in groups.values():
+            try:
+                matrices = [
+                    feature_matrix(r.pending.available_moves, r.pending.features)
+                    for r in group
+                ]
+                all_scores = score_batch(matrices, group[0].pending.evaluator.weights)
+            except Exception as error:
+                for request in group:
+                    _resolve(request, error=error)
+                continue
+            for request, scores in zip(group, all_scores):
+                _resolve(request, scores=scores.tolist())
+
+
+def _resolve(
+    request: _Request, scores: Optional[List[float]] = None, error: Exception = None
+) -> None:
+    """Finish a waiting decision and resolve its future."""
+    if request.future.done():  # Cancelled while waiting
+        return
+    if error is None:
+        try:
+            decision = request.player.finish_decision(
+                request.game, request.stage, request.pending, scores
+            )
+        except Exception as finish_error:
+            error = finish_error
+    if error is not None:
+        request.future.set_exception(error)
+    else:
+        request.future.set_result(decision)
+
+
+async def play_ai_moves(
+    game: Game,
+    batcher: AIBatcher,
+    executor: Optional[AIExecutor] = None,
+    on_action: Optional[Callable[[], None]] = None,
+) -> int:
+    """
+    Play the AI players' part of a game until a human has to act.
+
+    AI players roll on their turn and make their stage decisions through
+    the batcher, so many games' AI moves share batches; decisions the
+    batcher hands back as SearchRequired are made in the executor's process
+    pool instead.
+
+    Args:
+        game: The game to advance
+        batcher: The batcher deciding for the AI players
+        executor: Process pool for searches (None makes them in this
+            process, blocking the event loop)
+        on_action: Called after each AI action, e.g. to push the new state
+
+    Returns:
+        Number of AI actions taken (rolls and decisions)
+    """
+    actions = 0
+    while game.get_state() != GameState.GAME_OVER and actions < MAX_AI_ACTIONS:
+        pending = game.pending_ai_decision()
+        if pending is not None:
+            player, stage = pending
+            decision = await batcher.decide(game, player, stage)
+            if isinstance(decision, SearchRequired):
+                if executor is not None:
+                    decision = await executor.decide(game, player, stage)
+                else:
+                    decision = player.decide(game, stage)
+            game.apply_ai_decision(player, stage, decision)
+        elif game.get_state() == GameState.WAITING_FOR_ROLL and getattr(
+            game.get_current_player(), "is_ai", False
+        ):
+            game.roll_dice()
+        else:
+            break
+        actions += 1
+        if on_action is not None:
+            on_action()
+    return actions
+
+
+# Batcher shared by every game served by this process
+AI_BATCHER = AIBatcher()
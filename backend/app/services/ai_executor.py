@@ -0,0 +1,189 @@
+"""
+AI decisions in worker processes, off the event loop.
+
+Decisions that need a search (the endgame solver, expectimax, Monte Carlo;
+see AIPlayer.required_search()) can take a good fraction of a second; made
+on the event loop, that would hold up every other request. The executor
+ships a compact GameSnapshot of the position to a process pool instead,
+rebuilds the game there, lets the same difficulty decide, and hands the
+AIDecision back for the caller to apply.
+
+Decisions are bounded two ways, both configurable:
+
+* queue depth: when QWIXX_AI_QUEUE_DEPTH decisions are already in the pool,
+  new ones are not queued;
+* timeout: decisions not back within QWIXX_AI_DECISION_TIMEOUT seconds are
+  abandoned (the worker finishes them, the result is dropped).
+
+Either way, and when a worker fails, the player decides in-process with the
+cheap heuristic fallback (AIPlayer.quick_decision()).
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Sequence
+
+from app.core.ai_player import AIDecision, AIPlayer
+from app.core.game import Game, GameSnapshot
+
+# Worker processes (override with an environment variable; 0 for the CPU count)
+AI_WORKERS = int(os.environ.get("QWIXX_AI_WORKERS", "0")) or os.cpu_count() or 1
+
+# Most decisions in the pool at once before new ones fall back
+AI_QUEUE_DEPTH = int(os.environ.get("QWIXX_AI_QUEUE_DEPTH", "64"))
+
+# Seconds a decision may take in the pool before it falls back
+AI_DECISION_TIMEOUT = float(os.environ.get("QWIXX_AI_DECISION_TIMEOUT", "2.0"))
+
+# Processes an mcts decision in the pool searches with: the pool already
+# runs decisions side by side, so a nested pool per worker would only
+# oversubscribe the CPUs
+POOL_MCTS_WORKERS = 1
+
+# AIPlayer settings carried over to the rebuilt player (mcts_workers is the executor's)
+PLAYER_SETTINGS = (
+    "search_depth",
+    "time_budget",
+    "mcts_workers",
+    "mcts_time_budget",
+    "mcts_rollouts",
+    "plan_turns",
+    "solve_endgames",
+)
+
+# Stand-in difficulty of human seats in the rebuilt game (they never decide there)
+HUMAN_STAND_IN = "medium"
+
+
+def decide_snapshot(
+    snapshot: GameSnapshot,
+    strategies: Sequence[str],
+    seat: int,
+    stage: int,
+    seed: int,
+    settings: Dict[str, Any],
+) -> AIDecision:
+    """
+    Rebuild a position and make one player's decision (runs in a worker).
+
+    Args:
+        snapshot: The position, from Game.snapshot()
+        strategies: Difficulty of every seat
+        seat: Index of the deciding player
+        stage: 1 for white dice sum stage, 2 for colored combination stage
+        seed: Seed of the rebuilt game's AI choices
+        settings: PLAYER_SETTINGS values of the deciding player
+
+    Returns:
+        The player's AIDecision
+    """
+    game = Game.from_snapshot(snapshot, strategies, seed=seed)
+    player = game.get_players()[seat]
+    for name, value in settings.items():
+        setattr(player, name, value)
+    return player.decide(game, stage)
+
+
+class AIExecutor:
+    """Makes searching AI decisions in a process pool, with a fallback."""
+
+    def __init__(
+        self,
+        workers: int = AI_WORKERS,
+        queue_depth: int = AI_QUEUE_DEPTH,
+        timeout: Optional[float] = AI_DECISION_TIMEOUT,
+        mcts_workers: int = POOL_MCTS_WORKERS,
+    ):
+        """
+        Initialize an executor; the pool starts with the first decision.
+
+        Args:
+            workers: Worker processes
+            queue_depth: Most decisions in the pool at once
+            timeout: Seconds per decision (None for no limit)
+            mcts_workers: Processes each mcts decision searches with
+        """
+        self.workers = workers
+        self.mcts_workers = mcts_workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self.in_flight = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.failures = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def decide(self, game: Game, player: AIPlayer, stage: int) -> AIDecision:
+        """
+        Make an AI player's decision in the pool.
+
+        Args:
+            game: The game, left unchanged until the decision returns
+            player: The deciding AI player
+            stage: 1 for white dice sum stage, 2 for colored combination stage
+
+        Returns:
+            The player's AIDecision, or its quick_decision() if the pool is
+            full, too slow or failing
+        """
+        if self.in_flight >= self.queue_depth:
+            self.rejected += 1
+            return player.quick_decision(game, stage)
+
+        players = game.get_players()
+        strategies = [getattr(p, "difficulty", HUMAN_STAND_IN) for p in players]
+        settings = {name: getattr(player, name) for name in PLAYER_SETTINGS}
+        settings["mcts_workers"] = self.mcts_workers
+        # Drawn from the player's stream, so seeded games stay reproducible
+        seed = player.rng.getrandbits(63)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._get_pool(),
+            decide_snapshot,
+            game.snapshot(),
+            strategies,
+            players.index(player),
+            stage,
+            seed,
+            settings,
+        )
+        self.in_flight += 1
+        future.add_done_callback(self._finished)
+        try:
+            # Shielded: a late decision keeps its pool slot until it is done
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except BrokenProcessPool:
+            # A worker died; stop what is left and start a fresh pool next time
+            self.failures += 1
+            self.shutdown()
+        except Exception:
+            self.failures += 1
+        return player.quick_decision(game, stage)
+
+    def shutdown(self) -> None:
+        """Stop the pool without waiting for running decisions."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the pool, starting it on first use."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _finished(self, future: asyncio.Future) -> None:
+        """Free a decision's pool slot."""
+        self.in_flight -= 1
+        if not future.cancelled() and future.exception() is None:
+            self.completed += 1
+
+
+# Executor shared by every game served by this process
+AI_EXECUTOR = AIExecutor()
@@ -0,0 +1,822 @@
+"""
+Persistent storage of game sessions.
+
+A SessionStore keeps each session's game under its ID, with an idle TTL
+and a version counting its writes. The SessionManager keeps the games in
+use in memory and backs them with a store, so sessions survive eviction
+and restarts, and several uvicorn workers can share them through SQLite
+or Redis:
+
+* MemoryStore: a dict, for tests and single-process servers;
+* SQLiteStore: two tables in a WAL-mode database file, so readers in other
+  processes never block on a writer;
+* RedisStore: any client with Redis's get/mget/set/setrange/append/expire/
+  delete and WATCH/MULTI transactions (redis-py, or a fake).
+
+A stored game is a checkpoint plus the action log since (see
+app.core.action_log): save() writes a checkpoint, append_actions() only
+adds the 3-byte records of the actions played after it, and load() returns
+both for serialization.replay_game().
+
+Writes are compare-and-set: they take the version the game was based on
+and raise StaleSessionError if another process wrote the session since, so
+two workers that both changed a session cannot silently drop one of the
+changes. Writes to shared stores go straight through.
+
+WriteBehindStore wraps a store that only this process writes to: writes
+only update a buffer of each session and a background thread flushes it,
+so a request never waits on the disk. Loads see the buffered writes first.
+Turn it on with QWIXX_SESSION_WRITE_BEHIND=1; it checks versions against
+its own buffer only, so it must not be used with several workers.
+
+Pick the store with QWIXX_SESSION_STORE: unset for games kept in memory
+only, "memory", "sqlite:///path/to/sessions.db" or "redis://host:6379/0".
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.core import serialization
+from app.core.game import Game
+
+# Store URL (override with an environment variable; unset keeps games in memory only)
+SESSION_STORE_URL = os.environ.get("QWIXX_SESSION_STORE", "")
+
+# Buffer saves in a write-behind thread (only for a store no other process writes to)
+SESSION_WRITE_BEHIND = os.environ.get("QWIXX_SESSION_WRITE_BEHIND", "") not in ("", "0")
+
+# Seconds between the write-behind thread's flushes
+WRITE_BEHIND_INTERVAL = float(os.environ.get("QWIXX_SESSION_FLUSH_INTERVAL", "0.05"))
+
+# Bytes of the version in front of a Redis value
+VERSION_BYTES = 8
+
+
+class StoredSession(NamedTuple):
+    """
+    A session's game as stored.
+
+    Attributes:
+        data: The game's bytes at its last checkpoint
+        version: Writes of the session so far, to pass back to the next one
+        actions: Action log records appended since the checkpoint
+    """
+
+    data: bytes
+    version: int
+    actions: bytes = b""
+
+
+class StaleSessionError(Exception):
+    """A write based on another version of a session than the stored one."""
+
+
+def encode_game(game: Game) -> bytes:
+    """
+    Serialize a game's setup, position and message.
+
+    Args:
+        game: The game
+
+    Returns:
+        The stored bytes: the length of the serialization.encode_game() bytes,
+        those bytes, then the message in UTF-8
+    """
+    position = serialization.encode_game(game)
+    return len(position).to_bytes(2, "little") + position + game.message.encode("utf-8")
+
+
+def decode_game(data: bytes, actions: bytes = b"") -> Game:
+    """
+    Rebuild a game from encode_game() bytes and the actions logged after them.
+
+    Args:
+        data: The stored bytes
+        actions: ActionLog records to replay on the stored position
+
+    Returns:
+        The game, with fresh random streams and the actions in its log; its
+        message is the stored one, or describes the state the actions led to
+
+    Raises:
+        ValueError: If the bytes are not a stored game of this format, or an
+            action does not apply
+    """
+    size = int.from_bytes(data[:2], "little")
+    if len(data) < 2 + size:
+        raise ValueError("Not a stored game")
+    game = serialization.replay_game(data[2:2 + size], actions)
+    if not actions:
+        game.message = data[2 + size:].decode("utf-8")
+    return game
+
+
+class SessionStore(ABC):
+    """Sessions' stored games by session ID."""
+
+    # Whether other processes may change the stored sessions
+    shared = False
+
+    # Whether calls may wait on I/O (the API makes them off the event loop)
+    blocking = True
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        """
+        Get a session's stored game.
+
+        Args:
+            session_id: The session's ID
+
+        Returns:
+            The checkpoint, its appended actions and the version, or None if
+            the session does not exist or has expired
+        """
+
+    @abstractmethod
+    def save(
+        self,
+        session_id: str,
+        data: bytes,
+        ttl: float,
+        version: Optional[int] = None,
+        actions: bytes = b"",
+        new_version: Optional[int] = None,
+    ) -> int:
+        """
+        Store a checkpoint of a session's game, replacing the appended actions.
+
+        Args:
+            session_id: The session's ID
+            data: The game's bytes
+            ttl: Seconds until the session expires unless used again
+            version: Version the game was loaded (or last written) at; None
+                saves whatever is stored
+            actions: ActionLog records played after the checkpoint
+            new_version: Version to store the session at (default: one more
+                than the stored one), for a buffer that counts its own writes
+
+        Returns:
+            The session's new version
+
+        Raises:
+            StaleSessionError: If the stored session is not at version (written
+                by another process since, expired or deleted)
+        """
+
+    @abstractmethod
+    def append_actions(
+        self,
+        session_id: str,
+        records: bytes,
+        ttl: float,
+        version: int,
+        new_version: Optional[int] = None,
+    ) -> int:
+        """
+        Add action log records after a session's stored game.
+
+        Args:
+            session_id: The session's ID
+            records: ActionLog bytes of the actions played since the last write
+            ttl: Seconds until the session expires unless used again
+            version: Version the game was loaded (or last written) at
+            new_version: Version to store the session at (default: version + 1)
+
+        Returns:
+            The session's new version
+
+        Raises:
+            StaleSessionError: If the stored session is not at version
+        """
+
+    @abstractmethod
+    def touch(self, session_id: str, ttl: float) -> None:
+        """
+        Restart a session's idle TTL without changing it (no-op if it is gone).
+
+        Args:
+            session_id: The session's ID
+            ttl: Seconds until the session expires unless used again
+        """
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """
+        Remove a session.
+
+        Args:
+            session_id: The session's ID
+        """
+
+    def close(self) -> None:
+        """Release the store's resources."""
+
+
+class MemoryStore(SessionStore):
+    """Sessions in a dict of this process."""
+
+    blocking = False
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Initialize an empty store.
+
+        Args:
+            clock: Time source for expiry
+        """
+        self.clock = clock
+        # (stored session, expiry time) of each session
+        self._entries: Dict[str, Tuple[StoredSession, float]] = {}
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        stored, expires = entry
+        if expires < self.clock():
+            del self._entries[session_id]
+            return None
+        return stored
+
+    def save(
+        self,
+        session_id: str,
+        data: bytes,
+        ttl: float,
+        version: Optional[int] = None,
+        actions: bytes = b"",
+        new_version: Optional[int] = None,
+    ) -> int:
+        stored = self.load(session_id)
+        if version is not None and (stored is None or stored.version != version):
+            raise StaleSessionError(session_id)
+        if new_version is None:
+            new_version = (0 if stored is None else stored.version) + 1
+        self._entries[session_id] = (StoredSession(data, new_version, actions), self.clock() + ttl)
+        return new_version
+
+    def append_actions(
+        self,
+        session_id: str,
+        records: bytes,
+        ttl: float,
+        version: int,
+        new_version: Optional[int] = None,
+    ) -> int:
+        stored = self.load(session_id)
+        if stored is None or stored.version != version:
+            raise StaleSessionError(session_id)
+        if new_version is None:
+            new_version = version + 1
+        appended = StoredSession(stored.data, new_version, stored.actions + records)
+        self._entries[session_id] = (appended, self.clock() + ttl)
+        return new_version
+
+    def touch(self, session_id: str, ttl: float) -> None:
+        stored = self.load(session_id)
+        if stored is not None:
+            self._entries[session_id] = (stored, self.clock() + ttl)
+
+    def delete(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+
+# Unconditional save of a session to SQLite, counting its version up
+_UPSERT = (
+    "INSERT INTO sessions (id, data, expires, version) VALUES (?1, ?2, ?3, COALESCE(?4, 1)) "
+    "ON CONFLICT (id) DO UPDATE SET data = excluded.data, expires = excluded.expires, "
+    "version = COALESCE(?4, sessions.version + 1)"
+)
+
+
+class SQLiteStore(SessionStore):
+    """
+    Sessions in a SQLite database in WAL mode.
+
+    The sessions table holds each checkpoint; each append_actions() is one
+    row of session_actions, keyed by the version it made.
+    """
+
+    shared = True
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        """
+        Open (and create if needed) a store.
+
+        Args:
+            path: Database file (":memory:" for a private in-memory database)
+            clock: Time source for expiry
+        """
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, data BLOB NOT NULL, "
+            "expires REAL NOT NULL, version INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(sessions)")}
+        if "version" not in columns:
+            # Database of a release without versions
+            self._connection.execute(
+                "ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS session_actions (session_id TEXT NOT NULL, "
+            "version INTEGER NOT NULL, records BLOB NOT NULL, PRIMARY KEY (session_id, version)) "
+            "WITHOUT ROWID"
+        )
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        with self._lock:
+            with self._connection:
+                # One read transaction, so both tables come from the same write
+                self._connection.execute("BEGIN")
+                row = self._connection.execute(
+                    "SELECT data, version FROM sessions WHERE id = ? AND expires >= ?",
+                    (session_id, self.clock()),
+                ).fetchone()
+                if row is None:
+                    return None
+                records = self._connection.execute(
+                    "SELECT records FROM session_actions WHERE session_id = ? ORDER BY version",
+                    (session_id,),
+                ).fetchall()
+        return StoredSession(bytes(row[0]), row[1], b"".join(bytes(r[0]) for r in records))
+
+    def save(
+        self,
+        session_id: str,
+        data: bytes,
+        ttl: float,
+        version: Optional[int] = None,
+        actions: bytes = b"",
+        new_version: Optional[int] = None,
+    ) -> int:
+        now = self.clock()
+        with self._lock:
+            with self._connection:
+                self._connection.execute("BEGIN IMMEDIATE")
+                if version is None:
+                    self._connection.execute(_UPSERT, (session_id, data, now + ttl, new_version))
+                else:
+                    cursor = self._connection.execute(
+                        "UPDATE sessions SET data = ?, expires = ?, "
+                        "version = COALESCE(?, version + 1) "
+                        "WHERE id = ? AND version = ? AND expires >= ?",
+                        (data, now + ttl, new_version, session_id, version, now),
+                    )
+                    if cursor.rowcount != 1:
+                        raise StaleSessionError(session_id)
+                self._connection.execute(
+                    "DELETE FROM session_actions WHERE session_id = ?", (session_id,)
+                )
+                new_version = self._connection.execute(
+                    "SELECT version FROM sessions WHERE id = ?", (session_id,)
+                ).fetchone()[0]
+                if actions:
+                    self._connection.execute(
+                        "INSERT INTO session_actions (session_id, version, records) "
+                        "VALUES (?, ?, ?)",
+                        (session_id, new_version, actions),
+                    )
+        return new_version
+
+    def append_actions(
+        self,
+        session_id: str,
+        records: bytes,
+        ttl: float,
+        version: int,
+        new_version: Optional[int] = None,
+    ) -> int:
+        now = self.clock()
+        if new_version is None:
+            new_version = version + 1
+        with self._lock:
+            with self._connection:
+                self._connection.execute("BEGIN IMMEDIATE")
+                cursor = self._connection.execute(
+                    "UPDATE sessions SET expires = ?, version = ? "
+                    "WHERE id = ? AND version = ? AND expires >= ?",
+                    (now + ttl, new_version, session_id, version, now),
+                )
+                if cursor.rowcount != 1:
+                    raise StaleSessionError(session_id)
+                self._connection.execute(
+                    "INSERT INTO session_actions (session_id, version, records) VALUES (?, ?, ?)",
+                    (session_id, new_version, records),
+                )
+        return new_version
+
+    def touch(self, session_id: str, ttl: float) -> None:
+        now = self.clock()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE sessions SET expires = ? WHERE id = ? AND expires >= ?",
+                (now + ttl, session_id, now),
+            )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                self._connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                self._connection.execute(
+                    "DELETE FROM session_actions WHERE session_id = ?", (session_id,)
+                )
+
+    def purge(self) -> int:
+        """
+        Delete the expired sessions.
+
+        Returns:
+            Number of sessions deleted
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                return self._delete_expired(self.clock())
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _delete_expired(self, now: float) -> int:
+        """Delete the sessions expired before now with their actions, in the open transaction."""
+        cursor = self._connection.execute("DELETE FROM sessions WHERE expires < ?", (now,))
+        if cursor.rowcount:
+            self._connection.execute(
+                "DELETE FROM session_actions WHERE session_id NOT IN (SELECT id FROM sessions)"
+            )
+        return cursor.rowcount
+
+
+class RedisStore(SessionStore):
+    """
+    Sessions in Redis, expired by Redis itself.
+
+    A session is two keys: the session's version (VERSION_BYTES,
+    little-endian) then its checkpoint, and the checkpoint's key plus
+    ":actions" with the appended records. Writes run in WATCH/MULTI
+    transactions on the first key; appends only overwrite its version
+    (SETRANGE) and APPEND the records.
+    """
+
+    shared = True
+
+    def __init__(self, client, prefix: str = "qwixx:session:"):
+        """
+        Initialize a store.
+
+        Args:
+            client: Client with Redis's get(), mget(), set(ex=...), setrange(),
+                append(), expire(), delete(), pipeline() and transaction()
+            prefix: Prefix of the session keys
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        key = self.prefix + session_id
+        value, actions = self.client.mget(key, key + ":actions")
+        if value is None:
+            return None
+        version = int.from_bytes(value[:VERSION_BYTES], "little")
+        return StoredSession(value[VERSION_BYTES:], version, actions or b"")
+
+    def save(
+        self,
+        session_id: str,
+        data: bytes,
+        ttl: float,
+        version: Optional[int] = None,
+        actions: bytes = b"",
+        new_version: Optional[int] = None,
+    ) -> int:
+        key = self.prefix + session_id
+
+        def write(pipe) -> int:
+            stored = self._watched_version(pipe, key)
+            if version is not None and stored != version:
+                raise StaleSessionError(session_id)
+            written = (stored or 0) + 1 if new_version is None else new_version
+            seconds = max(1, int(ttl))
+            pipe.multi()
+            pipe.set(key, written.to_bytes(VERSION_BYTES, "little") + data, ex=seconds)
+            if actions:
+                pipe.set(key + ":actions", actions, ex=seconds)
+            else:
+                pipe.delete(key + ":actions")
+            return written
+
+        return self.client.transaction(write, key, value_from_callable=True)
+
+    def append_actions(
+        self,
+        session_id: str,
+        records: bytes,
+        ttl: float,
+        version: int,
+        new_version: Optional[int] = None,
+    ) -> int:
+        key = self.prefix + session_id
+        written = version + 1 if new_version is None else new_version
+
+        def write(pipe) -> int:
+            if self._watched_version(pipe, key) != version:
+                raise StaleSessionError(session_id)
+            seconds = max(1, int(ttl))
+            pipe.multi()
+            pipe.setrange(key, 0, written.to_bytes(VERSION_BYTES, "little"))
+            pipe.expire(key, seconds)
+            pipe.append(key + ":actions", records)
+            pipe.expire(key + ":actions", seconds)
+            return written
+
+        return self.client.transaction(write, key, value_from_callable=True)
+
+    def touch(self, session_id: str, ttl: float) -> None:
+        key = self.prefix + session_id
+        pipe = self.client.pipeline()
+        pipe.expire(key, max(1, int(ttl)))
+        pipe.expire(key + ":actions", max(1, int(ttl)))
+        pipe.execute()
+
+    def delete(self, session_id: str) -> None:
+        key = self.prefix + session_id
+        self.client.delete(key, key + ":actions")
+
+    def close(self) -> None:
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+    @staticmethod
+    def _watched_version(pipe, key: str) -> Optional[int]:
+        """Version stored under a watched key (None if there is none)."""
+        # redis-py reruns the transaction if key changes before EXEC
+        value = pipe.get(key)
+        return None if value is None else int.from_bytes(value[:VERSION_BYTES], "little")
+
+
+class _BufferedWrite(NamedTuple):
+    """
+    A session's writes waiting in a WriteBehindStore.
+
+    Attributes:
+        stored: The session as the buffer shows it
+        ttl: Seconds until the session expires unless used again
+        base: Version of the stored session the writes build on (None if
+            the store does not have it)
+        records: Action records appended since base, or None if the flush
+            writes a checkpoint (stored.data with stored.actions)
+    """
+
+    stored: StoredSession
+    ttl: float
+    base: Optional[int]
+    records: Optional[bytes]
+
+
+class WriteBehindStore(SessionStore):
+    """
+    Buffers writes and flushes them to another store from a background thread.
+
+    Only for a store that no other process writes to: versions are checked
+    against the buffer, which counts them itself and writes each session at
+    the version it handed out. A flush makes one write per session: an
+    append of the records buffered since the last flush, or a checkpoint if
+    one was buffered.
+    """
+
+    def __init__(self, store: SessionStore, interval: float = WRITE_BEHIND_INTERVAL):
+        """
+        Wrap a store and start the writer thread.
+
+        Args:
+            store: The store written to
+            interval: Seconds between flushes
+        """
+        self.store = store
+        self.interval = interval
+        self.flushes = 0
+        self.writes = 0
+        self.errors = 0
+        # Buffered writes of each session not yet flushed; None deletes it
+        self._pending: Dict[str, Optional[_BufferedWrite]] = {}
+        # Writes the running flush is making, until they are in the store
+        self._flushing: Dict[str, Optional[_BufferedWrite]] = {}
+        # TTL of each session touched since the last flush
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="session-write-behind", daemon=True)
+        self._thread.start()
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        with self._lock:
+            for buffered in (self._pending, self._flushing):
+                if session_id in buffered:
+                    entry = buffered[session_id]
+                    return None if entry is None else entry.stored
+        return self.store.load(session_id)
+
+    def save(
+        self,
+        session_id: str,
+        data: bytes,
+        ttl: float,
+        version: Optional[int] = None,
+        actions: bytes = b"",
+        new_version: Optional[int] = None,
+    ) -> int:
+        with self._lock:
+            stored, base = self._current(session_id)
+            if version is not None and (stored is None or stored.version != version):
+                raise StaleSessionError(session_id)
+            if new_version is None:
+                new_version = (0 if stored is None else stored.version) + 1
+            self._pending[session_id] = _BufferedWrite(
+                StoredSession(data, new_version, actions), ttl, base, None
+            )
+            self._touched.pop(session_id, None)
+            return new_version
+
+    def append_actions(
+        self,
+        session_id: str,
+        records: bytes,
+        ttl: float,
+        version: int,
+        new_version: Optional[int] = None,
+    ) -> int:
+        with self._lock:
+            stored, base = self._current(session_id)
+            if stored is None or stored.version != version:
+                raise StaleSessionError(session_id)
+            entry = self._pending.get(session_id)
+            if entry is None:
+                buffered: Optional[bytes] = records
+            elif entry.records is None:
+                buffered = None  # The flush writes the checkpoint with every record
+            else:
+                buffered = entry.records + records
+            if new_version is None:
+                new_version = version + 1
+            appended = StoredSession(stored.data, new_version, stored.actions + records)
+            self._pending[session_id] = _BufferedWrite(appended, ttl, base, buffered)
+            self._touched.pop(session_id, None)
+            return new_version
+
+    def touch(self, session_id: str, ttl: float) -> None:
+        with self._lock:
+            entry = self._pending.get(session_id)
+            if entry is not None:
+                self._pending[session_id] = entry._replace(ttl=ttl)
+            elif session_id not in self._pending:
+                self._touched[session_id] = ttl
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._pending[session_id] = None
+            self._touched.pop(session_id, None)
+
+    def flush(self) -> None:
+        """Write every buffered change now."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                touched, self._touched = self._touched, {}
+                self._flushing = pending
+            if not pending and not touched:
+                return
+            failed: Dict[str, Optional[_BufferedWrite]] = {}
+            failed_touches: Dict[str, float] = {}
+            for key, entry in pending.items():
+                try:
+                    self._write(key, entry)
+                except StaleSessionError:
+                    # Something else wrote the session: its buffered changes are lost
+                    self.errors += 1
+                except Exception:
+                    failed[key] = entry
+            for key, ttl in touched.items():
+                try:
+                    self.store.touch(key, ttl)
+                except Exception:
+                    failed_touches[key] = ttl
+            with self._lock:
+                self._flushing = {}
+                # Keep what failed for the next flush, under any newer changes
+                for key, entry in failed.items():
+                    self._pending[key] = _merged(entry, self._pending.get(key, entry))
+                for key, ttl in failed_touches.items():
+                    if key not in self._pending:
+                        self._touched.setdefault(key, ttl)
+            if failed or failed_touches:
+                self.errors += 1
+                return
+            self.flushes += 1
+            self.writes += len(pending) + len(touched)
+
+    def close(self) -> None:
+        """Stop the writer thread, write what is left and close the store."""
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        self.store.close()
+
+    def _write(self, session_id: str, entry: Optional[_BufferedWrite]) -> None:
+        """Make one buffered write to the store."""
+        if entry is None:
+            self.store.delete(session_id)
+            return
+        stored = entry.stored
+        if entry.records is None:
+            self.store.save(
+                session_id,
+                stored.data,
+                entry.ttl,
+                entry.base,
+                actions=stored.actions,
+                new_version=stored.version,
+            )
+        else:
+            self.store.append_actions(
+                session_id, entry.records, entry.ttl, entry.base, new_version=stored.version
+            )
+
+    def _current(self, session_id: str) -> Tuple[Optional[StoredSession], Optional[int]]:
+        """A session as the buffer shows it and the stored version it builds on (lock held)."""
+        if session_id in self._pending:
+            entry = self._pending[session_id]
+            return (None, None) if entry is None else (entry.stored, entry.base)
+        if session_id in self._flushing:
+            # The running flush stores it at the version it shows
+            entry = self._flushing[session_id]
+            return (None, None) if entry is None else (entry.stored, entry.stored.version)
+        # The store is only read here; the flushes write it
+        stored = self.store.load(session_id)
+        return stored, None if stored is None else stored.version
+
+    def _run(self) -> None:
+        """Flush periodically until closed."""
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+
+def _merged(
+    failed: Optional[_BufferedWrite], newer: Optional[_BufferedWrite]
+) -> Optional[_BufferedWrite]:
+    """A write that failed to flush followed by the writes buffered after it."""
+    if failed is None or newer is None or newer is failed:
+        return newer
+    if failed.records is None or newer.records is None:
+        return newer._replace(base=failed.base, records=None)
+    return newer._replace(base=failed.base, records=failed.records + newer.records)
+
+
+def open_store(
+    url: str = SESSION_STORE_URL, write_behind: bool = SESSION_WRITE_BEHIND
+) -> Optional[SessionStore]:
+    """
+    Open the store a URL names.
+
+    Args:
+        url: "", "memory", "sqlite:///path/to/file.db" or "redis://..."
+        write_behind: Put a SQLite or Redis store behind a write-behind
+            buffer (only for a store no other process writes to)
+
+    Returns:
+        The store, or None for an empty URL (games kept in memory only)
+
+    Raises:
+        ValueError: If the URL names no known store
+        ImportError: For a Redis URL without the redis package installed
+    """
+    if not url:
+        return None
+    if url == "memory":
+        return MemoryStore()
+    if url.startswith("sqlite:///"):
+        store: SessionStore = SQLiteStore(url[len("sqlite:///"):])
+    elif url.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis
+        except ImportError as error:
+            raise ImportError("Redis session store needs the redis package") from error
+        store = RedisStore(redis.Redis.from_url(url))
+    else:
+        raise ValueError(f"Unknown session store: {url}")
+    return WriteBehindStore(store) if write_behind else store
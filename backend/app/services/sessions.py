@@ -0,0 +1,543 @@
+"""
+Game sessions of the API.
+
+Every game lives in a Session under a random ID. The SessionManager keeps
+them in an LRU map with two bounds, so one process can host thousands of
+games without growing forever:
+
+* idle TTL: a session not used for QWIXX_SESSION_TTL seconds expires;
+* capacity: beyond QWIXX_MAX_SESSIONS sessions, the least recently used one
+  is evicted.
+
+Expired sessions are purged lazily, whenever sessions are created or looked
+up; the LRU order puts the idlest sessions first, so a purge only visits the
+sessions it removes.
+
+With a SessionStore (see app.services.session_store) the resident sessions
+are a cache. Every change is written to the store as the action log
+records played since the last write, with a fresh checkpoint of the game
+once QWIXX_SESSION_CHECKPOINT_ACTIONS actions have piled up, and sessions
+evicted from memory are loaded back on their next request by replaying
+the stored actions on the stored checkpoint. Every lookup restarts the
+session's idle TTL in the store, and with a store shared by several
+processes picks up changes made by the others, unless a request is working
+on the game (it holds the session's lock). Writes are compare-and-set
+on the version the game was loaded at: a save that would overwrite
+another process's change raises StaleSessionError and leaves the session
+with the stored game instead. The API uses the *_async methods, which wait
+on a store's I/O in the default executor rather than on the event loop and
+restart the TTL in the background.
+
+Clients can also listen to a session (the API's WebSocket): publish() puts
+each update on the queue of every listener of that session ID, so updates
+keep flowing when the session is evicted and loaded back. Updates go to the
+listeners of this process only.
+"""
+
+import asyncio
+import os
+import resource
+import secrets
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.action_log import RECORD_BYTES
+from app.core.game import Game
+from app.services.session_store import (
+    SessionStore,
+    StaleSessionError,
+    StoredSession,
+    decode_game,
+    encode_game,
+    open_store,
+)
+
+# Seconds a session may stay idle (override with an environment variable)
+SESSION_TTL = float(os.environ.get("QWIXX_SESSION_TTL", "3600"))
+
+# Most sessions kept at once
+MAX_SESSIONS = int(os.environ.get("QWIXX_MAX_SESSIONS", "10000"))
+
+# Actions logged since the stored checkpoint before a save writes a new one
+CHECKPOINT_ACTIONS = int(os.environ.get("QWIXX_SESSION_CHECKPOINT_ACTIONS", "64"))
+
+# Updates queued per listener; beyond that the oldest is dropped
+UPDATE_QUEUE_SIZE = int(os.environ.get("QWIXX_UPDATE_QUEUE_SIZE", "256"))
+
+# Sessions sampled to estimate the memory of one session
+MEMORY_SAMPLE_SIZE = 16
+
+
+class Session:
+    """One game and what the API needs to serve it."""
+
+    def __init__(self, session_id: str, game: Game, now: float):
+        """
+        Initialize a session.
+
+        Args:
+            session_id: The session's ID
+            game: Its game
+            now: Creation time on the manager's clock
+        """
+        self.id = session_id
+        self.game = game
+        self.created_at = now
+        self.last_access = now
+        # Store version of the game last written to (or loaded from) the store,
+        # and how many actions of its log the store has after its checkpoint
+        self.version: Optional[int] = None
+        self.logged = 0
+        # Serializes requests on the game while AI decisions are awaited
+        self.lock = asyncio.Lock()
+
+
+class SessionMetrics(NamedTuple):
+    """
+    Size and counters of a SessionManager.
+
+    Attributes:
+        resident: Sessions currently kept
+        capacity: Most sessions kept
+        ttl: Seconds a session may stay idle
+        created: Sessions created
+        expired: Sessions removed after their idle TTL
+        evicted: Sessions evicted as least recently used
+        loaded: Sessions loaded back from the store
+        listeners: Clients listening to sessions' updates
+        session_bytes: Estimated memory of one session's game
+        sessions_bytes: Estimated memory of all resident sessions' games
+        process_rss_bytes: Resident memory of the whole process
+    """
+
+    resident: int
+    capacity: int
+    ttl: float
+    created: int
+    expired: int
+    evicted: int
+    loaded: int
+    listeners: int
+    session_bytes: int
+    sessions_bytes: int
+    process_rss_bytes: int
+
+
+class SessionManager:
+    """Sessions by ID, with idle expiry and least-recently-used eviction."""
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        ttl: float = SESSION_TTL,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[SessionStore] = None,
+    ):
+        """
+        Initialize an empty manager.
+
+        Args:
+            max_sessions: Most sessions kept in memory
+            ttl: Seconds a session may stay idle
+            clock: Time source
+            store: Store backing the sessions (None keeps them in memory only)
+        """
+        if max_sessions < 1:
+            raise ValueError("Session capacity must be positive")
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        self.store = store
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.loaded = 0
+        # Update queues of the listeners of each session ID
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, game: Game) -> Session:
+        """
+        Add a game under a new ID, evicting the least recently used session if full.
+
+        Args:
+            game: The game
+
+        Returns:
+            The new session
+        """
+        session = self._admit(secrets.token_urlsafe(16), game)
+        self.created += 1
+        self.save(session)
+        return session
+
+    async def create_async(self, game: Game) -> Session:
+        """Add a game under a new ID like create(), writing it off the event loop."""
+        session = self._admit(secrets.token_urlsafe(16), game)
+        self.created += 1
+        await self.save_async(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """
+        Look up a session and mark it as used now, in the store too.
+
+        Args:
+            session_id: The session's ID
+
+        Returns:
+            The session, or None if it does not exist or has expired
+        """
+        now = self.clock()
+        self._purge(now)
+        session = self._sessions.get(session_id)
+        if self._needs_load(session):
+            version = None if session is None else session.version
+            session = self._loaded(session_id, session, *self._read(session_id, version))
+        if session is None:
+            return None
+        if self.store is not None:
+            # Sessions that are only read must not expire in the store
+            self.store.touch(session_id, self.ttl)
+        return self._used(session, now)
+
+    async def get_async(self, session_id: str) -> Optional[Session]:
+        """
+        Look up a session like get(), loading it off the event loop.
+
+        The store's TTL is restarted in the background.
+
+        Args:
+            session_id: The session's ID
+
+        Returns:
+            The session, or None if it does not exist or has expired
+        """
+        now = self.clock()
+        self._purge(now)
+        session = self._sessions.get(session_id)
+        if self._needs_load(session):
+            version = None if session is None else session.version
+            stored, game = await self._off_loop(self._read, session_id, version)
+            # Other requests ran meanwhile, so look at the session again
+            session = self._sessions.get(session_id)
+            if self._needs_load(session):
+                session = self._loaded(session_id, session, stored, game)
+        if session is None:
+            return None
+        if self.store is not None:
+            self._touch_in_background(session_id)
+        return self._used(session, now)
+
+    def save(self, session: Session) -> None:
+        """
+        Save a session's game to the store after a change (no-op without a store).
+
+        Appends the actions logged since the last save to the stored log, or
+        once the log holds CHECKPOINT_ACTIONS actions (and for new sessions)
+        stores a checkpoint of the game and restarts its log.
+
+        Args:
+            session: The session
+
+        Raises:
+            StaleSessionError: If another process saved the session since it
+                was loaded; the session then holds the stored game (or is
+                removed if the store no longer has it)
+        """
+        if self.store is None:
+            return
+        try:
+            self._write(session)
+        except StaleSessionError:
+            self._loaded(session.id, session, *self._read(session.id, session.version))
+            raise
+
+    async def save_async(self, session: Session) -> None:
+        """
+        Save a session's game like save(), writing it off the event loop.
+
+        Args:
+            session: The session, whose lock the caller holds
+
+        Raises:
+            StaleSessionError: If another process saved the session since it
+                was loaded (see save())
+        """
+        if self.store is None:
+            return
+        try:
+            await self._off_loop(self._write, session)
+        except StaleSessionError:
+            stored, game = await self._off_loop(self._read, session.id, session.version)
+            self._loaded(session.id, session, stored, game)
+            raise
+
+    def remove(self, session_id: str) -> bool:
+        """
+        End a session.
+
+        Args:
+            session_id: The session's ID
+
+        Returns:
+            True if the session existed in memory
+        """
+        if self.store is not None:
+            self.store.delete(session_id)
+        return self._forget(session_id)
+
+    async def remove_async(self, session_id: str) -> bool:
+        """End a session like remove(), deleting it from the store off the event loop."""
+        if self.store is not None:
+            await self._off_loop(self.store.delete, session_id)
+        return self._forget(session_id)
+
+    def subscribe(self, session_id: str) -> asyncio.Queue:
+        """
+        Start listening to a session's updates.
+
+        Args:
+            session_id: The session's ID
+
+        Returns:
+            Queue receiving every published update; None once the session ended
+        """
+        queue: asyncio.Queue = asyncio.Queue(UPDATE_QUEUE_SIZE)
+        self._listeners.setdefault(session_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        """
+        Stop listening to a session's updates.
+
+        Args:
+            session_id: The session's ID
+            queue: Queue from subscribe()
+        """
+        listeners = self._listeners.get(session_id)
+        if listeners is not None:
+            listeners.discard(queue)
+            if not listeners:
+                del self._listeners[session_id]
+
+    def has_listeners(self, session_id: str) -> bool:
+        """Check whether anyone listens to a session's updates."""
+        return session_id in self._listeners
+
+    def publish(self, session_id: str, update: Any) -> None:
+        """
+        Send an update to every listener of a session.
+
+        Args:
+            session_id: The session's ID
+            update: The update (None tells listeners the session ended)
+        """
+        for queue in self._listeners.get(session_id, ()):
+            if queue.full():
+                # Updates are whole states, so a newer one supersedes the oldest
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+    def close(self) -> None:
+        """Write what is left to the store and close it."""
+        if self.store is not None:
+            self.store.close()
+
+    def purge(self) -> int:
+        """
+        Remove every session idle for longer than the TTL.
+
+        Returns:
+            Number of sessions removed
+        """
+        return self._purge(self.clock())
+
+    def metrics(self) -> SessionMetrics:
+        """Get the manager's size, counters and memory estimates."""
+        self.purge()
+        sample = list(self._sessions.values())[-MEMORY_SAMPLE_SIZE:]
+        session_bytes = (
+            sum(deep_size(session.game) for session in sample) // len(sample)
+            if sample
+            else 0
+        )
+        return SessionMetrics(
+            resident=len(self._sessions),
+            capacity=self.max_sessions,
+            ttl=self.ttl,
+            created=self.created,
+            expired=self.expired,
+            evicted=self.evicted,
+            loaded=self.loaded,
+            listeners=sum(len(listeners) for listeners in self._listeners.values()),
+            session_bytes=session_bytes,
+            sessions_bytes=session_bytes * len(self._sessions),
+            process_rss_bytes=process_rss_bytes(),
+        )
+
+    def _admit(self, session_id: str, game: Game) -> Session:
+        """Make a game resident, evicting the least recently used sessions if full."""
+        now = self.clock()
+        self._purge(now)
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        session = Session(session_id, game, now)
+        self._sessions[session_id] = session
+        return session
+
+    def _needs_load(self, session: Optional[Session]) -> bool:
+        """Check whether a lookup of a session must read the store."""
+        if self.store is None:
+            return False
+        # The request holding the lock saves on the version its game was
+        # loaded at, so it learns about other processes' changes then
+        return session is None or (self.store.shared and not session.lock.locked())
+
+    def _used(self, session: Session, now: float) -> Session:
+        """Mark a looked up session as the most recently used."""
+        session.last_access = now
+        self._sessions.move_to_end(session.id)
+        return session
+
+    def _forget(self, session_id: str) -> bool:
+        """Drop an ended session and tell its listeners."""
+        self.publish(session_id, None)
+        return self._sessions.pop(session_id, None) is not None
+
+    def _read(
+        self, session_id: str, version: Optional[int]
+    ) -> Tuple[Optional[StoredSession], Optional[Game]]:
+        """Load a session from the store, and its game unless it is at version."""
+        stored = self.store.load(session_id)
+        if stored is None or stored.version == version:
+            return stored, None
+        return stored, decode_game(stored.data, stored.actions)
+
+    def _write(self, session: Session) -> None:
+        """Write a session's new actions, or a checkpoint, to the store."""
+        log = session.game.action_log
+        if session.version is None or len(log) >= CHECKPOINT_ACTIONS:
+            data = encode_game(session.game)
+            session.version = self.store.save(session.id, data, self.ttl, session.version)
+            log.clear()
+        elif len(log) > session.logged:
+            records = log.to_bytes()[session.logged * RECORD_BYTES:]
+            session.version = self.store.append_actions(
+                session.id, records, self.ttl, session.version
+            )
+        session.logged = len(log)
+
+    async def _off_loop(self, function: Callable[..., Any], *args: Any) -> Any:
+        """Call a function of the store, in the default executor if it blocks."""
+        if not self.store.blocking:
+            return function(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def _touch_in_background(self, session_id: str) -> None:
+        """Restart a session's TTL in the store without waiting for it."""
+        if not self.store.blocking:
+            self.store.touch(session_id, self.ttl)
+            return
+        loop = asyncio.get_running_loop()
+        touch = loop.run_in_executor(None, self.store.touch, session_id, self.ttl)
+        # A failed touch only lets the session expire sooner
+        touch.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    def _loaded(
+        self,
+        session_id: str,
+        session: Optional[Session],
+        stored: Optional[StoredSession],
+        game: Optional[Game],
+    ) -> Optional[Session]:
+        """Bring a session up to date with what _read() got (None if it is gone)."""
+        if stored is None:
+            # Expired or ended in the store, maybe by another process
+            self._sessions.pop(session_id, None)
+            return None
+        if session is not None and stored.version == session.version:
+            return session
+        if game is None:
+            game = decode_game(stored.data, stored.actions)
+        if session is None:
+            session = self._admit(session_id, game)
+            self.loaded += 1
+        else:
+            session.game = game
+        session.version = stored.version
+        session.logged = len(game.action_log)
+        return session
+
+    def _purge(self, now: float) -> int:
+        """Remove the sessions idle since before now - ttl, idlest first."""
+        removed = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            removed += 1
+        self.expired += removed
+        return removed
+
+
+def deep_size(root: object) -> int:
+    """
+    Estimate the memory held by a game.
+
+    Containers and objects of this package are followed; anything else
+    (loggers, modules, functions) counts only its own size. Memory-mapped
+    tables are shared by every game and count nothing.
+
+    Args:
+        root: The object to measure
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set()
+    pending = [root]
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, np.memmap):
+            continue
+        total += sys.getsizeof(obj)  # Includes the data of arrays that own it
+        if isinstance(obj, dict):
+            pending.extend(obj.keys())
+            pending.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        elif type(obj).__module__.startswith("app."):
+            pending.extend(getattr(obj, "__dict__", {}).values())
+            for name in getattr(type(obj), "__slots__", ()):
+                if hasattr(obj, name):
+                    pending.append(getattr(obj, name))
+    return total
+
+
+def process_rss_bytes() -> int:
+    """Resident memory of this process (peak resident memory where unknown)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Linux and macOS report the peak in KiB and bytes respectively
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Sessions of every game served by this process
+SESSIONS = SessionManager(store=open_store())
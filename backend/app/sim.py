@@ -0,0 +1,306 @@
+"""
+Parallel AI-vs-AI self-play tournaments.
+
+Usage:
+    python -m app.sim --games 10000 medium hard
+
+Every game is seeded from (seed, game index), so results are reproducible no
+matter how many worker processes share the work.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+from app.core.ai_player import DIFFICULTIES
+from app.core.game import Game
+from app.core.mcts import DEFAULT_MCTS_WORKERS
+from app.core.rng import stream_seed
+
+Z_95 = 1.959964  # Two-sided 95% normal quantile
+
+
+class RunningStats:
+    """Streaming mean and variance (Welford's algorithm)."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Add an observation.
+
+        Args:
+            value: The observed value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the observations."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def ci95(self) -> float:
+        """
+        Half-width of the 95% confidence interval of the mean.
+
+        Returns:
+            The half-width (0 with fewer than two observations)
+        """
+        if self.count < 2:
+            return 0.0
+        return Z_95 * math.sqrt(self.variance / self.count)
+
+
+def wilson_interval(successes: int, trials: int) -> tuple:
+    """
+    Wilson score 95% confidence interval for a proportion.
+
+    Args:
+        successes: Number of successes
+        trials: Number of trials
+
+    Returns:
+        Tuple of (low, high)
+    """
+    if trials == 0:
+        return (0.0, 0.0)
+    p = successes / trials
+    denominator = 1 + Z_95**2 / trials
+    center = (p + Z_95**2 / (2 * trials)) / denominator
+    margin = Z_95 * math.sqrt(p * (1 - p) / trials + Z_95**2 / (4 * trials**2))
+    return (max(0.0, center - margin / denominator), min(1.0, center + margin / denominator))
+
+
+def play_game(task: tuple) -> Dict[str, Any]:
+    """
+    Play one headless self-play game.
+
+    Seats rotate with the game index so no strategy always rolls first.
+
+    Args:
+        task: Tuple of (game index, root seed, strategies, processes each
+            mcts decision searches with)
+
+    Returns:
+        Per-game result keyed by the strategy's position in the strategy list
+    """
+    index, root_seed, strategies, mcts_workers = task
+    offset = index % len(strategies)
+    seating = [(offset + seat) % len(strategies) for seat in range(len(strategies))]
+
+    game = Game(
+        simulation=True,
+        ai_strategies=[strategies[side] for side in seating],
+        seed=stream_seed(root_seed, index),
+    )
+    for player in game.get_players():
+        player.mcts_workers = mcts_workers
+    rolls = game.play_ai_game()
+
+    scores = [0] * len(strategies)
+    penalties = [0] * len(strategies)
+    for side, player in zip(seating, game.get_players()):
+        scores[side] = player.get_total_score()
+        penalties[side] = player.get_scoresheet().penalties
+
+    best = max(scores)
+    winners = [side for side, score in enumerate(scores) if score == best]
+    return {
+        "game": index,
+        "scores": scores,
+        "penalties": penalties,
+        "rolls": rolls,
+        "winner": winners[0] if len(winners) == 1 else None,
+    }
+
+
+class TournamentSummary:
+    """Aggregated results of a self-play tournament."""
+
+    def __init__(self, strategies: Sequence[str]):
+        """
+        Initialize an empty summary.
+
+        Args:
+            strategies: Difficulty of each side
+        """
+        self.strategies = list(strategies)
+        self.games = 0
+        self.ties = 0
+        self.wins = [0] * len(strategies)
+        self.scores = [RunningStats() for _ in strategies]
+        self.penalties = [RunningStats() for _ in strategies]
+        self.rolls = RunningStats()
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """
+        Add the result of one game.
+
+        Args:
+            result: Result returned by play_game()
+        """
+        self.games += 1
+        if result["winner"] is None:
+            self.ties += 1
+        else:
+            self.wins[result["winner"]] += 1
+        for side in range(len(self.strategies)):
+            self.scores[side].add(result["scores"][side])
+            self.penalties[side].add(result["penalties"][side])
+        self.rolls.add(result["rolls"])
+
+    def format(self) -> str:
+        """
+        Format the summary as a text table.
+
+        Returns:
+            The formatted summary
+        """
+        lines = [
+            f"{self.games} games, {self.ties} ties, "
+            f"game length {self.rolls.mean:.1f} ± {self.rolls.ci95():.1f} rolls "
+            f"(var {self.rolls.variance:.1f})",
+            f"{'side':<10} {'win rate (95% CI)':<26} {'score':<24} {'penalties':<14}",
+        ]
+        for side, strategy in enumerate(self.strategies):
+            low, high = wilson_interval(self.wins[side], self.games)
+            rate = self.wins[side] / self.games if self.games else 0.0
+            score = self.scores[side]
+            penalty = self.penalties[side]
+            lines.append(
+                f"{f'{side + 1}:{strategy}':<10} "
+                f"{f'{rate:.3f} [{low:.3f}, {high:.3f}]':<26} "
+                f"{f'{score.mean:.2f} ± {score.ci95():.2f} (var {score.variance:.1f})':<24} "
+                f"{f'{penalty.mean:.2f} ± {penalty.ci95():.2f}':<14}"
+            )
+        return "\n".join(lines)
+
+
+def run_tournament(
+    strategies: Sequence[str],
+    games: int,
+    seed: int = 0,
+    workers: int = 1,
+    chunksize: int = 64,
+    on_result=None,
+) -> TournamentSummary:
+    """
+    Play a self-play tournament, optionally across worker processes.
+
+    Args:
+        strategies: Difficulty of each side
+        games: Number of games
+        seed: Root seed of the tournament
+        workers: Number of worker processes (1 plays in this process)
+        chunksize: Games sent to a worker at a time
+        on_result: Optional callback invoked with each game result, in order
+
+    Returns:
+        The tournament summary
+    """
+    summary = TournamentSummary(strategies)
+    # Games played side by side search mcts decisions in their own process only
+    mcts_workers = DEFAULT_MCTS_WORKERS if workers <= 1 else 1
+    tasks = ((index, seed, list(strategies), mcts_workers) for index in range(games))
+
+    if workers <= 1:
+        results = map(play_game, tasks)
+        for result in results:
+            summary.add(result)
+            if on_result:
+                on_result(result)
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(play_game, tasks, chunksize=chunksize):
+            summary.add(result)
+            if on_result:
+                on_result(result)
+    return summary
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point (qwixx-sim).
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="qwixx-sim", description="Play AI-vs-AI Qwixx games and compare difficulties."
+    )
+    parser.add_argument(
+        "strategies",
+        nargs="*",
+        default=["medium", "hard"],
+        metavar="STRATEGY",
+        help=f"AI difficulty of each player: {', '.join(DIFFICULTIES)} (default: medium hard)",
+    )
+    parser.add_argument("-n", "--games", type=int, default=1000, help="number of games")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="root random seed")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=64, help="games per worker task"
+    )
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "-q", "--quiet", action="store_true", help="only print the summary"
+    )
+    output.add_argument(
+        "--jsonl", action="store_true", help="stream per-game results as JSON lines"
+    )
+    args = parser.parse_args(argv)
+
+    if len(args.strategies) < 2:
+        parser.error("at least two strategies are required")
+    # Not choices=: argparse would check the default list as one choice
+    unknown = [strategy for strategy in args.strategies if strategy not in DIFFICULTIES]
+    if unknown:
+        parser.error(
+            f"unknown strategies: {', '.join(unknown)} (choose from {', '.join(DIFFICULTIES)})"
+        )
+
+    def print_result(result: Dict[str, Any]) -> None:
+        if args.jsonl:
+            print(json.dumps(result), flush=True)
+        else:
+            scores = "  ".join(
+                f"{strategy} {score:>3}"
+                for strategy, score in zip(args.strategies, result["scores"])
+            )
+            print(f"game {result['game']:>6}: {scores}  ({result['rolls']} rolls)")
+
+    summary = run_tournament(
+        args.strategies,
+        args.games,
+        seed=args.seed,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        on_result=None if args.quiet else print_result,
+    )
+    print(summary.format(), file=sys.stderr if args.jsonl else sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""
+Build the opening book from self-play.
+
+Usage:
+    python -m app.tools.build_opening_book [--games 2000] [--rollouts 16] [--output PATH]
+
+Games between players of one strategy are played out. At every white-sum
+decision in a book position (see app.core.opening_book) each legal action,
+skipping or marking the white sum in a row, is played out --rollouts times
+from a snapshot of the game, every player following the strategy. All
+actions share the same rollout seeds, so they are compared on the same dice.
+The book stores the mean reward of each action over every visit of a
+position; positions visited fewer than --min-visits times are left out.
+
+Rollouts follow the strategy as it currently plays, including any installed
+book, so rebuilding refines the book.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from app.core.evaluator import COLOR_INDEX
+from app.core.expectimax import state_from_scoresheet
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.core.mcts import rollout
+from app.core.opening_book import ACTIONS, DEFAULT_PATH, RECORD, SKIP, book_key, write_opening_book
+from app.core.rng import stream_seed
+
+# Safety limit on the rolls of one game
+MAX_ROLLS = 1000
+
+# Book key -> (visits, reward totals of each action, NaN if illegal)
+Visits = Dict[int, Tuple[int, np.ndarray]]
+
+
+def evaluate_position(game: Game, player, rollouts: int, seed: int, strategy: str) -> np.ndarray:
+    """
+    Play out every white-sum action of a player from the current position.
+
+    Args:
+        game: Game in stage 1 with the player still to decide
+        player: The deciding player
+        rollouts: Rollouts per action
+        seed: Seed of the rollout seeds
+        strategy: Difficulty every player follows in the rollouts
+
+    Returns:
+        Mean reward of each action (NaN if illegal)
+    """
+    snapshot = game.snapshot()
+    player_index = game.get_players().index(player)
+    actions = {SKIP: None}
+    for color, number in player.get_available_moves(game):
+        actions[1 + COLOR_INDEX[color]] = (color, number)
+
+    seeds = np.random.default_rng(seed).integers(2**63, size=rollouts)
+    values = np.full(ACTIONS, np.nan)
+    for action, move in actions.items():
+        values[action] = np.mean(
+            [rollout(snapshot, player_index, 1, move, int(s), strategy) for s in seeds]
+        )
+    return values
+
+
+def play_game(task: tuple) -> Visits:
+    """
+    Play one self-play game and evaluate its book positions.
+
+    Args:
+        task: Tuple of (game index, root seed, strategy, players, rollouts)
+
+    Returns:
+        The visits of the game's book positions
+    """
+    index, root_seed, strategy, num_players, rollouts = task
+    game = Game(
+        simulation=True,
+        ai_strategies=[strategy] * num_players,
+        seed=stream_seed(root_seed, index),
+    )
+    rollout_seeds = np.random.default_rng(stream_seed(root_seed + 1, index))
+    visits: Visits = {}
+
+    rolls = 0
+    while game.state != GameState.GAME_OVER and rolls < MAX_ROLLS:
+        if game.state == GameState.WAITING_FOR_ROLL:
+            game.roll_dice()
+            rolls += 1
+        elif game.state == GameState.STAGE_1_MOVES:
+            # The game lets the first player yet to finish stage 1 decide
+            player = next(
+                p
+                for p in game.get_players()
+                if p.get_id() not in game.stage_1_players_finished
+            )
+            key = book_key(
+                state_from_scoresheet(player.get_scoresheet(), game.get_locked_colors()),
+                game.get_roll_options().white_sum,
+                player == game.get_current_player(),
+                num_players,
+            )
+            if key is not None:
+                values = evaluate_position(
+                    game, player, rollouts, int(rollout_seeds.integers(2**63)), strategy
+                )
+                count, totals = visits.get(key, (0, np.zeros(ACTIONS)))
+                visits[key] = (count + 1, totals + values)
+            game.handle_ai_stage_1_move()
+        elif game.state == GameState.STAGE_2_MOVES:
+            game.handle_ai_stage_2_move()
+        else:
+            break
+    return visits
+
+
+def build(
+    games: int,
+    seed: int = 0,
+    strategy: str = "hard",
+    players: List[int] = (2,),
+    rollouts: int = 16,
+    min_visits: int = 4,
+    workers: int = 1,
+) -> np.ndarray:
+    """
+    Build the book records.
+
+    Args:
+        games: Self-play games per player count
+        seed: Root seed of the run
+        strategy: Difficulty of every player
+        players: Player counts to build the book for
+        rollouts: Rollouts per action and visit
+        min_visits: Fewest visits for a position to enter the book
+        workers: Number of worker processes (1 plays in this process)
+
+    Returns:
+        RECORD array of the book
+    """
+    tasks = [
+        (count * games + index, seed, strategy, count, rollouts)
+        for count in players
+        for index in range(games)
+    ]
+    merged: Visits = {}
+
+    def merge(visits: Visits) -> None:
+        for key, (count, totals) in visits.items():
+            old_count, old_totals = merged.get(key, (0, np.zeros(ACTIONS)))
+            merged[key] = (old_count + count, old_totals + totals)
+
+    if workers <= 1:
+        for visits in map(play_game, tasks):
+            merge(visits)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for visits in executor.map(play_game, tasks, chunksize=8):
+                merge(visits)
+
+    kept = [(key, totals / count) for key, (count, totals) in merged.items() if count >= min_visits]
+    records = np.zeros(len(kept), dtype=RECORD)
+    for index, (key, values) in enumerate(kept):
+        records[index] = (key, values)
+    return records
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="build_opening_book", description="Build the opening book from self-play."
+    )
+    parser.add_argument("-n", "--games", type=int, default=2000, help="games per player count")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="root random seed")
+    parser.add_argument("--strategy", default="hard", help="difficulty of every player")
+    parser.add_argument(
+        "--players", type=int, nargs="+", default=[2], help="player counts (default: 2)"
+    )
+    parser.add_argument("--rollouts", type=int, default=16, help="rollouts per action and visit")
+    parser.add_argument(
+        "--min-visits", type=int, default=4, help="fewest visits for a position to enter the book"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: CPU count)",
+    )
+    parser.add_argument("-o", "--output", default=DEFAULT_PATH, help="book file to write")
+    args = parser.parse_args(argv)
+
+    if args.games < 1 or args.rollouts < 1 or args.min_visits < 1:
+        parser.error("--games, --rollouts and --min-visits must be positive")
+    if any(not 2 <= count <= 5 for count in args.players):
+        parser.error("player counts must be between 2 and 5")
+
+    records = build(
+        args.games,
+        seed=args.seed,
+        strategy=args.strategy,
+        players=args.players,
+        rollouts=args.rollouts,
+        min_visits=args.min_visits,
+        workers=args.workers,
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_opening_book(args.output, records)
+    print(f"Wrote {len(records)} opening positions to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
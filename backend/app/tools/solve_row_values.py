@@ -0,0 +1,171 @@
+"""
+Solve the value of every single-row state offline.
+
+Usage:
+    python -m app.tools.solve_row_values [--hazard 0.04] [--output PATH]
+
+A row is modelled on its own: every roll is the player's own with
+probability 1 / players (white sum plus this row's colored sums, with a
+white mark allowed before the colored one) and another player's otherwise
+(white sum only). After each roll the game ends with a fixed probability.
+The value of a state is the expected points of the row at the end of the
+game when marking optimally.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.row_table import LAST_POSITION, NEXT_STATE, NUM_ROW_STATES, ROW_LENGTH
+from app.core.row_values import DEFAULT_PATH, write_row_values
+
+DEFAULT_HAZARD = 1 / 24  # A typical two-player game lasts about 24 rolls
+
+
+def _points(marks: int) -> int:
+    """Points of a row with the given number of marks (lock included)."""
+    return marks * (marks + 1) // 2
+
+
+def _mark(mask: int, number: int) -> int:
+    """Mask after marking a number in an ascending row, or -1 if illegal."""
+    return NEXT_STATE[mask * ROW_LENGTH + number - 2]
+
+
+def _roll_outcomes(num_players: int) -> List[tuple]:
+    """
+    Distinct roll outcomes from one row's point of view.
+
+    Returns:
+        List of (probability, white sum, colored sums) where colored sums is
+        empty on other players' rolls
+    """
+    own = 1 / num_players
+    outcomes = []
+    for white1 in range(1, 7):
+        for white2 in range(1, 7):
+            white_sum = white1 + white2
+            outcomes.append(((1 - own) / 36, white_sum, ()))
+            for die in range(1, 7):
+                outcomes.append(
+                    (own / 216, white_sum, tuple({white1 + die, white2 + die}))
+                )
+    return outcomes
+
+
+def solve(num_players: int, hazard: float) -> np.ndarray:
+    """
+    Solve the row values for one player count.
+
+    Args:
+        num_players: Number of players in the game
+        hazard: Chance of the game ending after each roll
+
+    Returns:
+        Array of shape (2, NUM_ROW_STATES) with the expected final points of
+        the row by (locked, mask)
+    """
+    outcomes = _roll_outcomes(num_players)
+    locked = [float(_points(mask.bit_count() + 1)) for mask in range(NUM_ROW_STATES)]
+    open_values = [0.0] * NUM_ROW_STATES
+    after_roll = [0.0] * NUM_ROW_STATES  # Value of reaching a state during a roll
+
+    def reached(mask: int) -> float:
+        # Marking the rightmost number locks the row and ends it
+        if mask >> LAST_POSITION & 1:
+            return locked[mask]
+        return after_roll[mask]
+
+    # Marks only ever add higher positions, so larger masks are solved first
+    for mask in range(NUM_ROW_STATES - 1, -1, -1):
+        stay = hazard * _points(mask.bit_count())
+        best_marks = []
+        for probability, white_sum, colored_sums in outcomes:
+            best = -1.0
+            white_mask = _mark(mask, white_sum)
+            if white_mask >= 0:
+                best = reached(white_mask)
+            for number in colored_sums:
+                for start in (mask, white_mask):
+                    if start < 0 or start >> LAST_POSITION & 1:
+                        continue
+                    colored_mask = _mark(start, number)
+                    if colored_mask >= 0:
+                        best = max(best, reached(colored_mask))
+            best_marks.append((probability, best))
+
+        open_values[mask] = _solve_state(best_marks, stay, 1 - hazard)
+        after_roll[mask] = stay + (1 - hazard) * open_values[mask]
+
+    return np.array([open_values, locked])
+
+
+def _solve_state(best_marks: Sequence[tuple], stay: float, keep: float) -> float:
+    """
+    Solve W = sum(p * max(stay + keep * W, best)) for one state.
+
+    Starting from never marking (W = stay / (1 - keep)), the set of outcomes
+    worth marking only shrinks as W grows, so this settles in a few steps.
+    """
+    value = stay / (1 - keep)
+    while True:
+        skip = stay + keep * value
+        marked_mass = 0.0
+        marked_value = 0.0
+        for probability, best in best_marks:
+            if best > skip:
+                marked_mass += probability
+                marked_value += probability * best
+        new_value = (marked_value + (1 - marked_mass) * stay) / (
+            1 - (1 - marked_mass) * keep
+        )
+        if abs(new_value - value) < 1e-12:
+            return new_value
+        value = new_value
+
+
+def main(argv: List[str] = None) -> int:
+    """
+    Command line entry point.
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="solve_row_values", description="Solve and write the single-row value table."
+    )
+    parser.add_argument(
+        "--hazard",
+        type=float,
+        default=DEFAULT_HAZARD,
+        help="chance of the game ending after each roll (default: 1/24)",
+    )
+    parser.add_argument("--min-players", type=int, default=2)
+    parser.add_argument("--max-players", type=int, default=5)
+    parser.add_argument(
+        "-o", "--output", default=DEFAULT_PATH, help="table file to write"
+    )
+    args = parser.parse_args(argv)
+
+    if not 0 < args.hazard < 1:
+        parser.error("--hazard must be between 0 and 1")
+    if not 1 <= args.min_players <= args.max_players:
+        parser.error("invalid player range")
+
+    tables = np.stack(
+        [solve(players, args.hazard) for players in range(args.min_players, args.max_players + 1)]
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    write_row_values(args.output, tables, args.min_players, args.hazard)
+    print(f"Wrote {tables.shape} row values to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import axios from 'axios';
 
 const API_URL = import.meta.env.VITE_API_URL || '/api';
+const SESSION_KEY = 'qwixxSessionId';
 
 const client = axios.create({
     baseURL: API_URL,
@@ -9,12 +10,48 @@ const client = axios.create({
     },
 });
 
+// Each game lives in a server-side session; keep its ID for this browser tab
+let sessionId = sessionStorage.getItem(SESSION_KEY);
+
+// WebSocket URL of an API path (API_URL may be relative to the page)
+const socketUrl = (path) => {
+    const url = new URL(`${API_URL}${path}`, window.location.href);
+    url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:';
+    return url.toString();
+};
+
+// Close code of the game socket for unknown, expired or ended sessions
+export const UNKNOWN_SESSION_CLOSE_CODE = 4404;
+
+const saveSession = (response) => {
+    sessionId = response.data.session_id;
+    sessionStorage.setItem(SESSION_KEY, sessionId);
+    return response;
+};
+
 export const gameApi = {
-    setup: (numPlayers, aiStrategy) => client.post('/game/setup', { num_players: numPlayers, ai_strategy: aiStrategy }),
-    getState: () => client.get('/game/state'),
-    roll: () => client.post('/game/roll'),
-    mark: (color, number) => client.post('/game/mark', { color, number }),
-    done: () => client.post('/game/done'),
+    hasSession: () => sessionId !== null,
+    clearSession: () => {
+        sessionId = null;
+        sessionStorage.removeItem(SESSION_KEY);
+    },
+    setup: (numPlayers, aiStrategy) =>
+        client.post('/game/setup', { num_players: numPlayers, ai_strategy: aiStrategy }).then(saveSession),
+    getState: () => client.get(`/game/${sessionId}/state`),
+    roll: () => client.post(`/game/${sessionId}/roll`),
+    mark: (color, number) => client.post(`/game/${sessionId}/mark`, { color, number }),
+    done: () => client.post(`/game/${sessionId}/done`),
+    // Receive the state on connect and after every change (AI moves included);
+    // returns a function that stops listening
+    subscribe: (onState, onClose) => {
+        const socket = new WebSocket(socketUrl(`/game/${sessionId}/ws`));
+        socket.onmessage = (event) => onState(JSON.parse(event.data));
+        socket.onclose = (event) => onClose?.(event.code);
+        return () => {
+            socket.onclose = null;
+            socket.close();
+        };
+    },
 };
 
 export default client;
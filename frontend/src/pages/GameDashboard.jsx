@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Container, Grid, Paper, Typography, Button, Box, Alert, CircularProgress } from '@mui/material';
-import { gameApi } from '../api/client';
+import { gameApi, UNKNOWN_SESSION_CLOSE_CODE } from '../api/client';
 import ScoreSheet from '../components/ScoreSheet';
 import DiceDisplay from '../components/DiceDisplay';
 
@@ -9,14 +9,26 @@ const GameDashboard = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
 
+    const sessionId = gameState?.session_id;
+
     const fetchGameState = async () => {
+        if (!gameApi.hasSession()) {
+            setLoading(false);
+            return;
+        }
         try {
             const response = await gameApi.getState();
             setGameState(response.data);
             setError(null);
         } catch (err) {
-            setError('Failed to fetch game state');
-            console.error(err);
+            if (err.response?.status === 404) {
+                // The session expired or was evicted; offer a new game
+                gameApi.clearSession();
+                setGameState(null);
+            } else {
+                setError('Failed to fetch game state');
+                console.error(err);
+            }
         } finally {
             setLoading(false);
         }
@@ -26,6 +38,17 @@ const GameDashboard = () => {
         fetchGameState();
     }, []);
 
+    // The server pushes every change, AI moves included, so nothing polls
+    useEffect(() => {
+        if (!sessionId) return undefined;
+        return gameApi.subscribe(setGameState, (code) => {
+            if (code === UNKNOWN_SESSION_CLOSE_CODE) {
+                gameApi.clearSession();
+                setGameState(null);
+            }
+        });
+    }, [sessionId]);
+
     const handleSetup = async () => {
         setLoading(true);
         try {
@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.game import Game
+from app.core.game_state import GameState
+
+
+class FakeClock:
+    """Time source that only moves when a test sets now."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def played_game(ai_strategies=None, seed=3, rolls=10):
+    """
+    Play a few rolls of a new game (see play_rolls()).
+
+    Without ai_strategies the game is a human against a medium AI.
+    """
+    if ai_strategies is None:
+        game = Game(num_players=1, ai_strategy="medium", simulation=True, seed=seed)
+    else:
+        game = Game(ai_strategies=list(ai_strategies), simulation=True, seed=seed)
+    return play_rolls(game, rolls)
+
+
+def play_rolls(game, rolls):
+    """
+    Play a few rolls of a game, stopping when it waits for the next roll.
+
+    AI players make their decisions and humans pass.
+    """
+    for _ in range(rolls):
+        game.roll_dice()
+        while game.state not in (GameState.WAITING_FOR_ROLL, GameState.GAME_OVER):
+            pending = game.pending_ai_decision()
+            if pending is None:
+                game.player_done_making_moves()
+            else:
+                player, stage = pending
+                game.apply_ai_decision(player, stage, player.decide(game, stage))
+        if game.state == GameState.GAME_OVER:
+            break
+    return game
+
+
+def roll_into_endgame(game):
+    """
+    Leave the last player's sheet a few positions from the end and roll.
+
+    Yellow is locked, red is marked up to 10, green and blue down to 3 and
+    the sheet has three penalties, so an endgame solve of that player fits
+    the solver's bounds; the roll is 5 and 6 on the white dice.
+    """
+    game.locked_colors.add(DieColor.YELLOW)
+    sheet = game.get_players()[-1].get_scoresheet()
+    for number in range(2, 11):
+        sheet.mark_number(DieColor.RED, number)
+    for number in range(12, 2, -1):
+        sheet.mark_number(DieColor.GREEN, number)
+        sheet.mark_number(DieColor.BLUE, number)
+    for _ in range(3):
+        sheet.add_penalty()
+    game.queue_dice([(5, 6, 1, 1, 1, 1)])
+    game.roll_dice()
+    return game
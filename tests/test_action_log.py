@@ -0,0 +1,124 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.action_log import Action, ActionKind, ActionLog
+from app.core.die import DieColor
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.core.serialization import checkpoint, encode_game, replay_game
+
+
+def self_play_game(seed=1):
+    return Game(ai_strategies=["medium", "hard"], simulation=True, seed=seed)
+
+
+class ActionLogTests(unittest.TestCase):
+    def test_records_decode_to_their_actions(self):
+        # Arrange
+        log = ActionLog()
+
+        # Act
+        log.record_roll(1, (6, 1, 2, 3, 4, 5))
+        log.record_mark(0, DieColor.BLUE, 12)
+        log.record_done(1)
+        log.record_ai_done(1, 2)
+
+        # Assert
+        self.assertEqual(len(log.to_bytes()), 12)
+        self.assertEqual(
+            list(ActionLog(log.to_bytes())),
+            [
+                Action(ActionKind.ROLL, 1, dice=(6, 1, 2, 3, 4, 5)),
+                Action(ActionKind.MARK, 0, color=DieColor.BLUE, number=12),
+                Action(ActionKind.DONE, 1),
+                Action(ActionKind.AI_DONE, 1, stage=2),
+            ],
+        )
+
+    def test_games_log_their_rolls_marks_and_dones(self):
+        # Arrange
+        game = Game(num_players=2, simulation=True, seed=0)
+        game.queue_dice([(3, 4, 1, 1, 1, 1)])
+
+        # Act
+        game.roll_dice()
+        game.try_mark_number(game.players[1], DieColor.RED, 7)
+        game.try_mark_number(game.players[1], DieColor.RED, 12)  # Invalid, not logged
+        game.player_done_making_moves()
+
+        # Assert
+        kinds = [action.kind for action in game.action_log]
+        self.assertEqual(kinds, [ActionKind.ROLL, ActionKind.MARK, ActionKind.DONE])
+
+
+class ReplayTests(unittest.TestCase):
+    def test_a_whole_game_replays_from_its_start(self):
+        # Arrange
+        game = self_play_game()
+        start = checkpoint(game)
+
+        # Act
+        game.play_ai_game()
+        replayed = replay_game(start, game.action_log.to_bytes())
+
+        # Assert
+        self.assertEqual(replayed.state, GameState.GAME_OVER)
+        self.assertEqual(replayed.snapshot(), game.snapshot())
+        self.assertEqual(replayed.action_log.to_bytes(), game.action_log.to_bytes())
+
+    def test_replays_start_from_the_last_checkpoint(self):
+        # Arrange
+        game = self_play_game(seed=2)
+        game.play_ai_game(max_rolls=8)
+        last = checkpoint(game)
+        game.play_ai_game(max_rolls=4)
+
+        # Act
+        replayed = replay_game(last, game.action_log)
+
+        # Assert
+        self.assertEqual(encode_game(replayed), encode_game(game))
+
+    def test_served_games_replay_without_logging(self):
+        # Arrange
+        game = Game(num_players=2, simulation=True, seed=0)
+        game.set_simulation(False)
+        start = checkpoint(game)
+        game.set_simulation(True)
+        game.queue_dice([(3, 4, 1, 1, 1, 1)])
+        game.roll_dice()
+        game.try_mark_number(game.players[1], DieColor.RED, 7)
+
+        # Act
+        with patch("app.core.game.log_dice_roll") as log_dice_roll, patch(
+            "app.core.game.log_game_state_change"
+        ) as log_game_state_change:
+            replayed = replay_game(start, game.action_log)
+
+        # Assert
+        log_dice_roll.assert_not_called()
+        log_game_state_change.assert_not_called()
+        self.assertFalse(replayed.simulation)
+        self.assertEqual(replayed.action_log.to_bytes(), game.action_log.to_bytes())
+        self.assertEqual(
+            replayed.message,
+            "Stage 1: All players can mark using white dice sum (7). Click 'Done' when finished.",
+        )
+
+    def test_actions_that_do_not_apply_are_rejected(self):
+        # Arrange
+        start = checkpoint(self_play_game())
+        log = ActionLog()
+        log.record_roll(1, (1, 1, 1, 1, 1, 1))  # Player 0 rolls first
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            replay_game(start, log)
+
+
+if __name__ == "__main__":
+    unittest.main()
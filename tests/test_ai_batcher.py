@@ -0,0 +1,118 @@
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.ai_player import AIDecision, SearchRequired
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.services.ai_batcher import AIBatcher, play_ai_moves
+from tests.helpers import roll_into_endgame
+
+
+def stage_1_positions(count, strategy="medium"):
+    """Rolled games whose second (non-rolling) player decides stage 1."""
+    positions = []
+    for seed in range(count):
+        game = Game(simulation=True, ai_strategies=[strategy, strategy], seed=seed)
+        game.roll_dice()
+        if game.get_state() == GameState.STAGE_1_MOVES:
+            positions.append((game, game.get_players()[1]))
+    return positions
+
+
+class AIBatcherTests(unittest.IsolatedAsyncioTestCase):
+    async def test_batched_decisions_match_single_decisions(self):
+        # Arrange
+        expected = [player.decide(game, 1) for game, player in stage_1_positions(12)]
+        batcher = AIBatcher(window=0.01)
+
+        # Act
+        decisions = await asyncio.gather(
+            *(batcher.decide(game, player, 1) for game, player in stage_1_positions(12))
+        )
+
+        # Assert
+        self.assertEqual([d.move for d in decisions], [d.move for d in expected])
+        self.assertEqual(
+            [d.participate for d in decisions], [d.participate for d in expected]
+        )
+        for decision, single in zip(decisions, expected):
+            for (score, *move), (single_score, *single_move) in zip(
+                decision.scored_moves, single.scored_moves
+            ):
+                self.assertEqual(move, single_move)
+                self.assertAlmostEqual(score, single_score, places=9)
+
+    async def test_concurrent_decisions_share_one_batch(self):
+        # Arrange
+        positions = [p for p in stage_1_positions(12) if p[1].get_available_moves(p[0])]
+        batcher = AIBatcher(window=0.01)
+
+        # Act
+        await asyncio.gather(*(batcher.decide(game, player, 1) for game, player in positions))
+
+        # Assert
+        self.assertEqual(batcher.batches, 1)
+        self.assertEqual(batcher.decisions, len(positions))
+
+    async def test_full_batch_is_scored_without_waiting(self):
+        # Arrange
+        positions = [p for p in stage_1_positions(12) if p[1].get_available_moves(p[0])][:2]
+        batcher = AIBatcher(window=60.0, max_batch_size=2)
+
+        # Act
+        decisions = await asyncio.wait_for(
+            asyncio.gather(*(batcher.decide(game, player, 1) for game, player in positions)),
+            timeout=5,
+        )
+
+        # Assert
+        self.assertEqual(len(decisions), 2)
+        self.assertEqual(batcher.batches, 1)
+
+    async def test_decisions_without_moves_skip_the_batch(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["medium", "medium"], seed=0)
+        player = game.get_players()[1]
+        batcher = AIBatcher()
+
+        # Act
+        decision = await batcher.decide(game, player, 1)  # Nothing rolled yet
+
+        # Assert
+        self.assertEqual(decision, AIDecision(False, None, ()))
+        self.assertEqual(batcher.batches, 0)
+
+    async def test_searches_are_handed_back_instead_of_run(self):
+        # Arrange
+        game = roll_into_endgame(Game(simulation=True, ai_strategies=["expert", "hard"], seed=1))
+        batcher = AIBatcher(window=0)
+
+        # Act
+        decisions = [await batcher.decide(game, player, 1) for player in game.get_players()]
+
+        # Assert
+        self.assertEqual(decisions, [SearchRequired("expert"), SearchRequired("endgame")])
+        self.assertEqual([p.last_search for p in game.get_players()], [None, None])
+        self.assertEqual(batcher.batches, 0)
+
+    async def test_ai_moves_are_played_until_a_human_acts(self):
+        # Arrange
+        game = Game(num_players=1, ai_strategy="medium", simulation=True, seed=5)
+        game.roll_dice()
+        human, ai_player = game.get_players()
+
+        # Act
+        await play_ai_moves(game, AIBatcher(window=0))
+
+        # Assert
+        self.assertIn(ai_player.get_id(), game.stage_1_players_finished)
+        self.assertNotIn(human.get_id(), game.stage_1_players_finished)
+        self.assertIsNone(game.pending_ai_decision())
+
+
+if __name__ == "__main__":
+    unittest.main()
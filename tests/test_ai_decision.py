@@ -0,0 +1,112 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.ai_player import AIDecision
+from app.core.die import DieColor
+from app.core.game import Game
+from app.core.game_state import GameState
+
+
+class SinglePassDecisionTests(unittest.TestCase):
+    def test_decide_matches_two_step_pipeline(self):
+        for difficulty in ("easy", "medium", "hard"):
+            for seed in range(40):
+                # Arrange
+                game = Game(simulation=True, ai_strategies=[difficulty, difficulty], seed=seed)
+                game.roll_dice()
+                player = game.get_players()[seed % 2]
+                player.plan_turns = False  # The planner replaces the pipeline on own rolls
+                player.opening_book = None  # So does the opening book
+                stage = 1 + seed % 2
+                state = player.rng.getstate()
+
+                # Act
+                decision = player.decide(game, stage)
+                player.rng.setstate(state)
+                moves = player.get_available_moves(game)
+                participate = bool(moves) and player.should_make_move_in_stage(game, stage)
+                move = player.make_move_decision(game, moves) if participate else None
+
+                # Assert
+                self.assertIsInstance(decision, AIDecision)
+                self.assertEqual(decision.participate, participate)
+                self.assertEqual(decision.move, move)
+                self.assertEqual(len(decision.scored_moves), len(moves))
+
+    def test_scored_moves_are_sorted_best_first(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["hard", "medium"], seed=5)
+        game.queue_dice([(3, 4, 2, 5, 1, 6)])
+        game.roll_dice()
+        player = game.get_players()[0]
+        player.rng = random.Random(0)
+
+        # Act
+        decision = player.decide(game, 2)
+
+        # Assert
+        scores = [score for score, _, _ in decision.scored_moves]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(
+            {(color, number) for _, color, number in decision.scored_moves},
+            set(player.get_available_moves(game)),
+        )
+
+
+class BoardFeaturesTests(unittest.TestCase):
+    def test_shared_features_give_the_same_scores(self):
+        for seed in range(20):
+            # Arrange
+            game = Game(simulation=True, ai_strategies=["hard", "medium", "easy"], seed=seed)
+            for _ in range(3 * seed):
+                game.roll_dice()
+                while game.state == GameState.STAGE_1_MOVES:
+                    game.handle_ai_stage_1_move()
+                while game.state == GameState.STAGE_2_MOVES:
+                    game.handle_ai_stage_2_move()
+                if game.state == GameState.GAME_OVER:
+                    break
+            if game.state != GameState.GAME_OVER:
+                game.roll_dice()
+            player = game.get_players()[0]
+
+            # Act
+            features = player.get_board_features(game)
+
+            # Assert
+            for color, number in player.get_available_moves(game):
+                self.assertEqual(
+                    player._evaluate_move_advanced(game, color, number, features),
+                    player._evaluate_move_advanced(game, color, number),
+                )
+                self.assertEqual(
+                    player._evaluate_move(game, color, number, features),
+                    player._evaluate_move(game, color, number),
+                )
+
+    def test_features_summarize_the_board(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["hard", "medium"], seed=1)
+        me, opponent = game.get_players()
+        for number in (2, 3, 4):
+            me.get_scoresheet().mark_number(DieColor.RED, number)
+        for number in (12, 11):
+            opponent.get_scoresheet().mark_number(DieColor.GREEN, number)
+
+        # Act
+        features = me.get_board_features(game)
+
+        # Assert
+        self.assertEqual(features.total_marks, 3)
+        self.assertEqual(features.row_marks[DieColor.RED], 3)
+        self.assertEqual(features.avg_other_marks[DieColor.YELLOW], 1.0)
+        self.assertEqual(features.opponent_marks[DieColor.GREEN], (2,))
+        self.assertEqual(features.opponent_total_marks[DieColor.RED], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
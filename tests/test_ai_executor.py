@@ -0,0 +1,148 @@
+import os
+import sys
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.services.ai_batcher import AIBatcher, play_ai_moves
+from app.services.ai_executor import PLAYER_SETTINGS, AIExecutor, decide_snapshot
+from tests.helpers import roll_into_endgame
+
+
+def expert_position(seed=3):
+    """Rolled human-vs-expert game with the expert to decide stage 1."""
+    game = Game(num_players=1, ai_strategy="expert", simulation=True, seed=seed)
+    game.roll_dice()
+    expert = game.get_players()[1]
+    expert.search_depth = 1
+    return game, expert
+
+
+class BrokenPool:
+    """Stand-in for a pool whose workers have died."""
+
+    def __init__(self):
+        self.shutdowns = []
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns.append((wait, cancel_futures))
+
+
+class AIExecutorTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.executor = AIExecutor(workers=1, timeout=None)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    async def test_pool_decision_matches_the_same_decision_in_process(self):
+        # Arrange
+        game, expert = expert_position()
+        rng_state = expert.rng.getstate()
+
+        # Act
+        decision = await self.executor.decide(game, expert, 1)
+
+        # Assert
+        expert.rng.setstate(rng_state)
+        settings = {name: getattr(expert, name) for name in PLAYER_SETTINGS}
+        expected = decide_snapshot(
+            game.snapshot(), ["medium", "expert"], 1, 1, expert.rng.getrandbits(63), settings
+        )
+        self.assertEqual(decision, expected)
+        self.assertEqual(self.executor.completed, 1)
+        self.assertEqual(self.executor.in_flight, 0)
+
+    async def test_pool_decisions_search_with_the_executors_mcts_workers(self):
+        # Arrange
+        game, expert = expert_position()
+        expert.mcts_workers = 8
+        self.executor._pool = ThreadPoolExecutor(1)  # Keeps the patch below in effect
+
+        # Act
+        with patch(
+            "app.services.ai_executor.decide_snapshot", side_effect=decide_snapshot
+        ) as decide:
+            await self.executor.decide(game, expert, 1)
+
+        # Assert
+        self.assertEqual(decide.call_args.args[5]["mcts_workers"], 1)
+
+    async def test_late_decisions_fall_back_to_the_heuristics(self):
+        # Arrange
+        game, expert = expert_position()
+        self.executor.timeout = 0.0
+        rng_state = expert.rng.getstate()
+
+        # Act
+        decision = await self.executor.decide(game, expert, 1)
+
+        # Assert
+        expert.rng.setstate(rng_state)
+        expert.rng.getrandbits(63)  # The pool decision's seed
+        self.assertEqual(decision, expert.quick_decision(game, 1))
+        self.assertEqual(self.executor.timeouts, 1)
+
+    async def test_full_queue_falls_back_without_queueing(self):
+        # Arrange
+        game, expert = expert_position()
+        self.executor.queue_depth = 0
+
+        # Act
+        decision = await self.executor.decide(game, expert, 1)
+
+        # Assert
+        self.assertEqual(len(decision.scored_moves), len(expert.get_available_moves(game)))
+        self.assertEqual(self.executor.rejected, 1)
+        self.assertIsNone(self.executor._pool)
+
+    async def test_searching_players_are_played_in_the_pool(self):
+        # Arrange
+        game, expert = expert_position()
+
+        # Act
+        await play_ai_moves(game, AIBatcher(window=0), self.executor)
+
+        # Assert
+        self.assertEqual(self.executor.completed, 1)
+        self.assertIn(expert.get_id(), game.stage_1_players_finished)
+        self.assertEqual(game.get_state(), GameState.STAGE_1_MOVES)
+
+    async def test_endgame_solves_are_played_in_the_pool(self):
+        # Arrange
+        game = roll_into_endgame(Game(num_players=1, ai_strategy="hard", simulation=True, seed=3))
+
+        # Act
+        await play_ai_moves(game, AIBatcher(window=0), self.executor)
+
+        # Assert
+        self.assertEqual(self.executor.completed, 1)
+
+    async def test_broken_pools_are_shut_down_and_replaced(self):
+        # Arrange
+        game, expert = expert_position()
+        pool = BrokenPool()
+        self.executor._pool = pool
+
+        # Act
+        decision = await self.executor.decide(game, expert, 1)
+
+        # Assert
+        self.assertEqual(decision.scored_moves, expert.quick_decision(game, 1).scored_moves)
+        self.assertEqual(pool.shutdowns, [(False, True)])
+        self.assertIsNone(self.executor._pool)
+        self.assertEqual(self.executor.failures, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
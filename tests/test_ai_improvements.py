@@ -17,7 +17,7 @@ class MockGame:
     
     def __init__(self):
         self.dice_roller = DiceRoller()
-        self.dice_results = {'white1': 3, 'white2': 4, 'red': 2, 'yellow': 5, 'green': 1, 'blue': 6}
+        self.dice_results = self.dice_roller.set_values([3, 4, 2, 5, 1, 6])
         self.locked_colors = set()
         self.state = GameState.STAGE_1_MOVES
         self.players = []
@@ -25,6 +25,9 @@ class MockGame:
     def get_dice_results(self):
         return self.dice_results
     
+    def get_roll_options(self):
+        return self.dice_roller.get_roll_options()
+    
     def get_locked_colors(self):
         return self.locked_colors
     
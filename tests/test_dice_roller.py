@@ -0,0 +1,134 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.dice_roller import DiceRoller
+from app.core.die import DieColor
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.core.rng import spawn_generators, stream_seed
+
+
+class RollBatchTests(unittest.TestCase):
+    def test_roll_batch_shape_and_range(self):
+        # Arrange
+        roller = DiceRoller()
+
+        # Act
+        rolls = roller.roll_batch(1000)
+
+        # Assert
+        self.assertEqual(rolls.shape, (1000, 6))
+        self.assertEqual(rolls.min(), 1)
+        self.assertEqual(rolls.max(), 6)
+
+    def test_queued_rolls_are_used_in_order(self):
+        # Arrange
+        roller = DiceRoller()
+        roller.queue_rolls([[1, 2, 3, 4, 5, 6], [6, 5, 4, 3, 2, 1]])
+
+        # Act
+        first = roller.roll_all()
+        second = roller.roll_all()
+
+        # Assert
+        self.assertEqual(list(first.values()), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(second.values()), [6, 5, 4, 3, 2, 1])
+        self.assertEqual(roller.get_white_sum(), 11)
+        self.assertEqual(roller.get_all_dice_values(), second)
+        self.assertEqual(len(roller.queued_rolls), 0)
+
+
+class RollOptionsTests(unittest.TestCase):
+    def test_colored_sums_are_deduplicated(self):
+        # Arrange
+        roller = DiceRoller()
+        roller.set_values([3, 3, 1, 2, 5, 6])
+
+        # Act
+        options = roller.get_roll_options()
+
+        # Assert
+        self.assertEqual(options.white_sum, 6)
+        self.assertEqual(options.colored_sums[DieColor.RED], (4,))
+        self.assertTrue(options.is_colored_sum(DieColor.BLUE, 9))
+        self.assertFalse(options.is_colored_sum(DieColor.BLUE, 6))
+        with self.assertRaises(TypeError):
+            options.colored_sums[DieColor.RED] = (5,)
+
+    def test_game_keeps_options_for_the_roll_only(self):
+        # Arrange
+        game = Game(num_players=2)
+        game.queue_dice([[1, 2, 3, 4, 5, 6]])
+
+        # Act
+        game.roll_dice()
+        options = game.get_roll_options()
+        game.player_done_making_moves()
+        game.player_done_making_moves()
+
+        # Assert
+        self.assertEqual(options.colored_sums[DieColor.GREEN], (6, 7))
+        self.assertIsNone(game.get_roll_options())
+
+
+class GameQueuedDiceTests(unittest.TestCase):
+    def test_game_rolls_queued_dice(self):
+        # Arrange
+        game = Game(num_players=2)
+        game.queue_dice(DiceRoller().roll_batch(3))
+        expected = list(game.dice_roller.queued_rolls[0])
+
+        # Act
+        game.roll_dice()
+
+        # Assert
+        self.assertEqual(list(game.get_dice_results().values()), expected)
+        self.assertEqual(game.get_state(), GameState.STAGE_1_MOVES)
+        self.assertEqual(len(game.dice_roller.queued_rolls), 2)
+
+
+
+class SeededRandomStreamTests(unittest.TestCase):
+    def play_turns(self, seed):
+        game = Game(num_players=1, seed=seed)
+        rolls = []
+        for _ in range(5):
+            game.roll_dice()
+            rolls.append(game.get_dice_results())
+            game.handle_ai_stage_1_move()
+            game.player_done_making_moves()
+            game.player_done_making_moves()
+        return rolls, game.players[1].get_scoresheet().pack()
+
+    def test_same_seed_replays_dice_and_ai_choices(self):
+        # Act
+        first = self.play_turns(42)
+        second = self.play_turns(42)
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertNotEqual(first[0], self.play_turns(43)[0])
+
+    def test_substreams_depend_only_on_index(self):
+        # Act
+        direct = DiceRoller(stream_seed(7, 3)).roll_batch(10)
+        again = DiceRoller(stream_seed(7, 3)).roll_batch(10)
+        other = DiceRoller(stream_seed(7, 4)).roll_batch(10)
+
+        # Assert
+        self.assertTrue((direct == again).all())
+        self.assertFalse((direct == other).all())
+
+    def test_spawned_generators_are_independent(self):
+        # Act
+        first, second = spawn_generators(5, 2)
+
+        # Assert
+        self.assertFalse((first.integers(0, 1000, 20) == second.integers(0, 1000, 20)).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,254 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core import ai_player
+from app.core.die import DieColor
+from app.core.endgame import (
+    ENDGAME_MAX_NODES,
+    ENDGAME_MAX_STATES,
+    MIN_HAZARD,
+    SOLVED_DEPTH,
+    EndgameSolver,
+    OpponentModel,
+    is_endgame,
+    opponent_model,
+    reachable_positions,
+)
+from app.core.expectimax import RootOption, add_penalty, mark, score, state_from_scoresheet
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.core.scoresheet import Scoresheet
+from app.core.transposition import TranspositionTable
+
+
+def sheet_with(marks, penalties=0):
+    sheet = Scoresheet()
+    for color, numbers in marks.items():
+        for number in numbers:
+            sheet.mark_number(color, number)
+    for _ in range(penalties):
+        sheet.add_penalty()
+    return sheet
+
+
+# Rows nearly full, so the endgame is small enough to solve
+LATE_MARKS = {
+    DieColor.RED: (2, 3, 4, 5, 6, 7, 8, 9),
+    DieColor.GREEN: (12, 11, 10, 9, 8, 7, 6, 5),
+    DieColor.BLUE: (12, 11, 10, 9, 8, 7, 6, 5, 4),
+}
+
+# One step further along, within ENDGAME_MAX_STATES
+FINAL_MARKS = {
+    DieColor.RED: (2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+    DieColor.GREEN: (12, 11, 10, 9, 8, 7, 6, 5, 4, 3),
+    DieColor.BLUE: (12, 11, 10, 9, 8, 7, 6, 5, 4, 3),
+}
+
+
+class EndgameDetectionTests(unittest.TestCase):
+    def test_a_closed_row_or_three_penalties_start_the_endgame(self):
+        # Arrange
+        fresh = state_from_scoresheet(Scoresheet(), set())
+        closed = state_from_scoresheet(Scoresheet(), {DieColor.YELLOW})
+        penalized = state_from_scoresheet(sheet_with({}, penalties=3), set())
+
+        # Act / Assert
+        self.assertFalse(is_endgame([fresh, fresh]))
+        self.assertTrue(is_endgame([fresh, closed]))
+        self.assertTrue(is_endgame([penalized, fresh]))
+
+    def test_reachable_positions_shrink_as_rows_fill(self):
+        # Arrange
+        state = state_from_scoresheet(sheet_with(LATE_MARKS, penalties=1), {DieColor.YELLOW})
+
+        # Act
+        positions = reachable_positions(state)
+
+        # Assert
+        self.assertEqual(positions, 3 * 2**3 * 2**3 * 2**2)
+        self.assertEqual(reachable_positions(state_from_scoresheet(Scoresheet(), set())), 4 * 2**44)
+
+
+class OpponentModelTests(unittest.TestCase):
+    def test_a_stuck_opponent_on_three_penalties_ends_the_game_on_their_roll(self):
+        # Arrange
+        own = state_from_scoresheet(Scoresheet(), {DieColor.YELLOW})
+        dead_rows = {DieColor.RED: (10, 11), DieColor.GREEN: (4, 3), DieColor.BLUE: (4, 3)}
+        stuck = state_from_scoresheet(sheet_with(dead_rows, penalties=3), {DieColor.YELLOW})
+
+        # Act
+        model = opponent_model((own, stuck), 0)
+
+        # Assert
+        self.assertEqual(model.hazards[0], MIN_HAZARD)
+        self.assertEqual(model.hazards[1], 1.0)
+
+    def test_an_opponent_who_can_lock_ends_the_game_more_often_on_their_roll(self):
+        # Arrange
+        own = state_from_scoresheet(Scoresheet(), {DieColor.YELLOW})
+        opponent = state_from_scoresheet(
+            sheet_with({DieColor.RED: (2, 3, 4, 5, 6)}), {DieColor.YELLOW}
+        )
+
+        # Act
+        model = opponent_model((own, opponent), 0)
+
+        # Assert
+        self.assertGreater(model.hazards[1], model.hazards[0])
+        self.assertGreater(model.gains[1], model.gains[0])
+
+
+class EndgameSolverTests(unittest.TestCase):
+    def setUp(self):
+        self.model = OpponentModel((0.1, 0.2), (1.0, 2.0))
+        self.state = state_from_scoresheet(
+            sheet_with(LATE_MARKS, penalties=3), {DieColor.YELLOW}
+        )
+
+    def test_a_fourth_penalty_is_avoided(self):
+        # Arrange
+        solver = EndgameSolver(self.model, 0, table=TranspositionTable())
+        marked = mark(self.state, 0, 10)
+        options = [
+            RootOption((DieColor.RED, 10), (marked,)),
+            RootOption(None, (add_penalty(self.state),)),
+        ]
+
+        # Act
+        result = solver.solve(options)
+
+        # Assert
+        self.assertEqual(result.depth, SOLVED_DEPTH)
+        self.assertEqual(result.values[1], score(add_penalty(self.state)))
+        self.assertGreater(result.values[0], result.values[1])
+
+    def test_solved_positions_are_reused(self):
+        # Arrange
+        table = TranspositionTable()
+        options = [RootOption(None, (self.state,))]
+        first = EndgameSolver(self.model, 1, table=table).solve(options)
+
+        # Act
+        second = EndgameSolver(self.model, 1, table=table).solve(options)
+        other_model = EndgameSolver(OpponentModel((0.3, 0.2), (1.0, 2.0)), 1, table=table)
+        third = other_model.solve(options)
+
+        # Assert
+        self.assertGreater(first.nodes, 0)
+        self.assertEqual(second.nodes, 0)
+        self.assertEqual(second.values, first.values)
+        self.assertGreater(third.nodes, 0)
+
+    def test_solve_gives_up_when_out_of_time(self):
+        # Arrange
+        ticks = iter(range(1000))
+        solver = EndgameSolver(self.model, 0, clock=lambda: next(ticks), table=TranspositionTable())
+
+        # Act
+        result = solver.solve([RootOption(None, (self.state,))], time_budget=0.5)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_solve_gives_up_past_its_node_budget(self):
+        # Arrange
+        solver = EndgameSolver(self.model, 0, table=TranspositionTable())
+
+        # Act
+        result = solver.solve([RootOption(None, (self.state,))], max_nodes=3)
+
+        # Assert
+        self.assertIsNone(result)
+        self.assertEqual(solver.nodes, 3)
+
+
+class EndgamePlayerTests(unittest.TestCase):
+    def test_hard_solves_the_endgame(self):
+        for seed in range(20):
+            # Arrange
+            game = Game(simulation=True, ai_strategies=["hard", "hard"], seed=seed)
+            player = game.get_players()[0]
+            player.scoresheet = sheet_with(FINAL_MARKS)
+            game.locked_colors.add(DieColor.YELLOW)
+            game.roll_dice()
+            if not player.get_available_moves(game):
+                continue
+
+            # Act
+            decision = player.decide(game, 1)
+
+            # Assert
+            self.assertEqual(player.last_search.depth, SOLVED_DEPTH)
+            self.assertEqual(len(decision.scored_moves), len(player.get_available_moves(game)))
+
+    def test_solves_stay_within_their_budget(self):
+        for seed in range(20):
+            # Arrange
+            ai_player.ENDGAME_TRANSPOSITIONS.clear()
+            game = Game(simulation=True, ai_strategies=["hard", "hard"], seed=seed)
+            player = game.get_players()[0]
+            player.scoresheet = sheet_with(FINAL_MARKS)
+            game.locked_colors.add(DieColor.YELLOW)
+            game.roll_dice()
+            state = state_from_scoresheet(player.get_scoresheet(), game.get_locked_colors())
+            start = time.perf_counter()
+
+            # Act
+            player.decide(game, 1)
+
+            # Assert
+            self.assertLessEqual(reachable_positions(state), ENDGAME_MAX_STATES)
+            if player.last_search is not None:
+                self.assertLessEqual(player.last_search.nodes, ENDGAME_MAX_NODES)
+            self.assertLess(time.perf_counter() - start, 0.05)
+
+    def test_sheets_over_the_node_budget_fall_back(self):
+        # Arrange
+        ai_player.ENDGAME_TRANSPOSITIONS.clear()
+        game = Game(simulation=True, ai_strategies=["hard", "hard"], seed=2)
+        player = game.get_players()[0]
+        player.scoresheet = sheet_with(LATE_MARKS)
+        game.locked_colors.add(DieColor.YELLOW)
+        game.roll_dice()
+
+        # Act
+        with patch.object(ai_player, "ENDGAME_MAX_STATES", 4096):
+            decision = player.decide(game, 1)
+
+        # Assert
+        self.assertIsNone(player.last_search)
+        self.assertEqual(len(decision.scored_moves), len(player.get_available_moves(game)))
+
+    def test_open_sheets_are_left_to_the_heuristics(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["hard", "hard"], seed=1)
+        player = game.get_players()[0]
+        game.locked_colors.add(DieColor.YELLOW)
+        game.roll_dice()
+
+        # Act
+        player.decide(game, 1)
+
+        # Assert
+        self.assertIsNone(player.last_search)
+
+    def test_games_with_the_solver_finish(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["hard", "expert"], seed=6)
+        game.get_players()[1].search_depth = 1
+
+        # Act
+        game.play_ai_game()
+
+        # Assert
+        self.assertEqual(game.get_state(), GameState.GAME_OVER)
+
+
+if __name__ == "__main__":
+    unittest.main()
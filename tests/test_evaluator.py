@@ -0,0 +1,122 @@
+import os
+import random
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.ai_player import row_value_deltas
+from app.core.evaluator import (
+    ADVANCED_WEIGHTS,
+    BASIC_WEIGHTS,
+    COLOR_INDEX,
+    EVALUATORS,
+    NUM_FEATURES,
+    ROW_POSITIONS,
+    feature_matrix,
+    score_batch,
+    score_matrix,
+)
+from app.core.game import Game
+from app.core.game_state import GameState
+
+
+def reference_basic_score(player, game, color, number):
+    """The hand-written basic bonus chain, with row positions by value delta."""
+    row = player.get_scoresheet().rows[color]
+    marked_count = row.mark_count
+    score = marked_count * 2
+    deltas = row_value_deltas(len(game.get_players()))
+    score += deltas[row.mask][ROW_POSITIONS[COLOR_INDEX[color]][number]] * 3
+    score += player._calculate_end_number_bonus(color, number)
+    if player._can_enable_row_lock(row, number, marked_count):
+        score += 8
+    score += player._calculate_penalty_avoidance_bonus(game)
+    others = sum(
+        p.get_scoresheet().rows[color].mark_count for p in game.get_players() if p != player
+    )
+    if others > marked_count + 2:
+        score -= 2
+    return score
+
+
+def reference_advanced_score(player, game, color, number):
+    """The hand-written advanced bonus chain the evaluator replaced."""
+    row = player.get_scoresheet().rows[color]
+    score = reference_basic_score(player, game, color, number)
+    score += player._calculate_opponent_blocking_bonus(game, color, number)
+    score += player._calculate_probability_bonus(color, number)
+    score += player._calculate_game_phase_bonus(game, color, number)
+    score += player._calculate_enhanced_row_lock_value(game, color, number)
+    score += player._calculate_row_synergy_bonus(player.get_scoresheet(), color)
+    if len(game.get_locked_colors()) >= 1:
+        score += player._calculate_potential_row_score(row, row.mark_count + 1) * 0.7
+    return score
+
+
+def random_positions(count):
+    """Yield (game, player) pairs from partly played seeded games."""
+    rng = random.Random(7)
+    for seed in range(count):
+        game = Game(simulation=True, ai_strategies=["hard", "medium", "easy"], seed=seed)
+        for _ in range(rng.randint(0, 40)):
+            game.roll_dice()
+            while game.state == GameState.STAGE_1_MOVES:
+                game.handle_ai_stage_1_move()
+            while game.state == GameState.STAGE_2_MOVES:
+                game.handle_ai_stage_2_move()
+            if game.state == GameState.GAME_OVER:
+                break
+        if game.state == GameState.GAME_OVER:
+            continue
+        game.roll_dice()
+        for player in game.get_players():
+            yield game, player
+
+
+class LinearEvaluatorTests(unittest.TestCase):
+    def test_scores_match_the_bonus_chain(self):
+        for game, player in random_positions(60):
+            # Arrange
+            moves = player.get_available_moves(game)
+            if not moves:
+                continue
+            features = player.get_board_features(game)
+
+            # Act
+            matrix = feature_matrix(moves, features)
+            basic = score_matrix(matrix, BASIC_WEIGHTS)
+            advanced = score_matrix(matrix, ADVANCED_WEIGHTS)
+            fast_basic = EVALUATORS["medium"].score_moves(moves, features)
+            fast_advanced = EVALUATORS["hard"].score_moves(moves, features)
+
+            # Assert
+            for i, (color, number) in enumerate(moves):
+                expected_basic = reference_basic_score(player, game, color, number)
+                expected_advanced = reference_advanced_score(player, game, color, number)
+                self.assertAlmostEqual(basic[i], expected_basic, places=9)
+                self.assertAlmostEqual(fast_basic[i], expected_basic, places=9)
+                self.assertAlmostEqual(advanced[i], expected_advanced, places=9)
+                self.assertAlmostEqual(fast_advanced[i], expected_advanced, places=9)
+
+    def test_score_batch_matches_per_decision_scores(self):
+        # Arrange
+        matrices = []
+        for game, player in random_positions(10):
+            moves = player.get_available_moves(game)
+            matrices.append(feature_matrix(moves, player.get_board_features(game)))
+
+        # Act
+        batched = score_batch(matrices, ADVANCED_WEIGHTS)
+
+        # Assert
+        self.assertEqual(len(batched), len(matrices))
+        for matrix, scores in zip(matrices, batched):
+            self.assertEqual(matrix.shape[1], NUM_FEATURES)
+            np.testing.assert_array_equal(scores, score_matrix(matrix, ADVANCED_WEIGHTS))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import itertools
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.expectimax import (
+    WHITE_PAIRS,
+    WHITE_SUM_PROBABILITIES,
+    ExpectimaxSearch,
+    RootOption,
+    add_penalty,
+    mark,
+    state_from_scoresheet,
+)
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.core.scoresheet import Scoresheet
+
+
+def brute_force_own_roll(search, state):
+    """Expected best leaf value over all 6^6 dice outcomes of an own roll."""
+    leaf = search.leaf_value
+    total = 0.0
+    for w1, w2, *colored in itertools.product(range(1, 7), repeat=6):
+        white_states = [(add_penalty(state), state)]
+        for row in range(4):
+            marked = mark(state, row, w1 + w2)
+            if marked is not None:
+                white_states.append((marked, marked))
+        best = float("-inf")
+        for no_colored, after_white in white_states:
+            best = max(best, leaf(no_colored))
+            for row, die in enumerate(colored):
+                for number in (w1 + die, w2 + die):
+                    marked = mark(after_white, row, number)
+                    if marked is not None:
+                        best = max(best, leaf(marked))
+        total += best
+    return total / 6**6
+
+
+class DiceDistributionTests(unittest.TestCase):
+    def test_white_classes_cover_all_outcomes(self):
+        # Arrange
+        counts = {}
+        for w1, w2 in itertools.product(range(1, 7), repeat=2):
+            counts[w1 + w2] = counts.get(w1 + w2, 0) + 1
+
+        # Act
+        pair_total = sum(p for _, _, p in WHITE_PAIRS)
+
+        # Assert
+        self.assertEqual(len(WHITE_PAIRS), 21)
+        self.assertAlmostEqual(pair_total, 1.0)
+        for total, count in counts.items():
+            self.assertAlmostEqual(WHITE_SUM_PROBABILITIES[total], count / 36)
+
+    def test_own_roll_matches_brute_force(self):
+        # Arrange
+        sheet = Scoresheet()
+        for color, number in ((DieColor.RED, 4), (DieColor.GREEN, 9), (DieColor.BLUE, 11)):
+            sheet.mark_number(color, number)
+        sheet.add_penalty()
+        state = state_from_scoresheet(sheet, {DieColor.YELLOW})
+        search = ExpectimaxSearch(num_players=2, turn_offset=1)
+
+        # Act
+        value = search.value(state, 1, 1)
+
+        # Assert
+        self.assertAlmostEqual(value, brute_force_own_roll(search, state), places=9)
+
+
+class ExpectimaxSearchTests(unittest.TestCase):
+    def test_marking_the_last_number_locks_the_row(self):
+        # Arrange
+        sheet = Scoresheet()
+        for number in (2, 3, 4, 5, 6):
+            sheet.mark_number(DieColor.RED, number)
+        state = state_from_scoresheet(sheet, set())
+
+        # Act
+        locked = mark(state, 0, 12)
+
+        # Assert
+        self.assertIsNotNone(locked)
+        self.assertIsNone(mark(locked, 0, 12))
+        self.assertIsNone(mark(state, 0, 4))
+
+    def test_search_gives_up_when_out_of_time(self):
+        # Arrange
+        ticks = iter(range(1000))
+        search = ExpectimaxSearch(2, 0, clock=lambda: next(ticks))
+        state = state_from_scoresheet(Scoresheet(), set())
+        options = [RootOption(None, (state,))]
+
+        # Act
+        result = search.search(options, max_depth=2, time_budget=0.5)
+
+        # Assert
+        self.assertIsNone(result)
+
+    def test_deeper_searches_replace_shallower_ones(self):
+        # Arrange
+        search = ExpectimaxSearch(3, 1)
+        state = state_from_scoresheet(Scoresheet(), set())
+        options = [RootOption(None, (state,)), RootOption((DieColor.RED, 2), (mark(state, 0, 2),))]
+
+        # Act
+        result = search.search(options, max_depth=2, time_budget=None)
+
+        # Assert
+        self.assertEqual(result.depth, 2)
+        self.assertGreater(result.values[1], result.values[0])
+
+
+class ExpertPlayerTests(unittest.TestCase):
+    def test_expert_plays_a_full_game(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["expert", "hard"], seed=4)
+        expert = game.get_players()[0]
+        expert.search_depth = 1
+        expert.time_budget = None
+        expert.solve_endgames = False
+
+        # Act
+        game.play_ai_game()
+
+        # Assert
+        self.assertEqual(game.get_state(), GameState.GAME_OVER)
+        self.assertEqual(expert.last_search.depth, 1)
+
+    def test_expert_scores_row_values_without_time(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["expert", "hard"], seed=8)
+        expert = game.get_players()[0]
+        expert.time_budget = -1.0
+        game.roll_dice()
+
+        # Act
+        decision = expert.decide(game, 1)
+
+        # Assert
+        self.assertIsNotNone(expert.row_values)
+        self.assertEqual(expert.last_search.depth, 0)
+        self.assertEqual(len(decision.scored_moves), len(expert.get_available_moves(game)))
+
+    def test_expert_falls_back_to_hard_play_without_time(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["expert", "hard"], seed=8)
+        expert = game.get_players()[0]
+        expert.time_budget = -1.0
+        expert.row_values = None
+        game.roll_dice()
+
+        # Act
+        decision = expert.decide(game, 1)
+
+        # Assert
+        self.assertIsNone(expert.last_search)
+        self.assertTrue(decision.scored_moves)
+        self.assertEqual(len(decision.scored_moves), len(expert.get_available_moves(game)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import os
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core import mcts
+from app.core.die import DieColor
+from app.core.game import Game
+from app.core.game_state import GameState
+
+
+class SerialPool:
+    """Stand-in for the process pool that runs tasks on submission."""
+
+    class Result:
+        def __init__(self, value):
+            self.value = value
+
+        def get(self, timeout=None):
+            return self.value
+
+    def __init__(self):
+        self.tasks = 0
+
+    def apply_async(self, func, args):
+        self.tasks += 1
+        return self.Result(func(*args))
+
+
+def mid_game(seed, rolls=12):
+    """A seeded all-AI game stopped at a stage 1 decision."""
+    game = Game(simulation=True, ai_strategies=["hard", "medium", "easy"], seed=seed)
+    for _ in range(rolls):
+        game.roll_dice()
+        while game.state == GameState.STAGE_1_MOVES:
+            game.handle_ai_stage_1_move()
+        while game.state == GameState.STAGE_2_MOVES:
+            game.handle_ai_stage_2_move()
+    while game.state != GameState.STAGE_1_MOVES:
+        game.roll_dice()
+    return game
+
+
+class GameSnapshotTests(unittest.TestCase):
+    def test_snapshot_round_trips(self):
+        # Arrange
+        game = mid_game(seed=5)
+        game.handle_ai_stage_1_move()
+        snapshot = game.snapshot()
+
+        # Act
+        restored = Game.from_snapshot(snapshot, ["easy", "easy", "easy"], seed=1)
+
+        # Assert
+        self.assertEqual(restored.snapshot(), snapshot)
+        self.assertEqual(restored.get_roll_options(), game.get_roll_options())
+        self.assertTrue(restored.get_current_player().is_active_player())
+        for original, copy in zip(game.get_players(), restored.get_players()):
+            self.assertEqual(copy.get_total_score(), original.get_total_score())
+
+
+class MCTSSearchTests(unittest.TestCase):
+    def test_reward_maps_the_margin_into_unit_range(self):
+        # Act / Assert
+        self.assertEqual(mcts.reward([30, 30], 0), 0.5)
+        self.assertEqual(mcts.reward([100, 0, 10], 0), 1.0)
+        self.assertEqual(mcts.reward([0, 100], 0), 0.0)
+        self.assertAlmostEqual(mcts.reward([30, 20, 10], 0), 0.5 + 5 / mcts.MARGIN_SCALE)
+
+    def test_unvisited_options_are_tried_first(self):
+        # Act / Assert
+        self.assertEqual(mcts.select_option([3, 0, 2], [2.0, 0.0, 1.0]), 1)
+        self.assertEqual(mcts.select_option([10, 10], [2.0, 8.0]), 1)
+
+    def test_search_is_reproducible_without_a_deadline(self):
+        # Arrange
+        game = mid_game(seed=2)
+        player = game.get_players()[0]
+        moves = [*player.get_available_moves(game), None]
+
+        # Act
+        first = mcts.search(
+            game.snapshot(), 0, 1, moves, seed=9, workers=1, time_budget=None, max_rollouts=12
+        )
+        second = mcts.search(
+            game.snapshot(), 0, 1, moves, seed=9, workers=1, time_budget=None, max_rollouts=12
+        )
+
+        # Assert
+        self.assertEqual(first, second)
+        self.assertEqual(first.rollouts, 12)
+        self.assertEqual(first.workers, 1)
+
+    def test_root_parallel_search_merges_worker_statistics(self):
+        # Arrange
+        game = mid_game(seed=3)
+        moves = [*game.get_players()[1].get_available_moves(game), None]
+        pool = SerialPool()
+
+        # Act
+        result = mcts.search(
+            game.snapshot(), 1, 1, moves, seed=4,
+            workers=3, time_budget=None, max_rollouts=8,
+            pool_factory=lambda workers: pool,
+        )
+
+        # Assert
+        self.assertEqual(pool.tasks, 2)
+        self.assertEqual(result.workers, 3)
+        self.assertEqual(result.rollouts, 24)
+        self.assertEqual(sum(result.visits), 24)
+
+    def test_process_pool_search_respects_the_deadline(self):
+        # Arrange
+        game = mid_game(seed=6)
+        moves = [*game.get_players()[0].get_available_moves(game), None]
+
+        # Act
+        result = mcts.search(game.snapshot(), 0, 1, moves, seed=1, workers=2, time_budget=0.1)
+
+        # Assert
+        self.assertGreaterEqual(result.workers, 1)
+        self.assertLessEqual(result.workers, 2)
+        self.assertGreater(result.rollouts, 0)
+
+    def test_queued_tasks_stop_at_the_decision_deadline(self):
+        # Arrange
+        game = mid_game(seed=6)
+        moves = [*game.get_players()[0].get_available_moves(game), None]
+        task = (game.snapshot(), 0, 1, moves, 1, time.monotonic() - 0.01, 100)
+
+        # Act
+        stats = mcts.search_root(task)
+
+        # Assert
+        self.assertEqual(sum(stats.visits), 0)
+
+    def test_searches_in_worker_processes_use_the_workers_they_are_given(self):
+        # Arrange
+        game = mid_game(seed=6)
+        moves = [*game.get_players()[0].get_available_moves(game), None]
+
+        pool = SerialPool()
+
+        # Act
+        with patch("multiprocessing.parent_process", return_value=object()):
+            result = mcts.search(
+                game.snapshot(), 0, 1, moves, 1,
+                workers=2, time_budget=None, max_rollouts=4,
+                pool_factory=lambda workers: pool,
+            )
+
+        # Assert
+        self.assertEqual(result.workers, 2)
+        self.assertEqual(pool.tasks, 1)
+
+
+class MCTSPlayerTests(unittest.TestCase):
+    def test_mcts_plays_a_full_game(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["mcts", "hard"], seed=4)
+        player = game.get_players()[0]
+        player.mcts_time_budget = None
+        player.mcts_rollouts = 6
+
+        # Act
+        game.play_ai_game()
+
+        # Assert
+        self.assertEqual(game.get_state(), GameState.GAME_OVER)
+        self.assertIsInstance(player.last_search, mcts.MCTSResult)
+
+    def test_mcts_falls_back_to_hard_play_without_time(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["mcts", "hard"], seed=8)
+        player = game.get_players()[0]
+        player.mcts_time_budget = -1.0
+        game.roll_dice()
+
+        # Act
+        decision = player.decide(game, 1)
+
+        # Assert
+        self.assertEqual(player.last_search.rollouts, 0)
+        self.assertEqual(len(decision.scored_moves), len(player.get_available_moves(game)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.expectimax import state_from_scoresheet
+from app.core.game import Game
+from app.core.opening_book import (
+    ACTIONS,
+    RECORD,
+    SKIP,
+    book_key,
+    load_opening_book,
+    read_opening_book,
+    write_opening_book,
+)
+from app.tools.build_opening_book import build
+
+EMPTY = (0, 0, 0, 0, 0, 0, 0)
+
+
+def write_book(directory, records):
+    path = os.path.join(directory, "book.bin")
+    write_opening_book(path, np.array(records, dtype=RECORD))
+    return read_opening_book(path)
+
+
+class BookKeyTests(unittest.TestCase):
+    def test_every_part_of_the_position_changes_the_key(self):
+        # Arrange
+        base = book_key(EMPTY, 7, rolling=False, num_players=2)
+
+        # Act
+        others = [
+            book_key((1, 0, 0, 0, 0, 0, 0), 7, False, 2),
+            book_key(EMPTY, 8, False, 2),
+            book_key(EMPTY, 7, True, 2),
+            book_key(EMPTY, 7, False, 3),
+        ]
+
+        # Assert
+        self.assertEqual(len({base, *others}), 5)
+
+    def test_positions_past_the_opening_are_not_in_the_book(self):
+        # Act
+        keys = [
+            book_key((1, 1, 0, 0, 0, 0, 0), 7, False, 2),
+            book_key((0, 0, 0, 0, 0, 0, 1), 7, False, 2),
+            book_key((0, 0, 0, 0, 0, 1, 0), 7, False, 2),
+        ]
+
+        # Assert
+        self.assertEqual(keys, [None, None, None])
+
+
+class BookFileTests(unittest.TestCase):
+    def test_book_round_trips_through_a_memory_map(self):
+        # Arrange
+        keys = [book_key(EMPTY, total, False, 2) for total in range(2, 13)]
+        values = np.random.default_rng(4).random((len(keys), ACTIONS))
+        with tempfile.TemporaryDirectory() as directory:
+            # Act
+            book = write_book(directory, list(zip(reversed(keys), reversed(values))))
+
+            # Assert
+            self.assertEqual(len(book), len(keys))
+            self.assertIsInstance(book.records, np.memmap)
+            np.testing.assert_allclose(book.lookup(keys[3]), values[3], rtol=1e-3)
+            self.assertIsNone(book.lookup(book_key(EMPTY, 7, True, 2)))
+            del book
+
+    def test_other_files_are_rejected(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.bin")
+            with open(path, "wb") as f:
+                f.write(b"not an opening book at all")
+
+            # Act / Assert
+            with self.assertRaises(ValueError):
+                read_opening_book(path)
+
+    def test_missing_book_loads_as_none(self):
+        # Act
+        book = load_opening_book("/nonexistent/opening_book.bin")
+
+        # Assert
+        self.assertIsNone(book)
+
+
+class BookDecisionTests(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(simulation=True, ai_strategies=["hard", "hard"], seed=2)
+        self.game.queue_dice([(3, 4, 1, 1, 1, 1)])
+        self.game.roll_dice()
+        self.player = self.game.get_players()[1]
+        self.player.opening_book = None
+        self.key = book_key(
+            state_from_scoresheet(self.player.get_scoresheet(), set()), 7, False, 2
+        )
+
+    def test_book_move_is_played(self):
+        # Arrange
+        values = [0.5, 0.4, 0.45, 0.6, 0.3]  # Green 7 is best
+        with tempfile.TemporaryDirectory() as directory:
+            self.player.opening_book = write_book(directory, [(self.key, values)])
+
+            # Act
+            decision = self.player.decide(self.game, 1)
+
+            # Assert
+            self.assertEqual(decision.move, (DieColor.GREEN, 7))
+            self.assertEqual(len(decision.scored_moves), 4)
+            self.assertAlmostEqual(decision.scored_moves[0][0], 0.6, places=3)
+
+    def test_book_can_wait(self):
+        # Arrange
+        values = [0.7, 0.4, 0.45, 0.6, 0.3]
+        with tempfile.TemporaryDirectory() as directory:
+            self.player.opening_book = write_book(directory, [(self.key, values)])
+
+            # Act
+            decision = self.player.decide(self.game, 1)
+
+            # Assert
+            self.assertFalse(decision.participate)
+            self.assertIsNone(decision.move)
+
+    def test_positions_missing_from_the_book_are_scored(self):
+        # Arrange
+        expected = self.player.decide(self.game, 1).scored_moves
+        other_key = book_key(EMPTY, 8, False, 2)
+        with tempfile.TemporaryDirectory() as directory:
+            self.player.opening_book = write_book(directory, [(other_key, [1, 0, 0, 0, 0])])
+
+            # Act
+            decision = self.player.decide(self.game, 1)
+
+            # Assert
+            self.assertEqual(decision.scored_moves, expected)
+
+
+class BookBuilderTests(unittest.TestCase):
+    def test_build_values_every_legal_action(self):
+        # Act
+        records = build(games=1, seed=3, rollouts=1, min_visits=1)
+
+        # Assert
+        self.assertGreater(len(records), 0)
+        for key, values in records:
+            self.assertFalse(np.isnan(values[SKIP]))
+            self.assertGreaterEqual(np.nanmin(values), 0.0)
+            self.assertLessEqual(np.nanmax(values), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
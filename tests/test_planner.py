@@ -0,0 +1,96 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.expectimax import state_from_scoresheet
+from app.core.game import Game
+from app.core.game_state import GameState
+from app.core.planner import TurnPlan, joint_actions, plan_turn
+from app.core.scoresheet import Scoresheet
+
+RED, YELLOW, GREEN = DieColor.RED, DieColor.YELLOW, DieColor.GREEN
+
+
+class JointActionTests(unittest.TestCase):
+    def test_colored_marks_must_stay_legal_after_the_white_mark(self):
+        # Arrange
+        state = state_from_scoresheet(Scoresheet(), set())
+
+        # Act
+        actions = joint_actions(state, [(RED, 7)], [(RED, 5), (RED, 9), (GREEN, 5)])
+
+        # Assert
+        self.assertIn(((RED, 7), (RED, 9)), actions)
+        self.assertIn(((RED, 7), (GREEN, 5)), actions)
+        self.assertIn((None, (RED, 5)), actions)
+        self.assertNotIn(((RED, 7), (RED, 5)), actions)
+        self.assertIn((None, None), actions)
+
+
+class PlanTurnTests(unittest.TestCase):
+    def setUp(self):
+        self.state = state_from_scoresheet(Scoresheet(), set())
+
+    def test_blocking_white_mark_is_dropped_for_a_better_colored_mark(self):
+        # Act
+        plan = plan_turn(
+            self.state, {(RED, 7): 2.0}, {(RED, 3): 9.0}, white_threshold=-5, colored_threshold=-5
+        )
+
+        # Assert
+        self.assertEqual(plan, TurnPlan(None, (RED, 3), 9.0))
+
+    def test_marks_below_the_threshold_are_never_planned(self):
+        # Act
+        plan = plan_turn(
+            self.state, {(YELLOW, 6): -8.0}, {(GREEN, 4): 3.0}, white_threshold=-5, colored_threshold=-5
+        )
+        nothing = plan_turn(self.state, {(YELLOW, 6): -8.0}, {}, -5, -5)
+
+        # Assert
+        self.assertEqual(plan, TurnPlan(None, (GREEN, 4), 3.0))
+        self.assertEqual(nothing, TurnPlan(None, None, 0.0))
+
+    def test_a_weak_mark_beats_skipping_both_stages(self):
+        # Act
+        plan = plan_turn(self.state, {(RED, 7): -3.0}, {}, -10, -10)
+
+        # Assert
+        self.assertEqual(plan.white, (RED, 7))
+
+
+class PlannedPlayerTests(unittest.TestCase):
+    def test_plan_is_made_once_and_followed_in_both_stages(self):
+        for seed in range(30):
+            # Arrange
+            game = Game(simulation=True, ai_strategies=["hard", "medium"], seed=seed)
+            player = game.get_players()[0]
+            player.opening_book = None  # The book would decide the first white mark
+            game.roll_dice()
+            calls = []
+            plan_turn = player._plan_turn
+            player._plan_turn = lambda *args: calls.append(args) or plan_turn(*args)
+
+            # Act
+            while game.state == GameState.STAGE_1_MOVES:
+                game.handle_ai_stage_1_move()
+            while game.state == GameState.STAGE_2_MOVES:
+                game.handle_ai_stage_2_move()
+
+            # Assert
+            if player._turn_plan is None:
+                continue
+            plan = player._turn_plan[1]
+            self.assertEqual(len(calls), 1)
+            marked = plan.white is not None or plan.colored is not None
+            self.assertEqual(player.get_scoresheet().penalties, 0 if marked else 1)
+            for move in (plan.white, plan.colored):
+                if move is not None:
+                    self.assertIn(move[1], player.get_scoresheet().rows[move[0]].marked)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.row_table import LAST_POSITION, NUM_ROW_STATES
+from app.core.row_values import (
+    load_row_values,
+    mark_deltas,
+    read_row_values,
+    write_row_values,
+)
+from app.tools.solve_row_values import solve
+
+
+class RowValueFileTests(unittest.TestCase):
+    def test_table_round_trips_through_a_memory_map(self):
+        # Arrange
+        values = np.random.default_rng(3).random((3, 2, NUM_ROW_STATES), dtype=np.float32)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rows.bin")
+            write_row_values(path, values, min_players=2, hazard=0.05)
+
+            # Act
+            table = read_row_values(path)
+
+            # Assert
+            self.assertIsInstance(table.values, np.memmap)
+            self.assertEqual((table.min_players, table.max_players), (2, 4))
+            self.assertAlmostEqual(table.hazard, 0.05)
+            np.testing.assert_array_equal(table.for_players(3), values[1])
+            np.testing.assert_array_equal(table.for_players(9), values[2])
+            del table
+
+    def test_other_files_are_rejected(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rows.bin")
+            with open(path, "wb") as f:
+                f.write(b"not a table at all, not even close")
+
+            # Act / Assert
+            with self.assertRaises(ValueError):
+                read_row_values(path)
+
+    def test_missing_table_loads_as_none(self):
+        # Act
+        table = load_row_values("/nonexistent/row_values.bin")
+
+        # Assert
+        self.assertIsNone(table)
+
+
+class RowValueSolverTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.values = solve(num_players=3, hazard=0.05)
+
+    def test_marks_never_lose_value(self):
+        # Arrange
+        open_values, locked = self.values
+
+        # Act / Assert
+        for mask in range(NUM_ROW_STATES):
+            points = mask.bit_count() * (mask.bit_count() + 1) / 2
+            self.assertGreaterEqual(open_values[mask], points - 1e-9)
+            self.assertEqual(locked[mask], (mask.bit_count() + 1) * (mask.bit_count() + 2) / 2)
+
+    def test_skipping_numbers_costs_value(self):
+        # Arrange
+        open_values, _ = self.values
+
+        # Act
+        empty, marked_2, marked_7 = open_values[0], open_values[1], open_values[1 << 5]
+
+        # Assert
+        self.assertGreater(marked_2, empty)
+        self.assertGreater(marked_2, marked_7)
+
+    def test_mark_deltas_value_marks_and_locks(self):
+        # Arrange
+        open_values, _ = self.values
+        five_marks = 0b11111
+
+        # Act
+        deltas = mark_deltas(open_values)
+
+        # Assert
+        self.assertAlmostEqual(deltas[0][0], open_values[1] - open_values[0])
+        self.assertGreater(deltas[0][0], deltas[0][9])
+        self.assertEqual(deltas[0][LAST_POSITION], 0.0)  # Cannot lock an empty row
+        self.assertAlmostEqual(deltas[five_marks][LAST_POSITION], 28 - open_values[five_marks])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import random
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.scoresheet import ColorRow, Scoresheet
+
+
+def reference_can_mark(numbers, marked, number):
+    """Straightforward set-based version of the marking rules."""
+    if number in marked or number not in numbers:
+        return False
+    if number == numbers[-1] and len(marked) < 5:
+        return False
+    rightmost = max((numbers.index(n) for n in marked), default=-1)
+    return numbers.index(number) > rightmost
+
+
+class BitmaskRowTests(unittest.TestCase):
+    def test_matches_reference_rules(self):
+        rng = random.Random(1234)
+        for numbers in (list(range(2, 13)), list(range(12, 1, -1))):
+            for _ in range(200):
+                # Arrange
+                row = ColorRow(DieColor.RED, numbers)
+                marked = set()
+
+                for _ in range(15):
+                    number = rng.randint(1, 13)
+
+                    # Act
+                    expected = reference_can_mark(numbers, marked, number)
+
+                    # Assert
+                    self.assertEqual(row.can_mark(number), expected)
+                    self.assertEqual(row.mark_number(number), expected)
+                    if expected:
+                        marked.add(number)
+                    self.assertEqual(row.marked, marked)
+                    self.assertEqual(row.mark_count, len(marked))
+
+    def test_rightmost_marked_tracks_position(self):
+        # Arrange
+        row = ColorRow(DieColor.GREEN, list(range(12, 1, -1)))
+
+        # Act
+        row.mark_number(10)
+
+        # Assert
+        self.assertEqual(row.rightmost_marked, 2)
+        self.assertFalse(row.can_mark(11))
+        self.assertTrue(row.can_mark(9))
+
+
+class AvailableNumbersTests(unittest.TestCase):
+    def test_available_numbers_agree_with_can_mark(self):
+        # Arrange
+        sheet = Scoresheet()
+        for number in (3, 5, 8):
+            sheet.mark_number(DieColor.YELLOW, number)
+
+        # Act
+        available = sheet.get_available_numbers(DieColor.YELLOW)
+
+        # Assert
+        expected = [n for n in range(2, 13) if sheet.can_mark_number(DieColor.YELLOW, n)]
+        self.assertEqual(available, expected)
+        self.assertEqual(available, [9, 10, 11])  # 12 needs 5 marks first
+
+
+class PackedScoresheetTests(unittest.TestCase):
+    def test_pack_round_trip(self):
+        # Arrange
+        sheet = Scoresheet()
+        for number in (2, 3, 4, 5, 6, 12):
+            sheet.mark_number(DieColor.RED, number)
+        sheet.lock_row(DieColor.RED)
+        sheet.mark_number(DieColor.BLUE, 9)
+        sheet.add_penalty()
+        sheet.add_penalty()
+
+        # Act
+        restored = Scoresheet.unpack(sheet.pack())
+
+        # Assert
+        self.assertLess(sheet.pack(), 1 << 51)
+        self.assertEqual(restored.penalties, 2)
+        self.assertTrue(restored.rows[DieColor.RED].is_locked)
+        self.assertEqual(restored.rows[DieColor.RED].marked, {2, 3, 4, 5, 6, 12})
+        self.assertEqual(restored.rows[DieColor.BLUE].marked, {9})
+        self.assertEqual(restored.calculate_total_score(), sheet.calculate_total_score())
+
+
+
+class CachedScoreTests(unittest.TestCase):
+    def test_cached_score_matches_recompute(self):
+        rng = random.Random(99)
+        for _ in range(100):
+            # Arrange
+            sheet = Scoresheet(verify_scores=True)
+
+            # Act
+            for _ in range(30):
+                color = rng.choice(list(sheet.rows))
+                sheet.mark_number(color, rng.randint(2, 12))
+                sheet.lock_row(color)
+                if rng.random() < 0.1:
+                    sheet.add_penalty()
+
+                # Assert
+                self.assertEqual(sheet.calculate_total_score(), sheet.recalculate_total_score())
+
+    def test_verify_mode_detects_stale_cache(self):
+        # Arrange
+        sheet = Scoresheet(verify_scores=True)
+
+        # Act
+        sheet.rows[DieColor.GREEN].mark_number(12)  # Bypasses the scoresheet
+
+        # Assert
+        with self.assertRaises(AssertionError):
+            sheet.calculate_total_score()
+        sheet.refresh_scores()
+        self.assertEqual(sheet.calculate_total_score(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import sys
+import timeit
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.serialization import (
+    CODEC_VERSION,
+    decode_game,
+    decode_snapshot,
+    encode_game,
+    encode_snapshot,
+)
+from tests.helpers import played_game
+
+
+def rolled_game(rolls=10):
+    """A medium-vs-hard game in the middle of a turn."""
+    game = played_game(("medium", "hard"), rolls=rolls)
+    game.roll_dice()
+    return game
+
+
+class SnapshotEncodingTests(unittest.TestCase):
+    def test_positions_round_trip(self):
+        # Arrange
+        snapshot = rolled_game().snapshot()
+
+        # Act
+        restored = decode_snapshot(encode_snapshot(snapshot))
+
+        # Assert
+        self.assertEqual(restored, snapshot)
+
+    def test_locks_penalties_and_stage_flags_round_trip(self):
+        # Arrange
+        game = rolled_game()
+        game.locked_colors = {DieColor.BLUE, DieColor.RED}
+        game.players[1].get_scoresheet().penalties = 4
+        game.stage_1_players_finished = {1}
+        game.rolling_player_made_stage_2_move = True
+        snapshot = game.snapshot()
+
+        # Act
+        restored = decode_snapshot(encode_snapshot(snapshot))
+
+        # Assert
+        self.assertEqual(set(restored.locked_colors), {DieColor.BLUE, DieColor.RED})
+        self.assertEqual(restored.scoresheets, snapshot.scoresheets)
+        self.assertEqual(restored.stage_1_players_finished, (1,))
+        self.assertTrue(restored.rolling_player_made_stage_2_move)
+
+    def test_round_trips_take_microseconds(self):
+        # Arrange
+        snapshot = rolled_game().snapshot()
+
+        # Act
+        seconds = timeit.timeit(lambda: decode_snapshot(encode_snapshot(snapshot)), number=1000) / 1000
+
+        # Assert
+        self.assertLess(seconds, 500e-6)
+
+
+class GameEncodingTests(unittest.TestCase):
+    def test_games_round_trip(self):
+        # Arrange
+        game = rolled_game()
+        game.players_finished_moves = {0}
+
+        # Act
+        restored = decode_game(encode_game(game))
+
+        # Assert
+        self.assertEqual(restored.snapshot(), game.snapshot())
+        self.assertEqual([p.difficulty for p in restored.get_players()], ["medium", "hard"])
+        self.assertEqual(restored.players_finished_moves, {0})
+        self.assertTrue(restored.simulation)
+        self.assertEqual(encode_game(restored), encode_game(game))
+
+    def test_served_games_are_rebuilt_without_logging_their_setup(self):
+        # Arrange
+        game = rolled_game()
+        game.set_simulation(False)
+
+        # Act
+        with patch("app.core.game.setup_logging") as setup_logging:
+            restored = decode_game(encode_game(game))
+
+        # Assert
+        setup_logging.assert_not_called()
+        self.assertFalse(restored.simulation)
+        self.assertIsNotNone(restored.logger)
+        self.assertFalse(any(p.simulation for p in restored.get_players()))
+
+    def test_two_player_games_fit_well_under_100_bytes(self):
+        # Act
+        data = encode_game(rolled_game())
+
+        # Assert
+        self.assertLess(len(data), 32)
+
+    def test_other_versions_and_garbage_are_rejected(self):
+        # Arrange
+        data = encode_game(rolled_game())
+
+        # Act / Assert
+        for bad in (b"", bytes((CODEC_VERSION + 1,)) + data[1:], data[:5], data + b"\xff"):
+            with self.assertRaises(ValueError):
+                decode_game(bad)
+
+    def test_unknown_difficulties_are_rejected(self):
+        # Arrange
+        game = rolled_game(rolls=0)
+        game.ai_strategies = ["medium", "impossible"]
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            encode_game(game)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,673 @@
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.services.session_store import (
+    MemoryStore,
+    RedisStore,
+    SQLiteStore,
+    StaleSessionError,
+    StoredSession,
+    WriteBehindStore,
+    decode_game,
+    encode_game,
+    open_store,
+)
+from app.services.sessions import SessionManager
+from tests.helpers import FakeClock, play_rolls, played_game
+
+
+class FakeRedis:
+    """The part of the redis-py client the store uses, expiring on a fake clock."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.entries = {}
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[1] <= self.clock():
+            self.entries.pop(key, None)
+            return None
+        return entry[0]
+
+    def mget(self, *keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None):
+        self.entries[key] = (bytes(value), self.clock() + ex if ex else float("inf"))
+        return True
+
+    def setrange(self, key, offset, value):
+        old = self.get(key) or b""
+        new = old[:offset].ljust(offset, b"\0") + value + old[offset + len(value):]
+        expires = self.entries[key][1] if key in self.entries else float("inf")
+        self.entries[key] = (new, expires)
+        return len(new)
+
+    def append(self, key, value):
+        return self.setrange(key, len(self.get(key) or b""), value)
+
+    def expire(self, key, seconds):
+        if self.get(key) is None:
+            return False
+        self.entries[key] = (self.entries[key][0], self.clock() + seconds)
+        return True
+
+    def delete(self, *keys):
+        return sum(self.entries.pop(key, None) is not None for key in keys)
+
+    def pipeline(self):
+        pipe = FakePipeline(self)
+        pipe.multi()
+        return pipe
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        pipe = FakePipeline(self)
+        value = func(pipe)
+        results = pipe.execute()
+        return value if value_from_callable else results
+
+
+class FakePipeline:
+    """A FakeRedis transaction: commands run at once until multi(), then queue up."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = None
+
+    def multi(self):
+        self.queued = []
+
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.queued or ()]
+
+    def __getattr__(self, name):
+        command = getattr(self.redis, name)
+        if self.queued is None:
+            return command
+        return lambda *args, **kwargs: self.queued.append((command, args, kwargs))
+
+
+class GameEncodingTests(unittest.TestCase):
+    def test_games_round_trip(self):
+        # Arrange
+        game = played_game(seed=4, rolls=6)
+        game.roll_dice()
+
+        # Act
+        restored = decode_game(encode_game(game))
+
+        # Assert
+        self.assertEqual(restored.snapshot(), game.snapshot())
+        self.assertEqual(restored.message, game.message)
+        self.assertEqual(restored.num_players, 1)
+        self.assertEqual(restored.get_players()[1].difficulty, "medium")
+        self.assertEqual(encode_game(restored), encode_game(game))
+
+    def test_stored_actions_are_replayed_on_the_checkpoint(self):
+        # Arrange
+        game = played_game(seed=4, rolls=2)
+        data = encode_game(game)
+        game.action_log.clear()
+        game.roll_dice()
+        game.player_done_making_moves()
+
+        # Act
+        restored = decode_game(data, game.action_log.to_bytes())
+
+        # Assert
+        self.assertEqual(restored.snapshot(), game.snapshot())
+        self.assertEqual(len(restored.action_log), len(game.action_log))
+
+    def test_other_bytes_are_rejected(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            decode_game(b"not a game")
+
+
+class StoreContract:
+    """Checks every store must pass; subclasses set up self.store and self.clock."""
+
+    def test_saved_sessions_load(self):
+        # Act
+        self.store.save("a", b"first", ttl=60)
+        self.store.save("a", b"second", ttl=60)
+
+        # Assert
+        self.assertEqual(self.store.load("a"), StoredSession(b"second", 2))
+        self.assertIsNone(self.store.load("b"))
+
+    def test_saves_at_the_stored_version_count_it_up(self):
+        # Arrange
+        version = self.store.save("a", b"first", ttl=60)
+
+        # Act
+        new_version = self.store.save("a", b"second", ttl=60, version=version)
+
+        # Assert
+        self.assertEqual((version, new_version), (1, 2))
+        self.assertEqual(self.store.load("a"), StoredSession(b"second", 2))
+
+    def test_stale_saves_are_rejected(self):
+        # Arrange
+        version = self.store.save("a", b"first", ttl=60)
+        self.store.save("a", b"other worker", ttl=60, version=version)
+
+        # Act / Assert
+        with self.assertRaises(StaleSessionError):
+            self.store.save("a", b"second", ttl=60, version=version)
+        with self.assertRaises(StaleSessionError):
+            self.store.save("b", b"deleted meanwhile", ttl=60, version=version)
+        self.assertEqual(self.store.load("a"), StoredSession(b"other worker", 2))
+        self.assertIsNone(self.store.load("b"))
+
+    def test_appended_actions_load_after_the_checkpoint(self):
+        # Arrange
+        version = self.store.save("a", b"game", ttl=60)
+
+        # Act
+        version = self.store.append_actions("a", b"abc", ttl=60, version=version)
+        version = self.store.append_actions("a", b"def", ttl=60, version=version)
+
+        # Assert
+        self.assertEqual(self.store.load("a"), StoredSession(b"game", 3, b"abcdef"))
+        with self.assertRaises(StaleSessionError):
+            self.store.append_actions("a", b"ghi", ttl=60, version=2)
+        self.store.save("a", b"checkpoint", ttl=60, version=version)
+        self.assertEqual(self.store.load("a"), StoredSession(b"checkpoint", 4))
+
+    def test_deleted_sessions_are_gone(self):
+        # Arrange
+        self.store.save("a", b"data", ttl=60)
+        self.store.append_actions("a", b"abc", ttl=60, version=1)
+
+        # Act
+        self.store.delete("a")
+
+        # Assert
+        self.assertIsNone(self.store.load("a"))
+
+    def test_sessions_expire(self):
+        # Arrange
+        self.store.save("a", b"data", ttl=60)
+
+        # Act
+        self.clock.now += 61
+
+        # Assert
+        self.assertIsNone(self.store.load("a"))
+
+    def test_touched_sessions_stay_until_their_new_ttl(self):
+        # Arrange
+        self.store.save("a", b"data", ttl=60)
+        self.clock.now += 50
+
+        # Act
+        self.store.touch("a", ttl=60)
+        self.store.touch("b", ttl=60)
+        self.clock.now += 50
+
+        # Assert
+        self.assertEqual(self.store.load("a"), StoredSession(b"data", 1))
+        self.assertIsNone(self.store.load("b"))
+
+
+class MemoryStoreTests(StoreContract, unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = MemoryStore(clock=self.clock)
+
+
+class SQLiteStoreTests(StoreContract, unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "sessions.db")
+        self.clock = FakeClock()
+        self.store = SQLiteStore(self.path, clock=self.clock)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_database_is_in_wal_mode(self):
+        # Act
+        mode = self.store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+        # Assert
+        self.assertEqual(mode, "wal")
+
+    def test_other_connections_see_the_sessions(self):
+        # Arrange
+        other = SQLiteStore(self.path, clock=self.clock)
+
+        # Act
+        self.store.save("a", b"one", ttl=60)
+        self.store.save("b", b"two", ttl=60, actions=b"abc")
+
+        # Assert
+        self.assertEqual(other.load("b"), StoredSession(b"two", 1, b"abc"))
+        other.close()
+
+    def test_databases_without_versions_are_migrated(self):
+        # Arrange
+        self.store.close()
+        os.remove(self.path)
+        old = sqlite3.connect(self.path, isolation_level=None)
+        old.execute(
+            "CREATE TABLE sessions (id TEXT PRIMARY KEY, data BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        old.execute("INSERT INTO sessions VALUES ('a', X'01', ?)", (self.clock() + 60,))
+        old.close()
+
+        # Act
+        self.store = SQLiteStore(self.path, clock=self.clock)
+
+        # Assert
+        self.assertEqual(self.store.load("a"), StoredSession(b"\x01", 0))
+        self.assertEqual(self.store.save("a", b"\x02", ttl=60, version=0), 1)
+
+
+class RedisStoreTests(StoreContract, unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.redis = FakeRedis(self.clock)
+        self.store = RedisStore(self.redis)
+
+    def test_keys_are_prefixed(self):
+        # Act
+        self.store.save("a", b"data", ttl=60)
+
+        # Assert
+        self.assertEqual(list(self.redis.entries), ["qwixx:session:a"])
+
+    def test_appends_only_write_the_version_and_the_records(self):
+        # Arrange
+        version = self.store.save("a", b"data", ttl=60)
+        writes = []
+        self.redis.set = lambda *args, **kwargs: writes.append(args)
+
+        # Act
+        self.store.append_actions("a", b"abc", ttl=60, version=version)
+
+        # Assert
+        self.assertEqual(writes, [])
+        self.assertEqual(self.redis.get("qwixx:session:a:actions"), b"abc")
+        self.assertEqual(self.store.load("a"), StoredSession(b"data", 2, b"abc"))
+
+
+class CountingStore(MemoryStore):
+    """MemoryStore that records which writes reach it."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def save(self, session_id, data, ttl, version=None, actions=b"", new_version=None):
+        self.calls.append("save")
+        return super().save(session_id, data, ttl, version, actions, new_version)
+
+    def append_actions(self, session_id, records, ttl, version, new_version=None):
+        self.calls.append("append_actions")
+        return super().append_actions(session_id, records, ttl, version, new_version)
+
+
+class ThreadRecordingStore(MemoryStore):
+    """MemoryStore that counts as blocking and records the threads using it."""
+
+    blocking = True
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def load(self, session_id):
+        # Every other call loads the session first
+        self.threads.add(threading.get_ident())
+        return super().load(session_id)
+
+
+class WriteBehindStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.backing = MemoryStore()
+        self.store = WriteBehindStore(self.backing, interval=3600)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_saves_are_buffered_until_flushed(self):
+        # Act
+        self.store.save("a", b"first", ttl=60)
+        self.store.save("a", b"second", ttl=60)
+
+        # Assert
+        self.assertIsNone(self.backing.load("a"))
+        self.assertEqual(self.store.load("a"), StoredSession(b"second", 2))
+        self.store.flush()
+        self.assertEqual(self.backing.load("a").data, b"second")
+        self.assertEqual(self.store.writes, 1)
+
+    def test_versions_are_checked_against_the_buffer(self):
+        # Arrange
+        self.backing.save("a", b"stored", ttl=60)
+        version = self.store.save("a", b"first", ttl=60, version=1)
+
+        # Act / Assert
+        with self.assertRaises(StaleSessionError):
+            self.store.save("a", b"stale", ttl=60, version=1)
+        self.assertEqual(self.store.load("a"), StoredSession(b"first", version))
+
+    def test_buffered_deletes_hide_stored_sessions(self):
+        # Arrange
+        self.backing.save("a", b"data", ttl=60)
+
+        # Act
+        self.store.delete("a")
+
+        # Assert
+        self.assertIsNone(self.store.load("a"))
+        self.store.flush()
+        self.assertIsNone(self.backing.load("a"))
+
+    def test_touches_are_buffered_until_flushed(self):
+        # Arrange
+        clock = FakeClock()
+        backing = MemoryStore(clock=clock)
+        store = WriteBehindStore(backing, interval=3600)
+        backing.save("a", b"data", ttl=60)
+        clock.now += 50
+
+        # Act
+        store.touch("a", ttl=60)
+        store.flush()
+        clock.now += 50
+
+        # Assert
+        self.assertEqual(backing.load("a").data, b"data")
+        store.close()
+
+    def test_each_flush_makes_one_write_per_session(self):
+        # Arrange
+        backing = CountingStore()
+        store = WriteBehindStore(backing, interval=3600)
+        version = store.save("a", b"game", ttl=60)
+        version = store.append_actions("a", b"abc", ttl=60, version=version)
+        store.flush()
+
+        # Act
+        version = store.append_actions("a", b"def", ttl=60, version=version)
+        store.append_actions("a", b"ghi", ttl=60, version=version)
+        store.flush()
+
+        # Assert
+        self.assertEqual(backing.calls, ["save", "append_actions"])
+        self.assertEqual(backing.load("a")[::2], (b"game", b"abcdefghi"))
+        store.close()
+
+    def test_flushed_sessions_keep_the_buffer_versions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for backing in (MemoryStore(), SQLiteStore(os.path.join(directory, "s.db"))):
+                with self.subTest(backing=type(backing).__name__):
+                    # Arrange
+                    store = WriteBehindStore(backing, interval=3600)
+                    version = store.save("a", b"game", ttl=60)
+                    version = store.append_actions("a", b"abc", ttl=60, version=version)
+                    store.flush()
+
+                    # Act
+                    version = store.append_actions("a", b"def", ttl=60, version=version)
+                    version = store.save("a", b"later", ttl=60, version=version)
+                    store.flush()
+                    version = store.append_actions("a", b"ghi", ttl=60, version=version)
+                    store.flush()
+
+                    # Assert
+                    self.assertEqual(backing.load("a"), StoredSession(b"later", version, b"ghi"))
+                    self.assertEqual(store.errors, 0)
+                    store.close()
+
+    def test_buffered_actions_are_flushed_with_their_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "sessions.db")
+            store = WriteBehindStore(SQLiteStore(path), interval=3600)
+            version = store.save("a", b"game", ttl=60)
+            store.append_actions("a", b"abc", ttl=60, version=version)
+
+            # Act
+            store.close()
+
+            # Assert
+            reopened = SQLiteStore(path)
+            stored = reopened.load("a")
+            self.assertEqual((stored.data, stored.actions), (b"game", b"abc"))
+            reopened.close()
+
+    def test_close_writes_what_is_left(self):
+        # Arrange
+        self.store.save("a", b"data", ttl=60)
+
+        # Act
+        self.store.close()
+
+        # Assert
+        self.assertEqual(self.backing.load("a").data, b"data")
+
+    def test_failed_writes_are_retried(self):
+        # Arrange
+        redis = FakeRedis(FakeClock())
+        failing = RedisStore(redis)
+        store = WriteBehindStore(failing, interval=3600)
+        store.save("a", b"data", ttl=60)
+        redis.transaction = None  # Every write raises
+
+        # Act
+        store.flush()
+
+        # Assert
+        self.assertEqual(store.errors, 1)
+        self.assertEqual(store.load("a").data, b"data")
+        del redis.transaction
+        store.close()
+        self.assertEqual(failing.load("a").data, b"data")
+
+
+class StoredSessionTests(unittest.TestCase):
+    def test_evicted_sessions_are_loaded_back(self):
+        # Arrange
+        sessions = SessionManager(max_sessions=1, store=MemoryStore())
+        first = sessions.create(played_game(seed=1))
+        snapshot = first.game.snapshot()
+        sessions.create(played_game(seed=2))
+
+        # Act
+        loaded = sessions.get(first.id)
+
+        # Assert
+        self.assertIsNot(loaded, first)
+        self.assertEqual(loaded.game.snapshot(), snapshot)
+        self.assertEqual(sessions.metrics().evicted, 2)
+        self.assertEqual(sessions.metrics().loaded, 1)
+
+    def test_changes_are_stored_as_actions_after_the_checkpoint(self):
+        # Arrange
+        store = MemoryStore()
+        sessions = SessionManager(store=store)
+        session = sessions.create(played_game(rolls=0))
+        checkpoint = store.load(session.id).data
+
+        # Act
+        play_rolls(session.game, 2)
+        sessions.save(session)
+
+        # Assert
+        stored = store.load(session.id)
+        self.assertEqual(stored.data, checkpoint)
+        self.assertEqual(stored.actions, session.game.action_log.to_bytes())
+        loaded = SessionManager(store=store).get(session.id)
+        self.assertEqual(loaded.game.snapshot(), session.game.snapshot())
+
+    def test_loaded_sessions_have_nothing_new_to_save(self):
+        # Arrange
+        store = MemoryStore()
+        session = SessionManager(store=store).create(played_game(rolls=0))
+        play_rolls(session.game, 2)
+        SessionManager(store=store).save(session)
+        stored = store.load(session.id)
+        sessions = SessionManager(store=store)
+        loaded = sessions.get(session.id)
+
+        # Act
+        sessions.save(loaded)
+
+        # Assert
+        self.assertEqual(store.load(session.id), stored)
+        self.assertEqual(loaded.game.action_log.to_bytes(), stored.actions)
+
+    def test_long_action_logs_are_checkpointed(self):
+        # Arrange
+        store = MemoryStore()
+        sessions = SessionManager(store=store)
+        session = sessions.create(played_game(rolls=0))
+        play_rolls(session.game, 3)
+
+        # Act
+        with patch("app.services.sessions.CHECKPOINT_ACTIONS", 4):
+            sessions.save(session)
+
+        # Assert
+        self.assertEqual(store.load(session.id), StoredSession(encode_game(session.game), 2))
+        self.assertEqual(len(session.game.action_log), 0)
+
+    def test_lookups_keep_read_only_sessions_in_the_store(self):
+        # Arrange
+        clock = FakeClock()
+        store = MemoryStore(clock=clock)
+        sessions = SessionManager(ttl=60, clock=clock, store=store)
+        session = sessions.create(played_game(rolls=0))
+
+        # Act
+        for _ in range(3):
+            clock.now += 50
+            sessions.get(session.id)
+
+        # Assert
+        self.assertIsNotNone(store.load(session.id))
+
+    def test_processes_sharing_a_store_see_each_others_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "sessions.db")
+            worker_1 = SessionManager(store=SQLiteStore(path))
+            worker_2 = SessionManager(store=SQLiteStore(path))
+            session = worker_1.create(played_game(rolls=0))
+
+            # Act
+            on_worker_2 = worker_2.get(session.id)
+            on_worker_2.game.roll_dice()
+            worker_2.save(on_worker_2)
+
+            # Assert
+            self.assertEqual(worker_1.get(session.id).game.snapshot(), on_worker_2.game.snapshot())
+            worker_2.remove(session.id)
+            self.assertIsNone(worker_1.get(session.id))
+            worker_1.close()
+            worker_2.close()
+
+    def test_stale_saves_of_another_worker_are_rejected(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "sessions.db")
+            worker_1 = SessionManager(store=SQLiteStore(path))
+            worker_2 = SessionManager(store=SQLiteStore(path))
+            session = worker_1.create(played_game(rolls=0))
+            on_worker_2 = worker_2.get(session.id)
+            session.game.queue_dice([(1, 1, 1, 1, 1, 1)])
+            on_worker_2.game.queue_dice([(6, 6, 6, 6, 6, 6)])
+
+            # Act
+            session.game.roll_dice()
+            worker_1.save(session)
+            on_worker_2.game.roll_dice()
+            with self.assertRaises(StaleSessionError):
+                worker_2.save(on_worker_2)
+
+            # Assert
+            self.assertEqual(on_worker_2.game.dice_results, session.game.dice_results)
+            self.assertEqual(worker_1.get(session.id).game.snapshot(), session.game.snapshot())
+            worker_1.close()
+            worker_2.close()
+
+    def test_games_in_use_are_not_replaced_by_lookups(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "sessions.db")
+            worker_1 = SessionManager(store=SQLiteStore(path))
+            worker_2 = SessionManager(store=SQLiteStore(path))
+            session = worker_1.create(played_game(rolls=0))
+            game = session.game
+            on_worker_2 = worker_2.get(session.id)
+            on_worker_2.game.roll_dice()
+            worker_2.save(on_worker_2)
+
+            async def request_in_progress():
+                async with session.lock:
+                    worker_1.get(session.id)
+                    session.game.roll_dice()
+                    worker_1.save(session)
+
+            # Act / Assert
+            with self.assertRaises(StaleSessionError):
+                asyncio.run(request_in_progress())
+            self.assertIsNot(session.game, game)
+            self.assertEqual(session.game.snapshot(), on_worker_2.game.snapshot())
+            worker_1.close()
+            worker_2.close()
+
+    def test_async_calls_wait_on_the_store_off_the_event_loop(self):
+        # Arrange
+        store = ThreadRecordingStore()
+        sessions = SessionManager(store=store)
+
+        async def requests():
+            session = await sessions.create_async(played_game(rolls=0))
+            session = await sessions.get_async(session.id)
+            session.game.roll_dice()
+            await sessions.save_async(session)
+            return session
+
+        # Act
+        session = asyncio.run(requests())
+
+        # Assert
+        self.assertNotIn(threading.get_ident(), store.threads)
+        loaded = SessionManager(store=store).get(session.id)
+        self.assertEqual(loaded.game.snapshot(), session.game.snapshot())
+
+    def test_store_urls_open_their_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Act
+            store = open_store(f"sqlite:///{directory}/sessions.db")
+            buffered = open_store(f"sqlite:///{directory}/buffered.db", write_behind=True)
+
+            # Assert
+            self.assertIsNone(open_store(""))
+            self.assertIsInstance(open_store("memory"), MemoryStore)
+            self.assertIsInstance(store, SQLiteStore)
+            self.assertIsInstance(buffered, WriteBehindStore)
+            self.assertIsInstance(buffered.store, SQLiteStore)
+            store.close()
+            buffered.close()
+            with self.assertRaises(ValueError):
+                open_store("postgres://db")
+
+
+if __name__ == "__main__":
+    unittest.main()
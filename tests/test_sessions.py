@@ -0,0 +1,201 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.core.game import Game
+from app.main import app
+from app.services.session_store import MemoryStore
+from app.services.sessions import SESSIONS, SessionManager, deep_size
+from tests.helpers import FakeClock
+
+
+def new_game():
+    return Game(num_players=1, ai_strategy="medium", simulation=True, seed=0)
+
+
+class SessionManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.sessions = SessionManager(max_sessions=3, ttl=60, clock=self.clock)
+
+    def test_sessions_get_distinct_ids(self):
+        # Act
+        first = self.sessions.create(new_game())
+        second = self.sessions.create(new_game())
+
+        # Assert
+        self.assertNotEqual(first.id, second.id)
+        self.assertIs(self.sessions.get(first.id), first)
+        self.assertIsNone(self.sessions.get("unknown"))
+
+    def test_idle_sessions_expire(self):
+        # Arrange
+        idle = self.sessions.create(new_game())
+        active = self.sessions.create(new_game())
+        self.clock.now = 40
+        self.sessions.get(active.id)
+
+        # Act
+        self.clock.now = 61
+
+        # Assert
+        self.assertIsNone(self.sessions.get(idle.id))
+        self.assertIs(self.sessions.get(active.id), active)
+        self.assertEqual(self.sessions.metrics().expired, 1)
+
+    def test_least_recently_used_session_is_evicted_when_full(self):
+        # Arrange
+        first, second, third = (self.sessions.create(new_game()) for _ in range(3))
+        self.sessions.get(first.id)
+
+        # Act
+        self.sessions.create(new_game())
+
+        # Assert
+        self.assertEqual(len(self.sessions), 3)
+        self.assertIsNone(self.sessions.get(second.id))
+        self.assertIs(self.sessions.get(first.id), first)
+        self.assertEqual(self.sessions.metrics().evicted, 1)
+
+    def test_metrics_estimate_the_memory_of_the_sessions(self):
+        # Arrange
+        game = new_game()
+        self.sessions.create(game)
+        self.sessions.create(new_game())
+
+        # Act
+        metrics = self.sessions.metrics()
+
+        # Assert
+        self.assertEqual(metrics.resident, 2)
+        self.assertEqual(metrics.created, 2)
+        self.assertEqual(metrics.session_bytes, deep_size(game))
+        self.assertEqual(metrics.sessions_bytes, 2 * metrics.session_bytes)
+        self.assertGreater(metrics.process_rss_bytes, metrics.sessions_bytes)
+
+    def test_listeners_get_the_latest_updates(self):
+        # Arrange
+        session = self.sessions.create(new_game())
+        updates = self.sessions.subscribe(session.id)
+
+        # Act
+        for update in range(300):
+            self.sessions.publish(session.id, update)
+        self.sessions.remove(session.id)
+
+        # Assert
+        received = [updates.get_nowait() for _ in range(updates.qsize())]
+        self.assertEqual(received[-2:], [299, None])
+        self.assertEqual(self.sessions.metrics().listeners, 1)
+        self.sessions.unsubscribe(session.id, updates)
+        self.assertFalse(self.sessions.has_listeners(session.id))
+
+
+class SessionRoutesTests(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_each_setup_starts_its_own_game(self):
+        # Act
+        first = self.client.post("/api/game/setup", json={"num_players": 1}).json()
+        second = self.client.post("/api/game/setup", json={"num_players": 1}).json()
+        rolled = self.client.post(f"/api/game/{first['session_id']}/roll").json()
+
+        # Assert
+        self.assertNotEqual(first["session_id"], second["session_id"])
+        self.assertNotEqual(rolled["state"], "WAITING_FOR_ROLL")
+        state = self.client.get(f"/api/game/{second['session_id']}/state").json()
+        self.assertEqual(state["state"], "WAITING_FOR_ROLL")
+
+    def test_unknown_sessions_are_not_found(self):
+        # Act
+        response = self.client.get("/api/game/unknown/state")
+
+        # Assert
+        self.assertEqual(response.status_code, 404)
+
+    def test_ended_sessions_are_gone(self):
+        # Arrange
+        session_id = self.client.post("/api/game/setup", json={}).json()["session_id"]
+
+        # Act
+        response = self.client.delete(f"/api/game/{session_id}")
+
+        # Assert
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.post(f"/api/game/{session_id}/roll").status_code, 404)
+
+    def test_changes_racing_another_worker_conflict(self):
+        # Arrange
+        SESSIONS.store = MemoryStore()
+        self.addCleanup(setattr, SESSIONS, "store", None)
+        state = self.client.post("/api/game/setup", json={"num_players": 1}).json()
+        stored = SESSIONS.store.load(state["session_id"])
+        SESSIONS.store.save(state["session_id"], stored.data, ttl=60)  # Another worker's save
+
+        # Act
+        response = self.client.post(f"/api/game/{state['session_id']}/roll")
+
+        # Assert
+        self.assertEqual(response.status_code, 409)
+        state = self.client.get(f"/api/game/{state['session_id']}/state").json()
+        self.assertEqual(state["state"], "WAITING_FOR_ROLL")
+
+
+class GameUpdatesTests(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+        self.client.__enter__()  # One event loop for the requests and the sockets
+
+    def tearDown(self):
+        self.client.__exit__(None, None, None)
+
+    def test_changes_are_pushed_with_every_ai_move(self):
+        # Arrange
+        session_id = self.client.post("/api/game/setup", json={"num_players": 1}).json()["session_id"]
+        with self.client.websocket_connect(f"/api/game/{session_id}/ws") as socket:
+            initial = socket.receive_json()
+
+            # Act
+            rolled = self.client.post(f"/api/game/{session_id}/roll").json()
+            self.client.delete(f"/api/game/{session_id}")  # Closes the socket after the updates
+            pushed = []
+            with self.assertRaises(WebSocketDisconnect):
+                while True:
+                    pushed.append(socket.receive_json())
+
+        # Assert
+        self.assertEqual(initial["state"], "WAITING_FOR_ROLL")
+        self.assertIsNotNone(pushed[0]["dice_results"])
+        self.assertEqual(len(pushed), 2)  # The roll, then the AI's stage 1 decision
+        self.assertEqual(pushed[-1], rolled)
+
+    def test_sockets_close_when_the_session_ends(self):
+        # Arrange
+        session_id = self.client.post("/api/game/setup", json={}).json()["session_id"]
+        with self.client.websocket_connect(f"/api/game/{session_id}/ws") as socket:
+            socket.receive_json()
+
+            # Act
+            self.client.delete(f"/api/game/{session_id}")
+
+            # Assert
+            with self.assertRaises(WebSocketDisconnect) as closed:
+                socket.receive_json()
+        self.assertEqual(closed.exception.code, 4404)
+
+    def test_unknown_sessions_close_the_socket(self):
+        # Act / Assert
+        with self.client.websocket_connect("/api/game/unknown/ws") as socket:
+            with self.assertRaises(WebSocketDisconnect) as closed:
+                socket.receive_json()
+        self.assertEqual(closed.exception.code, 4404)
+
+
+if __name__ == "__main__":
+    unittest.main()
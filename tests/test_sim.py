@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stderr
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.sim import RunningStats, main, play_game, run_tournament, wilson_interval
+
+
+class SelfPlayTournamentTests(unittest.TestCase):
+    def test_results_do_not_depend_on_worker_count(self):
+        # Arrange
+        serial, parallel = [], []
+
+        # Act
+        run_tournament(["medium", "hard"], 12, seed=5, workers=1, on_result=serial.append)
+        run_tournament(
+            ["medium", "hard"], 12, seed=5, workers=2, chunksize=3, on_result=parallel.append
+        )
+
+        # Assert
+        self.assertEqual(serial, parallel)
+
+    def test_game_is_reproducible_from_its_index(self):
+        # Act
+        first = play_game((3, 1, ["easy", "hard"], 1))
+        again = play_game((3, 1, ["easy", "hard"], 1))
+
+        # Assert
+        self.assertEqual(first, again)
+        self.assertEqual(len(first["scores"]), 2)
+        self.assertIn(first["winner"], (0, 1, None))
+
+    def test_unknown_strategies_are_rejected(self):
+        # Arrange
+        errors = io.StringIO()
+
+        # Act
+        with redirect_stderr(errors), self.assertRaises(SystemExit) as exit:
+            main(["--games", "1", "medium", "hardd"])
+
+        # Assert
+        self.assertEqual(exit.exception.code, 2)
+        self.assertIn("unknown strategies: hardd", errors.getvalue())
+
+    def test_statistics(self):
+        # Arrange
+        stats = RunningStats()
+
+        # Act
+        for value in (2, 4, 4, 4, 5, 5, 7, 9):
+            stats.add(value)
+
+        # Assert
+        self.assertAlmostEqual(stats.mean, 5.0)
+        self.assertAlmostEqual(stats.variance, 32 / 7)
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual((low + high) / 2, 0.5)
+        self.assertLess(low, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
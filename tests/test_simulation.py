@@ -0,0 +1,47 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.game import Game
+from app.core.game_state import GameState
+
+
+class SimulationModeTests(unittest.TestCase):
+    def test_self_play_runs_to_game_over(self):
+        # Arrange
+        game = Game(simulation=True, ai_strategies=["medium", "hard"], seed=3)
+
+        # Act
+        rolls = game.play_ai_game()
+
+        # Assert
+        self.assertEqual(game.get_state(), GameState.GAME_OVER)
+        self.assertGreater(rolls, 0)
+        self.assertIsNone(game.logger)
+        self.assertEqual(game.get_message(), "Welcome to Qwixx!")
+        self.assertTrue(
+            len(game.get_locked_colors()) >= 2
+            or any(p.get_scoresheet().penalties >= 4 for p in game.get_players())
+        )
+
+    def test_simulation_follows_the_same_rules(self):
+        # Arrange
+        headless = Game(simulation=True, ai_strategies=["hard", "medium"], seed=11)
+        logged = Game(simulation=False, ai_strategies=["hard", "medium"], seed=11)
+
+        # Act
+        headless_rolls = headless.play_ai_game()
+        logged_rolls = logged.play_ai_game()
+
+        # Assert
+        self.assertEqual(headless_rolls, logged_rolls)
+        self.assertEqual(
+            [p.get_scoresheet().pack() for p in headless.get_players()],
+            [p.get_scoresheet().pack() for p in logged.get_players()],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sys
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from app.core.die import DieColor
+from app.core.expectimax import ExpectimaxSearch, RootOption, mark, state_from_scoresheet
+from app.core.scoresheet import Scoresheet
+from app.core.transposition import TranspositionTable, zobrist_key
+
+
+class ZobristKeyTests(unittest.TestCase):
+    def test_move_orders_reach_the_same_key(self):
+        # Arrange
+        start = state_from_scoresheet(Scoresheet(), set())
+
+        # Act
+        red_first = mark(mark(start, 0, 4), 2, 9)
+        green_first = mark(mark(start, 2, 9), 0, 4)
+
+        # Assert
+        self.assertEqual(red_first, green_first)
+        self.assertEqual(zobrist_key(red_first, 1, 3, 2), zobrist_key(green_first, 1, 3, 2))
+
+    def test_turn_depth_and_penalties_change_the_key(self):
+        # Arrange
+        sheet = Scoresheet()
+        sheet.mark_number(DieColor.BLUE, 10)
+        state = state_from_scoresheet(sheet, set())
+        base = zobrist_key(state, 1, 3, 2)
+
+        # Act
+        variants = {
+            zobrist_key(state, 2, 3, 2),
+            zobrist_key(state, 1, 4, 2),
+            zobrist_key(state, 1, 3, 1),
+            zobrist_key(state[:6] + (1,), 1, 3, 2),
+            zobrist_key(state_from_scoresheet(sheet, {DieColor.RED}), 1, 3, 2),
+        }
+
+        # Assert
+        self.assertEqual(len(variants), 5)
+        self.assertNotIn(base, variants)
+
+
+class TranspositionTableTests(unittest.TestCase):
+    def test_least_recently_used_position_is_evicted(self):
+        # Arrange
+        table = TranspositionTable(capacity=2)
+        table.put(1, 10.0)
+        table.put(2, 20.0)
+
+        # Act
+        table.get(1)
+        table.put(3, 30.0)
+
+        # Assert
+        self.assertEqual(table.get(1), 10.0)
+        self.assertIsNone(table.get(2))
+        self.assertEqual(table.get(3), 30.0)
+        stats = table.stats()
+        self.assertEqual((stats.size, stats.hits, stats.misses, stats.evictions), (2, 3, 1, 1))
+        self.assertAlmostEqual(stats.hit_rate, 0.75)
+
+    def test_capacity_must_be_positive(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            TranspositionTable(capacity=0)
+
+    def test_shared_table_serves_repeated_searches(self):
+        # Arrange
+        table = TranspositionTable(capacity=100000)
+        state = state_from_scoresheet(Scoresheet(), set())
+        options = [RootOption(None, (state,)), RootOption((DieColor.RED, 2), (mark(state, 0, 2),))]
+        first = ExpectimaxSearch(2, 1, table=table).search(options, max_depth=2, time_budget=None)
+
+        # Act
+        second_search = ExpectimaxSearch(2, 1, table=table)
+        second = second_search.search(options, max_depth=2, time_budget=None)
+
+        # Assert
+        self.assertEqual(second.values, first.values)
+        self.assertEqual(second_search.nodes, 0)
+        self.assertGreater(table.stats().hits, 0)
+
+    def test_tiny_table_gives_the_same_values(self):
+        # Arrange
+        state = state_from_scoresheet(Scoresheet(), set())
+        options = [RootOption(None, (state,)), RootOption((DieColor.BLUE, 12), (mark(state, 3, 12),))]
+
+        # Act
+        exact = ExpectimaxSearch(3, 2).search(options, max_depth=2, time_budget=None)
+        tiny_table = TranspositionTable(capacity=8)
+        bounded = ExpectimaxSearch(3, 2, table=tiny_table).search(options, max_depth=2, time_budget=None)
+
+        # Assert
+        self.assertEqual(bounded.values, exact.values)
+        self.assertLessEqual(len(tiny_table), 8)
+        self.assertGreater(tiny_table.stats().evictions, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()